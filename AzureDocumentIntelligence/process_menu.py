@@ -5,7 +5,9 @@ MENU EXTRACTION PIPELINE (TEXT-ONLY MODE)
 This script:
   1. Extracts text from PDFs/images
   2. Parses menu items using GPT (strict: items must have prices)
-  3. Saves results to CSV
+  3. Saves results to CSV (or Parquet / JSONL, --format); with --stream the
+     items are written as each chunk is parsed, so a crash keeps the
+     finished chunks in <output file>.partial
   4. Shows preview + summary
 """
 
@@ -18,6 +20,10 @@ import logging
 
 from restaurant_etl.extractors.universal_extractor import UniversalExtractor
 from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.parsers.incremental import IncrementalMenuProcessor
+from restaurant_etl.parsers.hybrid import HybridMenuProcessor
+from restaurant_etl.writers.parquet_writer import write_menu_parquet, run_path
+from restaurant_etl.writers.sinks import open_sink
 
 # Logging
 logging.basicConfig(
@@ -27,11 +33,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ============================================================
+# OUTPUT FILES
+# ============================================================
+
+def _output_path(file_path: Path, output_dir: Path, output_format: str, restaurant_name: str) -> Path:
+    if output_format == "parquet":
+        return run_path(output_dir, restaurant_name, source=file_path)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return output_dir / f"{file_path.stem}_extracted_{timestamp}.{output_format}"
+
+
+def _read_output(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    if path.suffix == ".jsonl":
+        df = pd.read_json(path, lines=True)
+        return df[df["item_name"].notna()] if "_metadata" in df.columns else df
+    return pd.read_csv(path)
+
+
 # ============================================================
 # PROCESS SINGLE FILE
 # ============================================================
 
-def process_single_menu(file_path: str, output_dir: str = "output"):
+def process_single_menu(file_path: str, output_dir: str = "output",
+                        extractor: UniversalExtractor = None, parser: LLMMenuParser = None,
+                        incremental: IncrementalMenuProcessor = None, tenant: str = None,
+                        hybrid: HybridMenuProcessor = None, output_format: str = "csv", stream: bool = False):
+    if stream and (incremental is not None or hybrid is not None):
+        raise ValueError("stream works only in text mode, not with incremental or hybrid processing")
+
     print("\n" + "=" * 70)
     print("  MENU EXTRACTION PIPELINE (TEXT-ONLY MODE)")
     print("=" * 70 + "\n")
@@ -46,36 +78,82 @@ def process_single_menu(file_path: str, output_dir: str = "output"):
     print(f" Restaurant: {restaurant_name}")
     print(f" Mode: TEXT ONLY\n")
 
-    # -----------------------------------------
-    # STEP 1 — EXTRACT TEXT
-    # -----------------------------------------
-    print(" STEP 1: Extracting text…")
-    print("-" * 70)
-
-    extractor = UniversalExtractor()
-    extraction = extractor.extract(str(file_path))
-
-    if not extraction["success"]:
-        print(" Extraction failed!")
-        print(extraction.get("error", "Unknown error"))
-        return None
-
-    print(f" Extracted {extraction['char_count']} characters")
-    print(f"   Method: {extraction['extraction_method']}\n")
-
-    # -----------------------------------------
-    # STEP 2 — PARSE WITH GPT (text-only)
-    # -----------------------------------------
-    print(" STEP 2: Parsing using GPT-4…")
-    print("-" * 70)
-
-    parser = LLMMenuParser()
-    menu_data = parser.parse_menu(
-        extraction["text"],
-        restaurant_name=restaurant_name
-    )
-
-    print(f" Parsed {menu_data.total_items} items\n")
+    menu_data, out_path = None, None
+
+    if incremental is not None and file_path.suffix.lower() == ".pdf":
+        # -----------------------------------------
+        # STEP 1+2 — PAGE DIFF AGAINST THE PREVIOUS VERSION
+        # -----------------------------------------
+        print(" STEP 1: Diffing pages against the previous version…")
+        print("-" * 70)
+
+        menu_data = incremental.process(tenant or restaurant_name, str(file_path), restaurant_name)
+        report = menu_data.extraction_metadata["incremental"]
+        print(f" Re-parsed pages: {report['changed_pages'] or 'none'} of {report['pages']}")
+        print(f"   Reused: {len(report['reused_pages']) + len(report['text_identical_pages'])}, "
+              f"removed: {report['removed_pages']}\n")
+    elif hybrid is not None and file_path.suffix.lower() == ".pdf":
+        # -----------------------------------------
+        # STEP 1+2 — ROUTE EACH PAGE TO TEXT / OCR / VISION
+        # -----------------------------------------
+        print(" STEP 1: Routing pages (text / OCR / vision)…")
+        print("-" * 70)
+
+        menu_data = hybrid.process(str(file_path), restaurant_name)
+        report = menu_data.extraction_metadata["routing"]
+        for page in report["pages"]:
+            print(f"   Page {page['page']:3d}: {page['final_route']:6s} {page['items']:4d} items  "
+                  f"{page['seconds']:6.1f}s  ${page['cost_usd']:.4f}  ({page['reason']})")
+        print(f" Routes: {report['routes']}, ${report['cost_usd']:.4f}, {report['seconds']}s\n")
+    else:
+        # -----------------------------------------
+        # STEP 1 — EXTRACT TEXT
+        # -----------------------------------------
+        print(" STEP 1: Extracting text…")
+        print("-" * 70)
+
+        extractor = extractor or UniversalExtractor()
+        extraction = extractor.extract(str(file_path))
+
+        if not extraction["success"]:
+            print(" Extraction failed!")
+            print(extraction.get("error", "Unknown error"))
+            return None
+
+        print(f" Extracted {extraction['char_count']} characters")
+        print(f"   Method: {extraction['extraction_method']}\n")
+
+        # -----------------------------------------
+        # STEP 2 — PARSE WITH GPT (text-only)
+        # -----------------------------------------
+        print(" STEP 2: Parsing using GPT-4…")
+        print("-" * 70)
+
+        parser = parser or LLMMenuParser()
+        if stream:
+            # every chunk's items hit the disk (fsync) as soon as it is parsed
+            out_path = _output_path(file_path, output_dir, output_format, restaurant_name)
+            sink = open_sink(str(out_path))
+            try:
+                parser.stream_items(extraction["text"], sink)
+            except BaseException:
+                sink.abort()
+                print(f" Interrupted; {sink.rows_written} items kept in {sink.partial}")
+                raise
+            # same keys as write_menu_parquet's run metadata
+            sink.close({"restaurant_name": restaurant_name, "source": str(file_path),
+                        "run_at": datetime.now().isoformat(timespec="seconds"),
+                        "total_items": sink.rows_written,
+                        "extraction_metadata": {"invalid_items": sink.invalid, **parser._run_metadata()}})
+            print(f" Parsed {sink.rows_written} items\n")
+        else:
+            menu_data = parser.parse_menu(
+                extraction["text"],
+                restaurant_name=restaurant_name
+            )
+
+    if menu_data is not None:
+        print(f" Parsed {menu_data.total_items} items\n")
 
     # -----------------------------------------
     # STEP 3 — SAVE RESULTS
@@ -83,14 +161,22 @@ def process_single_menu(file_path: str, output_dir: str = "output"):
     print(" STEP 3: Saving results…")
     print("-" * 70)
 
-    df = menu_data.to_dataframe()
+    # streamed runs are already on disk; read them back for the preview
+    df = menu_data.to_dataframe() if menu_data is not None else _read_output(out_path)
     if df.empty:
         print(" No items extracted!")
         return None
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_path = output_dir / f"{file_path.stem}_extracted_{timestamp}.csv"
-    df.to_csv(out_path, index=False)
+    if menu_data is None:
+        pass
+    elif output_format == "parquet":
+        out_path = write_menu_parquet(menu_data, output_dir, source=file_path)
+    else:
+        out_path = _output_path(file_path, output_dir, output_format, restaurant_name)
+        if output_format == "jsonl":
+            df.to_json(out_path, orient="records", lines=True, force_ascii=False)
+        else:
+            df.to_csv(out_path, index=False)
 
     print(f" Saved to: {out_path}")
     print(f"   Rows: {len(df)}")
@@ -117,7 +203,10 @@ def process_single_menu(file_path: str, output_dir: str = "output"):
 # PROCESS FOLDER (BATCH MODE)
 # ============================================================
 
-def process_folder(input_folder: str = "input", output_folder: str = "output"):
+def process_folder(input_folder: str = "input", output_folder: str = "output", incremental_dir: str = None,
+                   hybrid: bool = False, output_format: str = "csv", stream: bool = False):
+    if stream and (incremental_dir or hybrid):
+        raise ValueError("stream works only in text mode, not with incremental or hybrid processing")
     input_folder = Path(input_folder)
 
     if not input_folder.exists():
@@ -133,6 +222,12 @@ def process_folder(input_folder: str = "input", output_folder: str = "output"):
 
     print(f"\n Found {len(files)} file(s) to process\n")
 
+    # one extractor/parser (and their pooled connections) for the whole folder
+    extractor = UniversalExtractor()
+    parser = LLMMenuParser()
+    incremental = IncrementalMenuProcessor(incremental_dir, parser=parser) if incremental_dir else None
+    hybrid_processor = HybridMenuProcessor(parser=parser) if hybrid else None
+
     results = []
     for idx, file in enumerate(files, 1):
         print("\n" + "=" * 70)
@@ -140,7 +235,9 @@ def process_folder(input_folder: str = "input", output_folder: str = "output"):
         print("=" * 70 + "\n")
 
         try:
-            df = process_single_menu(str(file), output_dir=output_folder)
+            df = process_single_menu(str(file), output_dir=output_folder,
+                                     extractor=extractor, parser=parser, incremental=incremental,
+                                     hybrid=hybrid_processor, output_format=output_format, stream=stream)
             results.append({
                 "file": file.name,
                 "status": "success" if df is not None else "failed",
@@ -174,14 +271,29 @@ def main():
     parser.add_argument("input", nargs="?", default="input", help="File or folder")
     parser.add_argument("--output", default="output", help="Output folder")
     parser.add_argument("--batch", action="store_true", help="Process all files in folder")
+    parser.add_argument("--incremental", metavar="STATE_DIR",
+                        help="Only re-parse pages that changed since the tenant's previous version")
+    parser.add_argument("--tenant", help="Tenant id for --incremental (default: restaurant name)")
+    parser.add_argument("--hybrid", action="store_true",
+                        help="Route each PDF page to text, OCR or vision instead of one mode per file")
+    parser.add_argument("--format", choices=["csv", "parquet", "jsonl"], default="csv",
+                        help="parquet: <output>/restaurant=<name>/run_date=<date>/*.parquet")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write items as each chunk is parsed (text mode; crash-safe, flat memory)")
 
     args = parser.parse_args()
+    if args.stream and (args.incremental or args.hybrid):
+        parser.error("--stream cannot be combined with --incremental or --hybrid")
     input_path = Path(args.input)
 
     if args.batch or input_path.is_dir():
-        process_folder(str(input_path), args.output)
+        process_folder(str(input_path), args.output, incremental_dir=args.incremental, hybrid=args.hybrid,
+                       output_format=args.format, stream=args.stream)
     elif input_path.is_file():
-        process_single_menu(str(input_path), args.output)
+        incremental = IncrementalMenuProcessor(args.incremental) if args.incremental else None
+        hybrid = HybridMenuProcessor() if args.hybrid else None
+        process_single_menu(str(input_path), args.output, incremental=incremental, tenant=args.tenant,
+                            hybrid=hybrid, output_format=args.format, stream=args.stream)
     else:
         print(f" Path not found: {input_path}")
 
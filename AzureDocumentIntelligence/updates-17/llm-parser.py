@@ -1,8 +1,6 @@
 import os
-import json
 import time
 import logging
-import re
 from typing import Optional, List, Dict
 
 from dotenv import load_dotenv
@@ -10,6 +8,7 @@ load_dotenv()
 
 from restaurant_etl.models.menu_models import MenuItem, MenuData
 from restaurant_etl.parsers.prompt_templates import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from restaurant_etl.parsers.json_repair import load_menu_json as _safe_json_load_with_repair
 
 # Postprocessing import
 try:
@@ -25,78 +24,6 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-# ============================================================
-# JSON REPAIR & SALVAGE
-# ============================================================
-
-def _safe_json_load_with_repair(raw: str) -> Dict:
-    if not raw:
-        raise ValueError("Empty model output")
-
-    raw = raw.strip()
-
-    # --- Strip markdown code fences ---
-    if raw.startswith("```"):
-        raw = raw.strip("`")
-        raw = raw.replace("json", "", 1).strip()
-
-    # --- Try direct parse ---
-    try:
-        parsed = json.loads(raw)
-        if isinstance(parsed, list):
-            return {"items": parsed}
-        return parsed
-    except Exception:
-        pass
-
-    # --- Trim trailing garbage ---
-    last_obj = raw.rfind("}")
-    last_arr = raw.rfind("]")
-    last_pos = max(last_obj, last_arr)
-
-    if last_pos != -1:
-        candidate = raw[: last_pos + 1]
-        try:
-            parsed = json.loads(candidate)
-            if isinstance(parsed, list):
-                return {"items": parsed}
-            return parsed
-        except Exception:
-            pass
-
-    # --- Replace Python literals & bad chars ---
-    repaired = raw
-    repaired = repaired.replace("\r", " ").replace("\t", " ")
-    repaired = repaired.replace("\n", "\\n")
-    repaired = re.sub(r":\s*None\b", ": null", repaired)
-    repaired = re.sub(r":\s*True\b", ": true", repaired)
-    repaired = re.sub(r":\s*False\b", ": false", repaired)
-
-    try:
-        parsed = json.loads(repaired)
-        if isinstance(parsed, list):
-            return {"items": parsed}
-        return parsed
-    except Exception:
-        pass
-
-    # --- FINAL FALLBACK: salvage individual objects ---
-    objects = re.findall(r'\{[^{}]*\}', raw, re.DOTALL)
-    salvaged = []
-
-    for obj in objects:
-        try:
-            salvaged.append(json.loads(obj))
-        except Exception:
-            continue
-
-    if salvaged:
-        logger.warning(f"⚠ Salvaged {len(salvaged)} items from partial JSON")
-        return {"items": salvaged}
-
-    raise ValueError(f"[JSON Parse Error] Could not parse model output.\nSnippet:\n{raw[:500]}")
-
-
 # ============================================================
 # MAIN PARSER
 # ============================================================
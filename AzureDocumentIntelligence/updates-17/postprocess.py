@@ -1,7 +1,7 @@
 import re
 from typing import List, Dict
 
-PRICE_RE = re.compile(r"\d+[\.,]?\d*")
+from restaurant_etl.utils.price_tokenizer import parse_price
 
 PRICE_FIELDS = [
     "price",
@@ -14,21 +14,7 @@ PRICE_FIELDS = [
 
 
 def _parse_numeric(s: str):
-    if s is None:
-        return None
-    s = str(s).strip()
-    # remove currency symbols and commas
-    s = re.sub(r"[\$₹€,]", "", s)
-    # if range like 250-350, take lower bound
-    if "-" in s:
-        s = s.split("-")[0]
-    m = PRICE_RE.search(s)
-    if not m:
-        return None
-    try:
-        return float(m.group().replace(",", ""))
-    except:
-        return None
+    return parse_price(s)
 
 
 def expand_and_normalize_items(items: List[Dict]) -> List[Dict]:
@@ -0,0 +1,84 @@
+"""
+Realtime vs Batch API backfill of the recorded menus, plus a resume check.
+
+The batch run is interrupted after submission and finished by a fresh
+runner on the same state directory; the job must not be uploaded or
+submitted again. A share of batch lines fail and go through the realtime
+path. Both modes run the text preprocessor (they share its chunking).
+Reports items per mode, realtime calls and estimated cost (batch billed
+at 50%).
+
+    python -m benchmarks.bench_batch [--fail-rate 0.02]
+"""
+
+import random
+import logging
+import tempfile
+import argparse
+
+from benchmarks.fake_azure import FakeAzureOpenAI
+from benchmarks.bench_output_format import load_corpus
+from benchmarks.bench_cascade import menu_text, responder
+from restaurant_etl.parsers.cascade import DEFAULT_TIER_PRICES
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, AzureBackend
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.parsers.batch_runner import BatchMenuRunner
+from restaurant_etl.parsers.rate_limiter import RateLimitScheduler
+
+BATCH_DISCOUNT = 0.5
+
+
+def make_parser(client):
+    backend = AzureBackend("https://eastus.example", "gpt-4o", "key", client=client)
+    return LLMMenuParser(pool=DeploymentPool([backend], scheduler=RateLimitScheduler()), clean_text=True)
+
+
+def cost(prompt_tokens, completion_tokens):
+    p_in, p_out = DEFAULT_TIER_PRICES["large"]
+    return (prompt_tokens * p_in + completion_tokens * p_out) / 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fail-rate", type=float, default=0.02)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(5)
+    menus = {name: menu_text(items) for name, items in load_corpus().items()}
+    menus = {k: v for k, v in menus.items() if v}
+    latency = lambda model, out_tokens: 0.001
+
+    # realtime
+    client = FakeAzureOpenAI(rpm=0, tpm=0, responder=responder(rng, 0.0), latency=latency)
+    parser = make_parser(client)
+    realtime = {k: parser.parse_menu(v) for k, v in menus.items()}
+    rt_cost = sum(cost(m.extraction_metadata["llm_usage"]["prompt_tokens"],
+                       m.extraction_metadata["llm_usage"]["completion_tokens"]) for m in realtime.values())
+
+    # batch, interrupted after submit and resumed
+    client = FakeAzureOpenAI(rpm=0, tpm=0, responder=responder(rng, 0.0), latency=latency,
+                             batch_fail_rate=args.fail_rate)
+    parser = make_parser(client)
+    with tempfile.TemporaryDirectory() as state_dir:
+        first = BatchMenuRunner(parser, state_dir, client=client, poll_interval=0)
+        first.submit(first.prepare(menus))
+        uploads, jobs = client.files.uploads, len(client.batches.jobs)
+        batch = BatchMenuRunner(parser, state_dir, client=client, poll_interval=0).run(menus)
+
+    batch_usage = [m.extraction_metadata["llm_usage"] for m in batch.values()]
+    batch_cost = BATCH_DISCOUNT * sum(cost(u["prompt_tokens"], u["completion_tokens"]) for u in batch_usage)
+    fallback_calls = client.calls
+    batch_cost += cost(parser.usage["prompt_tokens"], parser.usage["completion_tokens"]) if fallback_calls else 0.0
+
+    same = all(realtime[k].total_items == batch[k].total_items for k in menus)
+    print(f"{len(menus)} menus, {sum(len(parser._split_into_chunks(t, 1000)) for t in menus.values())} chunks\n")
+    print(f"realtime items={sum(m.total_items for m in realtime.values()):5d} cost=${rt_cost:.4f}")
+    print(f"batch    items={sum(m.total_items for m in batch.values()):5d} cost=${batch_cost:.4f} "
+          f"(realtime fallback calls: {fallback_calls})")
+    print(f"resume re-uploaded: {client.files.uploads - uploads} files, "
+          f"re-submitted: {len(client.batches.jobs) - jobs} jobs; per-menu items identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
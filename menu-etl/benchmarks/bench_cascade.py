@@ -0,0 +1,111 @@
+"""
+Large-model-only vs cheap-first cascade on the recorded menus.
+
+Chunks are rebuilt as "Name ..... price" text from the output CSVs. The
+fake large model transcribes every line; the fake fast model is cheaper
+and quicker but on a share of chunks drops items or loses prices. Reports
+escalation rate, items recovered, token cost and LLM time, for the
+cascade also with the text preprocessor on (clean_text: dot leaders
+gone, so the fakes read "Name price" lines too).
+
+    python -m benchmarks.bench_cascade [--fast-error-rate 0.15]
+"""
+
+import re
+import json
+import random
+import logging
+import argparse
+
+from benchmarks.fake_azure import FakeAzureOpenAI
+from benchmarks.bench_output_format import load_corpus
+from restaurant_etl.parsers.cascade import DEFAULT_TIER_PRICES
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, AzureBackend
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.parsers.rate_limiter import RateLimitScheduler
+
+LINE_RE = re.compile(r"^(?P<name>.+?) \.{3,} (?P<price>\d+(?:\.\d+)?)$", re.MULTILINE)
+# what the fake models read: the same lines, with or without the dot leader
+READ_RE = re.compile(r"^(?P<name>.+?)(?: \.{3,})? (?P<price>\d+(?:\.\d+)?)$", re.MULTILINE)
+
+
+def menu_text(items):
+    sections, current = [], object()
+    for it in items:
+        price = it.get("price") or it.get("half_price") or it.get("small_price")
+        if not it.get("item_name") or price is None:
+            continue
+        if it.get("category") != current:
+            current = it.get("category")
+            sections.append(f"{current or 'MENU'}")
+        sections[-1] += f"\n{it['item_name']} ..... {price:g}"
+    return "\n\n".join(sections)
+
+
+def responder(rng, error_rate):
+    def respond(messages, model):
+        lines = READ_RE.findall(messages[-1]["content"])
+        items = [{"item_name": n, "price": float(p)} for n, p in lines]
+        if error_rate and rng.random() < error_rate:
+            if rng.random() < 0.5:
+                items = items[: len(items) // 3]
+            else:
+                items = [{"item_name": it["item_name"], "price": None} for it in items]
+        return json.dumps({"items": items})
+    return respond
+
+
+def make_pool(deployment, respond, per_token):
+    latency = lambda model, out_tokens: 0.002 + out_tokens * per_token
+    backend = AzureBackend("https://eastus.example", deployment, "key",
+                           client=FakeAzureOpenAI(rpm=0, tpm=0, responder=respond, latency=latency))
+    return DeploymentPool([backend], scheduler=RateLimitScheduler())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fast-error-rate", type=float, default=0.15)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(5)
+    texts = [menu_text(items) for items in load_corpus().values()]
+    texts = [t for t in texts if t]
+
+    def run(fast, clean_text=False):
+        large = make_pool("gpt-4o", responder(rng, 0.0), 0.00005)
+        parser = LLMMenuParser(pool=large, fast_pool=fast, clean_text=clean_text)
+        found, meta = 0, []
+        for t in texts:
+            data = parser.parse_menu(t)
+            found += data.total_items
+            meta.append(data.extraction_metadata)
+        return found, meta
+
+    expected = sum(len(LINE_RE.findall(t)) for t in texts)
+    base_found, base_meta = run(None)
+    fast = make_pool("gpt-4o-mini", responder(rng, args.fast_error_rate), 0.00001)
+    casc_found, casc_meta = run(fast)
+    clean_found, clean_meta = run(fast, clean_text=True)
+
+    def cost(meta):
+        total = 0.0
+        for m in meta:
+            for tier, u in m["llm_usage_by_tier"].items():
+                p_in, p_out = DEFAULT_TIER_PRICES[tier]
+                total += (u["prompt_tokens"] * p_in + u["completion_tokens"] * p_out) / 1e6
+        return total
+
+    chunks = sum(m["cascade"]["chunks"] for m in casc_meta)
+    escalated = sum(m["cascade"]["escalated"] for m in casc_meta)
+    print(f"{len(texts)} menus, {expected} priced lines, {chunks} chunks\n")
+    for name, found, meta in (("large only", base_found, base_meta), ("cascade", casc_found, casc_meta),
+                              ("+ clean", clean_found, clean_meta)):
+        llm_s = sum(m["llm_usage"]["latency_s"] for m in meta)
+        prompt = sum(m["llm_usage"]["prompt_tokens"] for m in meta)
+        print(f"{name:10s} items={found:5d} cost=${cost(meta):.4f} llm_time={llm_s:5.2f}s prompt_tokens={prompt}")
+    print(f"escalated {escalated}/{chunks} chunks ({escalated / chunks:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Category canonicalization: how many distinct categories reach downstream
+stages, and lookup throughput.
+
+Reduction: the categories of the recorded menus (output CSVs and the
+last LLM response), plus --variants spellings of each the way the model
+writes them across chunks and menus (case, "&" / "and", plural, "'s",
+accents, spacing, one dropped letter). Reported: distinct raw vs
+canonical names, and variants that did not land on their source's
+canonical name (misses) or landed on another category's (wrong).
+
+Throughput: canonicalize_items over --items items drawn from those
+categories (one lookup per distinct value, memo warm after the first
+menu), and per-lookup cost for memo hits, key hits and cold fuzzy
+lookups against an index of --canonical names. Save / load of the
+persisted index is timed too.
+
+    python -m benchmarks.bench_category_index [--variants 4] [--items 100000] [--canonical 5000]
+"""
+
+import time
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_output_format import load_corpus
+from restaurant_etl.parsers.categories import CategoryIndex
+
+
+def recorded_categories():
+    cats = set()
+    for items in load_corpus().values():
+        cats.update(it["category"] for it in items if it.get("category") and it["category"] != "None")
+    return sorted(cats)
+
+
+def variant(name, rng):
+    r = rng.random()
+    if r < 0.2:
+        return name.upper()
+    if r < 0.35:
+        return name.lower()
+    if r < 0.5:
+        return name.replace("&", "and") if "&" in name else name.replace(" and ", " & ")
+    if r < 0.65:
+        plural = name.lower().endswith("s") and not name.lower().endswith("ies")
+        return name[:-1] if plural else name + ("S" if name.isupper() else "s")
+    if r < 0.75:
+        return name.replace("a", "à", 1)
+    if r < 0.85:
+        words = name.split()
+        i = max(range(len(words)), key=lambda k: len(words[k]))
+        w = words[i]
+        if len(w) > 5:
+            j = rng.randrange(1, len(w) - 1)
+            words[i] = w[:j] + w[j + 1:]
+        return " ".join(words)
+    return name.replace(" ", "", 1) if " " in name else name + "'s"
+
+
+def reduction(args):
+    rng = random.Random(0)
+    cats = recorded_categories()
+    index = CategoryIndex()
+    for c in cats:
+        index.lookup(c)
+    source = {c: index.lookup(c) for c in cats}
+
+    raw, misses, wrong = set(cats), 0, 0
+    for c in cats:
+        for _ in range(args.variants):
+            v = variant(c, rng)
+            raw.add(v)
+            got = index.lookup(v)
+            if got != source[c]:
+                if got in source.values():
+                    wrong += 1
+                else:
+                    misses += 1
+    canonical = {index.lookup(r) for r in raw}
+    print(f"recorded categories: {len(cats)} raw -> {len(set(source.values()))} canonical")
+    print(f"with {args.variants} variants each: {len(raw)} raw -> {len(canonical)} canonical "
+          f"({misses} variants missed, {wrong} mapped to another category)\n")
+    return cats
+
+
+def per_lookup(index, names):
+    start = time.perf_counter()
+    for n in names:
+        index.lookup(n)
+    return (time.perf_counter() - start) / max(1, len(names)) * 1e6
+
+
+def throughput(args, cats):
+    rng = random.Random(1)
+    index = CategoryIndex()
+    filler = [f"{rng.choice(cats)} {rng.choice(['special', 'combo', 'platter', 'deluxe'])} {i}"
+              for i in range(args.canonical)]
+    start = time.perf_counter()
+    for c in cats + filler:
+        index.lookup(c)
+    build = time.perf_counter() - start
+
+    items = [{"item_name": f"x{i}", "category": variant(rng.choice(cats), rng)} for i in range(args.items)]
+    start = time.perf_counter()
+    for i in range(0, len(items), 200):  # one "menu" per 200 items
+        index.canonicalize_items(items[i:i + 200])
+    bulk = time.perf_counter() - start
+
+    print(f"index: {len(index.canonical)} canonical names, built in {build:.2f}s")
+    print(f"canonicalize_items: {args.items} items in {bulk:.3f}s ({args.items / bulk:,.0f} items/s)")
+    print(f"lookup us: memo {per_lookup(index, cats):.2f}, "
+          f"key {per_lookup(index, [c.upper() + ' ' for c in cats]):.1f}, "
+          f"fuzzy {per_lookup(index, [c[:-1] + 'x' + c[-1] + ' zz' for c in cats]):.1f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "categories.json"
+        start = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = CategoryIndex(path)
+        load = time.perf_counter() - start
+        print(f"save {saved:.3f}s, load {load:.3f}s ({path.stat().st_size / 1e3:.0f} KB, "
+              f"{len(loaded.canonical)} canonical)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--variants", type=int, default=4)
+    ap.add_argument("--items", type=int, default=100000)
+    ap.add_argument("--canonical", type=int, default=5000)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    cats = reduction(args)
+    throughput(args, cats)
+
+
+if __name__ == "__main__":
+    main()
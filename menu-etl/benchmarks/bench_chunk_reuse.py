@@ -0,0 +1,93 @@
+"""
+LLM calls avoided by near-duplicate chunk reuse on a synthetic franchise corpus.
+
+Every recorded menu gets several "outlets": the same text with some prices
+changed and, in a few sections, a line added or removed. All outlets are
+parsed with and without the ChunkReuseIndex; the index must give the same
+(item, price) set as the fake model reading each outlet from scratch.
+Then the same outlets again from the saved index (the next run), and with
+the index capped at --max-entries chunks.
+
+    python -m benchmarks.bench_chunk_reuse [--outlets 5] [--max-entries 50]
+"""
+
+import random
+import logging
+import argparse
+import tempfile
+
+from benchmarks.fake_azure import FakeAzureOpenAI
+from benchmarks.bench_output_format import load_corpus
+from benchmarks.bench_cascade import menu_text, responder, LINE_RE
+from restaurant_etl.parsers.chunk_dedup import ChunkReuseIndex
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, AzureBackend
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.parsers.rate_limiter import RateLimitScheduler
+
+
+def outlet_variant(text, rng, price_change=0.1, edit_prob=0.2):
+    out = []
+    for section in text.split("\n\n"):
+        lines = section.split("\n")
+        new = [lines[0]]
+        for line in lines[1:]:
+            m = LINE_RE.match(line)
+            if m and rng.random() < price_change:
+                price = float(m["price"])
+                line = f"{m['name']} ..... {price + rng.choice([10, 20, 30, -10]) if price > 20 else price + 1:g}"
+            new.append(line)
+        if len(new) > 3 and rng.random() < edit_prob:
+            del new[rng.randrange(1, len(new))]
+        if rng.random() < edit_prob:
+            new.insert(rng.randrange(1, len(new) + 1), f"Outlet Special {rng.randint(1, 99)} ..... {rng.randint(99, 499)}")
+        out.append("\n".join(new))
+    return "\n\n".join(out)
+
+
+def run(menus, index):
+    client = FakeAzureOpenAI(rpm=0, tpm=0, responder=responder(random.Random(0), 0.0),
+                             latency=lambda model, out_tokens: 0.0)
+    backend = AzureBackend("https://eastus.example", "gpt-4o", "key", client=client)
+    parser = LLMMenuParser(pool=DeploymentPool([backend], scheduler=RateLimitScheduler()), chunk_index=index)
+    results = [parser.parse_menu(t) for t in menus]
+    return results, client.calls
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--outlets", type=int, default=5)
+    ap.add_argument("--max-entries", type=int, default=50)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(9)
+    bases = [t for t in (menu_text(items) for items in load_corpus().values()) if t]
+    menus = [outlet_variant(t, rng) for t in bases for _ in range(args.outlets)]
+
+    baseline, base_calls = run(menus, None)
+    index = ChunkReuseIndex()
+    reused, reuse_calls = run(menus, index)
+
+    key = lambda m: sorted((it.item_name, it.price) for it in m.items)
+    mismatched = sum(key(a) != key(b) for a, b in zip(baseline, reused))
+    report = index.report()
+    print(f"{len(menus)} outlet menus ({len(bases)} chains x {args.outlets}), {report['lookups']} chunks\n")
+    print(f"LLM calls: {base_calls} -> {reuse_calls} ({1 - reuse_calls / base_calls:.1%} avoided)")
+    print(f"chunks: exact={report['exact']} price_patch={report['price_patch']} "
+          f"partial={report['partial']} miss={report['miss']}; chars sent {report['sent_char_fraction']:.1%}")
+    print(f"menus whose items differ from a full parse: {mismatched}")
+
+    # next run: a fresh process loading the saved index; then a capped index
+    with tempfile.TemporaryDirectory() as tmp:
+        index.save(f"{tmp}/chunk_index.json")
+        again, again_calls = run(menus, ChunkReuseIndex(path=f"{tmp}/chunk_index.json"))
+    print(f"next run from the saved index: {again_calls} LLM calls, "
+          f"{sum(key(a) != key(b) for a, b in zip(baseline, again))} menus differ")
+    capped = ChunkReuseIndex(max_entries=args.max_entries)
+    _, capped_calls = run(menus, capped)
+    print(f"max_entries={args.max_entries}: {capped_calls} LLM calls, "
+          f"{capped.report()['entries']} entries kept, {capped.report()['evicted']} evicted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Input tokens sent to the LLM with and without the text preprocessor.
+
+The PDFs in input/ are extracted with PDFExtractor (text layer, as the
+pipeline does) and chunked as LLMMenuParser does, once from the raw
+text and once from preprocess_menu_text(). Per menu: text tokens,
+chunks, prompt tokens (every chunk also carries the system prompt and
+the user template), price tokens in the text (page markers aside; should
+not drop) and preprocessing time. Then the same menus cleaned page by
+page, as hybrid / incremental runs do: each page on its own (repeated
+footers can't be seen) vs with the document's boilerplate_lines().
+
+Token counts use tiktoken (o200k_base) when installed, ~4 chars/token
+otherwise.
+
+    python -m benchmarks.bench_clean_text [pdf ...]
+"""
+
+import time
+import logging
+import argparse
+from pathlib import Path
+
+from restaurant_etl.extractors.pdf_extractor import PDFExtractor
+from restaurant_etl.parsers.cascade import PRICE_TOKEN_RE
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.parsers.prompt_templates import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from restaurant_etl.utils.clean_text import preprocess_menu_text, boilerplate_lines, PAGE_MARKER_RE, _pages
+from restaurant_etl.utils.tokens import estimate_tokens
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def prompt_tokens(text):
+    chunks = LLMMenuParser._split_into_chunks(None, text, max_chars=1000)
+    overhead = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(USER_PROMPT_TEMPLATE.format(menu_text=""))
+    return len(chunks), sum(estimate_tokens(c) for c in chunks) + overhead * len(chunks)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("pdfs", nargs="*")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    pdfs = [Path(p) for p in args.pdfs] or sorted((ROOT / "input").glob("*.pdf"))
+    extractor = PDFExtractor()
+    print(f"{'menu':28s} {'text tok':>15s} {'chunks':>9s} {'prompt tok':>15s} {'prices':>9s} {'ms':>5s}  removed")
+    totals = [0, 0, 0, 0]
+    for pdf in pdfs:
+        raw = extractor.extract_text(str(pdf))["text"]
+        start = time.perf_counter()
+        text, report = preprocess_menu_text(raw)
+        ms = (time.perf_counter() - start) * 1000
+
+        chunks_raw, prompt_raw = prompt_tokens(raw)
+        chunks_clean, prompt_clean = prompt_tokens(text)
+        # page numbers in the "--- Page N ---" markers look like prices too
+        body = "\n".join(l for l in raw.splitlines() if not PAGE_MARKER_RE.match(l.strip()))
+        prices = (len(PRICE_TOKEN_RE.findall(body)), len(PRICE_TOKEN_RE.findall(text)))
+        totals = [a + b for a, b in zip(totals, (report["tokens_before"], report["tokens_after"],
+                                                 prompt_raw, prompt_clean))]
+        print(f"{pdf.stem[:28]:28s} {report['tokens_before']:6d} -> {report['tokens_after']:5d} "
+              f"{chunks_raw:3d} -> {chunks_clean:2d} {prompt_raw:6d} -> {prompt_clean:5d} "
+              f"{prices[0]:4d}/{prices[1]:4d} {ms:5.1f}  {report['removed']}")
+
+    print(f"\ntotal text tokens {totals[0]} -> {totals[1]} ({1 - totals[1] / max(1, totals[0]):.1%} fewer), "
+          f"prompt tokens {totals[2]} -> {totals[3]} ({1 - totals[3] / max(1, totals[2]):.1%} fewer)")
+
+    print(f"\n{'page by page':28s} {'pages':>5s} {'alone tok':>9s} {'document tok':>12s}  boilerplate removed")
+    for pdf in pdfs:
+        raw = extractor.extract_text(str(pdf))["text"]
+        pages = ["\n".join(p) for p in _pages(raw)]
+        alone = sum(estimate_tokens(preprocess_menu_text(p)[0]) for p in pages)
+        boilerplate, emitted = boilerplate_lines(pages), set()
+        together = removed = 0
+        for p in pages:
+            text, report = preprocess_menu_text(p, boilerplate, emitted)
+            together += estimate_tokens(text)
+            removed += report["removed"].get("boilerplate", 0)
+        print(f"{pdf.stem[:28]:28s} {len(pages):5d} {alone:9d} {together:12d}  {removed} lines")
+
+
+if __name__ == "__main__":
+    main()
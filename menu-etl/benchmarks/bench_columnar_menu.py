@@ -0,0 +1,71 @@
+"""
+MenuData vs ColumnarMenuData: building the result from postprocessed
+item dicts and converting it to a DataFrame / Arrow table.
+
+  MenuData:   validate_menu_items (one pydantic call), MenuData(...),
+              to_dataframe() (model .dict() per row)
+  columnar:   ColumnarMenuData.from_items (one Arrow conversion per
+              field), to_dataframe() (Arrow-backed, no copy)
+
+Items come from bench_postprocess.make_items, postprocessed. The two
+DataFrames are checked to hold the same rows and values.
+
+    python -m benchmarks.bench_columnar_menu [--sizes 1000 10000 100000]
+"""
+
+import time
+import logging
+import argparse
+
+from benchmarks.bench_postprocess import make_items
+from restaurant_etl.models.columnar import ColumnarMenuData
+from restaurant_etl.models.menu_models import MenuData
+from restaurant_etl.parsers.postprocess import expand_and_normalize_items, validate_menu_items
+
+
+def rows_of(df):
+    # None / NaN / <NA> all mean "missing"
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+
+def build_menu_data(items):
+    final_items, _ = validate_menu_items(items)
+    return MenuData(restaurant_name="Bench", items=final_items, total_items=len(final_items))
+
+
+def build_columnar(items):
+    return ColumnarMenuData.from_items(items, "Bench")
+
+
+def best(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(arg)
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'items':>8s} {'repr':9s} {'build s':>8s} {'to_df s':>8s} {'total s':>8s} {'df MB':>7s}  same rows")
+    for n in args.sizes:
+        items = expand_and_normalize_items(make_items(n))
+        b_rows, menu = best(build_menu_data, items, args.repeat)
+        d_rows, df_rows = best(lambda m: m.to_dataframe(), menu, args.repeat)
+        b_col, cmenu = best(build_columnar, items, args.repeat)
+        d_col, df_col = best(lambda m: m.to_dataframe(), cmenu, args.repeat)
+
+        same = rows_of(df_rows) == rows_of(df_col)
+        for name, b, d, df in (("MenuData", b_rows, d_rows, df_rows), ("columnar", b_col, d_col, df_col)):
+            mb = df.memory_usage(deep=True).sum() / 1e6
+            print(f"{n:8d} {name:9s} {b:8.3f} {d:8.3f} {b + d:8.3f} {mb:7.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Item deduplication across chunk boundaries: recall on injected
+duplicates, wrongly removed items, and throughput vs an all-pairs scan.
+
+Accuracy: every recorded menu (output CSVs) is cut into chunks of
+--chunk-items items. The last --overlap items of each chunk are repeated
+at the start of the next one, as the model returns them when a chunk
+boundary falls mid-section, with the usual noise: different case,
+accents, punctuation, one dropped letter. Every 5th menu also gets one
+chunk twice (a repeated page). The deduper should remove exactly the
+injected copies.
+
+Throughput: postprocessed bench_postprocess.make_items at --sizes (names
+are distinct, so every item goes through the exact lookup and its index
+keys; the few removed are exact repeats make_items itself produces),
+once with their own prices and once with every price moved to one of 10
+price points (a cafe where half the list is 99 / 149), which makes the
+same-price blocks large. ItemDeduper vs comparing each name with all
+previous names of the same price and variant.
+
+    python -m benchmarks.bench_dedupe [--chunk-items 12] [--overlap 2] [--sizes 1000 10000 100000]
+"""
+
+import time
+import random
+import logging
+import argparse
+
+from benchmarks.bench_output_format import load_corpus
+from benchmarks.bench_postprocess import make_items
+from restaurant_etl.parsers.dedupe import ItemDeduper, dedupe_key, near_identical, normalize_name
+from restaurant_etl.parsers.postprocess import expand_and_normalize_items
+
+ACCENTS = str.maketrans("aeiou", "àéíóú")
+PRICE_POINTS = [49, 99, 149, 199, 249, 299, 349, 399, 449, 499]
+
+
+def perturb(item, rng):
+    dup = dict(item)
+    name = str(item.get("item_name") or "")
+    r = rng.random()
+    if r < 0.25:
+        name = name.upper()
+    elif r < 0.45:
+        name = name.translate(ACCENTS)
+    elif r < 0.65:
+        name = f"{name}."
+    elif r < 0.85 and len(name) > 8:
+        i = rng.randrange(1, len(name) - 1)
+        name = name[:i] + name[i + 1:]
+    dup["item_name"] = name
+    return dup
+
+
+def chunked_with_duplicates(items, chunk_items, overlap, repeat_page, rng):
+    chunks = [items[i:i + chunk_items] for i in range(0, len(items), chunk_items)]
+    out, injected = [], 0
+    for i, chunk in enumerate(chunks):
+        chunk = [dict(it) for it in chunk]
+        if i:
+            carry = [perturb(it, rng) for it in chunks[i - 1][-overlap:]]
+            chunk = carry + chunk
+            injected += len(carry)
+        out.append(chunk)
+    if repeat_page and len(chunks) > 2:
+        out.append([dict(it) for it in chunks[1]])
+        injected += len(chunks[1])
+    return out, injected
+
+
+def accuracy(args):
+    rng = random.Random(0)
+    totals = {"items": 0, "injected": 0, "removed": 0, "exact": 0, "fuzzy": 0, "original_dups": 0}
+    for m, (name, items) in enumerate(sorted(load_corpus().items())):
+        # duplicates already in the recorded output are counted separately
+        keys = [(dedupe_key(it), normalize_name(it.get("category"))) for it in items]
+        totals["original_dups"] += len(keys) - len(set(keys))
+
+        chunks, injected = chunked_with_duplicates(items, args.chunk_items, args.overlap, m % 5 == 0, rng)
+        deduper = ItemDeduper()
+        for chunk in chunks:
+            deduper.add(chunk)
+        report = deduper.report()
+        totals["items"] += len(items)
+        totals["injected"] += injected
+        for k in ("exact", "fuzzy"):
+            totals[k] += report[k]
+        totals["removed"] += report["duplicates_removed"]
+
+    wrong = totals["removed"] - totals["injected"] - totals["original_dups"]
+    print(f"{totals['items']} recorded items, {totals['injected']} injected duplicates, "
+          f"{totals['original_dups']} already duplicated in the recorded output")
+    print(f"removed {totals['removed']} ({totals['exact']} exact, {totals['fuzzy']} fuzzy), "
+          f"difference vs expected: {wrong:+d}\n")
+
+
+def all_pairs(items):
+    kept, by_price = [], {}
+    for it in items:
+        name, variant, prices = dedupe_key(it)
+        block = by_price.setdefault((variant, prices), [])
+        if not any(other == name or near_identical(name, other) for other in block):
+            kept.append(it)
+            block.append(name)
+    return kept
+
+
+def throughput(args):
+    print(f"{'items':>8s} {'prices':8s} {'deduper s':>10s} {'items/s':>10s} {'all-pairs s':>12s} {'removed':>8s}")
+    rng = random.Random(1)
+    for n in args.sizes:
+        items = expand_and_normalize_items(make_items(n))
+        few = [dict(it, price=float(rng.choice(PRICE_POINTS))) for it in items]
+        for label, rows in (("spread", items), ("10 pts", few)):
+            start = time.perf_counter()
+            deduper = ItemDeduper()
+            deduper.add(rows)
+            t = time.perf_counter() - start
+            if n <= 10000:
+                start = time.perf_counter()
+                all_pairs(rows)
+                t_all = f"{time.perf_counter() - start:12.3f}"
+            else:
+                t_all = f"{'skipped':>12s}"
+            print(f"{n:8d} {label:8s} {t:10.3f} {n / t:10.0f} {t_all} {deduper.report()['duplicates_removed']:8d}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--chunk-items", type=int, default=12)
+    ap.add_argument("--overlap", type=int, default=2)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    accuracy(args)
+    throughput(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Per-chunk latency with and without hedged requests.
+
+Two fake deployments share a long-tailed latency distribution (most calls
+fast, a few stragglers ~20x slower). Reports p50/p99 per chunk and the
+hedge rate.
+
+    python -m benchmarks.bench_hedging --chunks 300
+"""
+
+import time
+import random
+import argparse
+
+from benchmarks.fake_azure import FakeAzureOpenAI
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, AzureBackend
+from restaurant_etl.parsers.hedging import HedgePolicy, _percentile
+from restaurant_etl.parsers.rate_limiter import RateLimitScheduler
+
+MESSAGES = [{"role": "user", "content": "menu chunk"}]
+
+
+def long_tail(rng, base, tail_prob, tail_factor):
+    def latency(model, out_tokens):
+        t = rng.lognormvariate(0, 0.25) * base
+        return t * tail_factor if rng.random() < tail_prob else t
+    return latency
+
+
+def make_pool(rng, args):
+    latency = long_tail(rng, args.base, args.tail_prob, args.tail_factor)
+    backends = [
+        AzureBackend(f"https://{region}.example", "gpt-4o", "key",
+                     client=FakeAzureOpenAI(rpm=0, tpm=0, latency=latency))
+        for region in ("eastus", "swedencentral")
+    ]
+    return DeploymentPool(backends, scheduler=RateLimitScheduler())
+
+
+def run(pool, chunks, hedge=None):
+    latencies = []
+    call = lambda backend: backend.client.chat.completions.create(model=backend.deployment, messages=MESSAGES)
+    for _ in range(chunks):
+        start = time.monotonic()
+        if hedge:
+            hedge.run(lambda: pool.submit(call), lambda: pool.submit(call, max_retries=1))
+        else:
+            pool.submit(call)
+        latencies.append(time.monotonic() - start)
+    return latencies
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--chunks", type=int, default=300)
+    ap.add_argument("--base", type=float, default=0.02, help="typical latency (s)")
+    ap.add_argument("--tail-prob", type=float, default=0.03)
+    ap.add_argument("--tail-factor", type=float, default=20.0)
+    args = ap.parse_args()
+
+    rng = random.Random(11)
+    baseline = run(make_pool(rng, args), args.chunks)
+    policy = HedgePolicy(percentile=0.95, min_samples=10, min_delay=args.base)
+    hedged = run(make_pool(rng, args), args.chunks, hedge=policy)
+
+    for name, lat in (("no hedging", baseline), ("hedged p95", hedged)):
+        print(f"{name:12s} p50={_percentile(lat, 0.5) * 1000:6.0f}ms "
+              f"p99={_percentile(lat, 0.99) * 1000:6.0f}ms total={sum(lat):5.1f}s")
+    print(f"hedge report: {policy.report()}")
+
+
+if __name__ == "__main__":
+    main()
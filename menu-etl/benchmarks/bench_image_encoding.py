@@ -0,0 +1,117 @@
+"""
+Vision payload size, image tokens and fidelity: full-resolution PNG (the
+old _image_to_base64) vs ImageEncodingPolicy, on the PDFs in input/.
+
+Pages are rendered at 300 DPI like PDFImageExtractor (capped at 40MP).
+Offline, fidelity is PSNR of the decoded upload against a lossless page
+at the model's working resolution. With --live (Azure credentials in .env) every menu is also
+parsed by the vision model under both encodings and item accuracy
+(name + price F1 against the PNG run) is reported.
+
+    python -m benchmarks.bench_image_encoding [--pages 4] [--live]
+"""
+
+import io
+import math
+import time
+import base64
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pdfplumber
+from PIL import Image
+
+from restaurant_etl.parsers.image_encoding import ImageEncodingPolicy, effective_size, image_tokens
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def render_pages(pdf_path, limit, max_pixels=40_000_000):
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for p in pdf.pages[:limit]:
+            # poster-sized pages (e.g. one 1852x32952pt sheet) would need GBs at 300 DPI
+            dpi = min(300, int(72 * math.sqrt(max_pixels / (p.width * p.height))))
+            pages.append(p.to_image(resolution=dpi).original.convert("RGB"))
+    return pages
+
+
+def legacy_encode(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def psnr(reference, data_url):
+    raw = base64.b64decode(data_url.split(",", 1)[1])
+    decoded = Image.open(io.BytesIO(raw)).convert("L").resize(reference.size, Image.LANCZOS)
+    a = np.asarray(reference.convert("L"), dtype=np.float64)
+    b = np.asarray(decoded, dtype=np.float64)
+    mse = np.mean((a - b) ** 2)
+    return float("inf") if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def f1(reference, candidate):
+    key = lambda items: {(str(i.get("item_name", "")).lower().strip(), i.get("price")) for i in items}
+    ref, cand = key(reference), key(candidate)
+    if not ref and not cand:
+        return 1.0
+    return 2 * len(ref & cand) / (len(ref) + len(cand))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=4, help="pages per menu")
+    ap.add_argument("--live", action="store_true")
+    args = ap.parse_args()
+
+    policies = {
+        "png-full (old)": None,
+        "auto": ImageEncodingPolicy(),
+        "auto, no tile snap": ImageEncodingPolicy(tile_snap=0),
+        "jpeg q85": ImageEncodingPolicy(format="jpeg"),
+        "webp q85": ImageEncodingPolicy(format="webp"),
+    }
+    menus = {p.name: render_pages(p, args.pages) for p in sorted((ROOT / "input").glob("*.pdf"))}
+    pages = [img for imgs in menus.values() for img in imgs]
+    print(f"{len(menus)} menus, {len(pages)} pages\n")
+    print(f"{'encoding':20s} {'KB/page':>8s} {'tokens/page':>12s} {'ms/page':>8s} {'PSNR dB':>8s}")
+
+    for name, policy in policies.items():
+        total_bytes = total_tokens = 0
+        quality = []
+        start = time.perf_counter()
+        urls = [legacy_encode(img) if policy is None else policy.encode(img).data_url for img in pages]
+        elapsed = time.perf_counter() - start
+        for img, url in zip(pages, urls):
+            total_bytes += len(url)
+            if policy is None:
+                total_tokens += image_tokens(*img.size)
+            else:
+                total_tokens += policy.encode(img).tokens
+            reference = img.resize(effective_size(*img.size), Image.LANCZOS)
+            quality.append(psnr(reference, url))
+        n = len(pages)
+        print(f"{name:20s} {total_bytes / n / 1024:8.0f} {total_tokens / n:12.0f} "
+              f"{elapsed / n * 1000:8.0f} {np.mean([q for q in quality if q != float('inf')] or [0]):8.1f}")
+
+    if args.live:
+        from restaurant_etl.parsers.image_llm_parser import ImageLLMMenuParser
+
+        class _Legacy:
+            def encode(self, image):
+                tokens = image_tokens(*image.size)
+                return type("E", (), {"data_url": legacy_encode(image), "tokens": tokens})
+
+        print()
+        baseline = ImageLLMMenuParser(encoding=_Legacy())
+        tuned = ImageLLMMenuParser(encoding=policies["auto"])
+        for menu, imgs in menus.items():
+            ref = baseline.parse_images(imgs)
+            new = tuned.parse_images(imgs)
+            print(f"{menu:40s} items png={len(ref):4d} auto={len(new):4d} F1={f1(ref, new):.3f}")
+
+
+if __name__ == "__main__":
+    main()
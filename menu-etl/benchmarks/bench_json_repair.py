@@ -0,0 +1,136 @@
+"""
+Microbenchmark + fuzz corpus for json_repair vs the old repair cascade.
+
+The corpus is built from recorded responses (logs/last_llm_response.json
+and the output CSVs re-serialised as model JSON) with the damage we see
+from the model: code fences, trailing prose, leading prose with brackets
+("[12 items]", "{see notes}"), Python literals, raw newlines, trailing
+commas, nested objects, junk between items and truncation. Reports parse failures, items recovered and time per call.
+
+    python -m benchmarks.bench_json_repair [--cases 2000] [--dump fuzz_corpus/]
+"""
+
+import re
+import json
+import time
+import random
+import logging
+import argparse
+from pathlib import Path
+
+from benchmarks.bench_output_format import load_corpus, as_json_contract
+from restaurant_etl.parsers.json_repair import load_menu_json
+
+
+def legacy_repair(raw):
+    """The cascade previously copy-pasted in llm_parser.py / llmp3.py / llm-parser.py."""
+    if not raw:
+        raise ValueError("Empty model output")
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.strip("`")
+        raw = raw.replace("json", "", 1).strip()
+    try:
+        parsed = json.loads(raw)
+        return {"items": parsed} if isinstance(parsed, list) else parsed
+    except Exception:
+        pass
+    last_pos = max(raw.rfind("}"), raw.rfind("]"))
+    if last_pos != -1:
+        try:
+            parsed = json.loads(raw[: last_pos + 1])
+            return {"items": parsed} if isinstance(parsed, list) else parsed
+        except Exception:
+            pass
+    repaired = raw.replace("\r", " ").replace("\t", " ").replace("\n", "\\n")
+    repaired = re.sub(r":\s*None\b", ": null", repaired)
+    repaired = re.sub(r":\s*True\b", ": true", repaired)
+    repaired = re.sub(r":\s*False\b", ": false", repaired)
+    try:
+        parsed = json.loads(repaired)
+        return {"items": parsed} if isinstance(parsed, list) else parsed
+    except Exception:
+        pass
+    salvaged = []
+    for obj in re.findall(r'\{[^{}]*\}', raw, re.DOTALL):
+        try:
+            salvaged.append(json.loads(obj))
+        except Exception:
+            continue
+    if salvaged:
+        return {"items": salvaged}
+    raise ValueError("Could not parse model output")
+
+
+# ============================================================
+# FUZZ CORPUS
+# ============================================================
+
+def _mutations(rng):
+    def fence(s): return "```json\n" + s + "\n```"
+    def prose(s): return "Here is the extracted menu:\n" + s + "\nLet me know if you need anything else."
+    def bracket_prose(s): return "Here is the result [12 items] {see notes}:\n" + s
+    def pyliterals(s): return s.replace(":null", ": None").replace(":true", ": True")
+    def newlines(s): return s.replace('","', '",\n  "')
+    def raw_newline_in_string(s): return s.replace('"description":"', '"description":"line one\nline two ', 1)
+    def trailing_comma(s): return s.replace("}]", "},]")
+    def nested(s): return s.replace('"price_display"', '"variants":{"size":{"label":"R"}},"price_display"')
+    def junk(s): return s.replace("},{", "}, <<page break>> {", 3)
+    def truncate(s): return s[: rng.randint(len(s) // 3, len(s) - 1)]
+    return [fence, prose, bracket_prose, pyliterals, newlines, raw_newline_in_string, trailing_comma, nested, junk, truncate]
+
+
+def build_corpus(n_cases, seed=7):
+    rng = random.Random(seed)
+    sources = []
+    for name, items in load_corpus().items():
+        if items:
+            sources.append((name, as_json_contract(items[:60]), min(len(items), 60)))
+    mutations = _mutations(rng)
+    cases = list(sources)  # undamaged originals first
+    while len(cases) < n_cases:
+        name, raw, count = rng.choice(sources)
+        for m in rng.sample(mutations, rng.randint(1, 3)):
+            raw = m(raw)
+        cases.append((name, raw, count))
+    return cases
+
+
+def run(fn, cases):
+    failures = recovered = 0
+    start = time.perf_counter()
+    for _, raw, _ in cases:
+        try:
+            items = fn(raw).get("items", [])
+            recovered += sum(1 for it in items if isinstance(it, dict) and it.get("item_name"))
+        except Exception:
+            failures += 1
+    return failures, recovered, (time.perf_counter() - start) / len(cases) * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=2000)
+    ap.add_argument("--dump", help="write the fuzz corpus to this directory")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)  # repair warnings would dominate the timings
+
+    cases = build_corpus(args.cases)
+    expected = sum(count for _, _, count in cases)
+    if args.dump:
+        out = Path(args.dump)
+        out.mkdir(parents=True, exist_ok=True)
+        for i, (name, raw, _) in enumerate(cases):
+            (out / f"{i:05d}_{name[:40]}.txt").write_text(raw, encoding="utf-8")
+
+    clean = cases[:len(load_corpus())]
+    print(f"{len(cases)} cases, {expected} items in the undamaged sources\n")
+    print(f"{'parser':10s} {'failures':>8s} {'items':>8s} {'us/call':>8s} {'us/call (clean)':>16s}")
+    for name, fn in (("legacy", legacy_repair), ("json_repair", load_menu_json)):
+        failures, recovered, us = run(fn, cases)
+        _, _, clean_us = run(fn, clean)
+        print(f"{name:10s} {failures:8d} {recovered:8d} {us:8.0f} {clean_us:16.0f}")
+
+
+if __name__ == "__main__":
+    main()
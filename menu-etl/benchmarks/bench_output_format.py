@@ -0,0 +1,127 @@
+"""
+Current JSON contract vs the compact header-once contract.
+
+Offline (default): re-encodes recorded results (logs/last_llm_response.json
+and the CSVs in output/) in both contracts and reports output tokens,
+modelled generation latency and decode round-trip accuracy.
+
+Live: --live menu.txt parses the same text with both formats through
+LLMMenuParser and compares completion tokens, latency and item agreement.
+
+    python -m benchmarks.bench_output_format
+    python -m benchmarks.bench_output_format --live extracted_menu.txt
+"""
+
+import csv
+import json
+import argparse
+from pathlib import Path
+
+from restaurant_etl.parsers.compact_format import encode_compact, decode_compact
+from restaurant_etl.utils.tokens import estimate_tokens
+
+ROOT = Path(__file__).resolve().parents[1]
+JSON_FIELDS = [
+    "item_name", "category", "subcategory", "description", "price",
+    "half_plate_price", "full_plate_price", "small_price", "medium_price",
+    "large_price", "price_display",
+]
+
+
+def _num(v):
+    if v in (None, ""):
+        return None
+    try:
+        return float(v)
+    except ValueError:
+        return v
+
+
+def load_corpus():
+    corpus = {}
+    log = ROOT / "logs" / "last_llm_response.json"
+    if log.exists():
+        raw = json.loads(log.read_text())["raw"]
+        corpus["last_llm_response"] = json.loads(raw)["items"]
+    for path in sorted((ROOT / "output").glob("*.csv")):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        corpus[path.stem] = [
+            {k: (_num(v) if k.endswith("price") else (v or None)) for k, v in r.items() if k in JSON_FIELDS}
+            for r in rows
+        ]
+    return corpus
+
+
+def as_json_contract(items):
+    # what the model currently emits: every key on every item
+    return json.dumps(
+        {"items": [{f: it.get(f) for f in JSON_FIELDS} for it in items]},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+def _same(a, b):
+    for f in JSON_FIELDS:
+        x, y = a.get(f), b.get(f)
+        if isinstance(x, float) or isinstance(y, float):
+            if x is None or y is None or abs(float(x) - float(y)) > 1e-6:
+                if not (x is None and y is None):
+                    return False
+        elif (x or None) != (y or None):
+            return False
+    return True
+
+
+def offline(ms_per_token: float):
+    total_json = total_compact = 0
+    print(f"{'menu':60s} {'items':>5s} {'json_tok':>8s} {'cmp_tok':>7s} {'saving':>6s} {'roundtrip':>9s}")
+    for name, items in load_corpus().items():
+        if not items:
+            continue
+        j = estimate_tokens(as_json_contract(items))
+        compact = encode_compact(items)
+        c = estimate_tokens(compact)
+        decoded = decode_compact(compact)
+        exact = sum(_same(a, b) for a, b in zip(items, decoded)) / len(items)
+        total_json += j
+        total_compact += c
+        print(f"{name[:60]:60s} {len(items):5d} {j:8d} {c:7d} {1 - c / j:6.0%} {exact:9.1%}")
+
+    print(f"\nTotal output tokens: json={total_json} compact={total_compact} "
+          f"({1 - total_compact / total_json:.0%} fewer)")
+    print(f"Modelled generation time at {ms_per_token:.0f} ms/token: "
+          f"json={total_json * ms_per_token / 1000:.0f}s compact={total_compact * ms_per_token / 1000:.0f}s")
+
+
+def live(text_path: str):
+    from restaurant_etl.parsers.llm_parser import LLMMenuParser
+
+    text = Path(text_path).read_text(encoding="utf-8")
+    results = {}
+    for fmt in ("json", "compact"):
+        menu = LLMMenuParser(output_format=fmt).parse_menu(text)
+        usage = menu.extraction_metadata["llm_usage"]
+        keys = {(it.item_name.lower(), it.price) for it in menu.items}
+        results[fmt] = keys
+        print(f"{fmt:8s} items={len(menu.items)} completion_tokens={usage['completion_tokens']} "
+              f"latency={usage['latency_s']:.1f}s")
+    a, b = results["json"], results["compact"]
+    agreement = len(a & b) / max(1, len(a | b))
+    print(f"item agreement (name, price): {agreement:.1%}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--live", help="text file to parse with both formats (needs Azure credentials)")
+    ap.add_argument("--ms-per-token", type=float, default=15.0)
+    args = ap.parse_args()
+    if args.live:
+        live(args.live)
+    else:
+        offline(args.ms_per_token)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Page-image cache: rasterization time with and without PageImageCache on
+the PDFs in input/ (poster-sized pages skipped).
+
+Run 1 is a cold cache: the OCR pass renders every page, then the vision
+pass reads them back. Run 2 is a rerun with a fresh process-level cache
+on the same directory. A third run with a cap below the working set shows
+eviction.
+
+Pages are rendered with pdfplumber so the benchmark runs without poppler.
+
+    python -m benchmarks.bench_page_cache [--dpi 300] [--pages 6]
+"""
+
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+import pdfplumber
+
+from restaurant_etl.extractors.page_cache import PageImageCache
+
+ROOT = Path(__file__).resolve().parents[1]
+MAX_PAGE_PT = 2000  # skip poster pages (GBs of pixels at 300 DPI)
+
+
+def pdfplumber_rasterize(pdf_path, first_page, last_page, dpi):
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[i - 1].to_image(resolution=dpi).original.convert("RGB")
+                for i in range(first_page, last_page + 1)]
+
+
+def menus(limit):
+    out = {}
+    for path in sorted((ROOT / "input").glob("*.pdf")):
+        with pdfplumber.open(path) as pdf:
+            pages = [i for i, p in enumerate(pdf.pages[:limit], 1) if max(p.width, p.height) <= MAX_PAGE_PT]
+        if pages:
+            out[str(path)] = pages
+    return out
+
+
+def consume(cache, docs, dpi):
+    """OCR pass then vision pass over the same pages."""
+    start = time.perf_counter()
+    for path, pages in docs.items():
+        for page in pages:
+            cache.get_page(path, page, dpi=dpi)     # OCR: page by page
+        cache.get_pages(path, pages, dpi=dpi)       # vision: whole document
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dpi", type=int, default=300)
+    ap.add_argument("--pages", type=int, default=6, help="pages per menu")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    docs = menus(args.pages)
+    n = sum(len(p) for p in docs.values())
+
+    start = time.perf_counter()
+    for path, pages in docs.items():
+        for page in pages:
+            pdfplumber_rasterize(path, page, page, args.dpi)
+    uncached = 2 * (time.perf_counter() - start)  # both passes render
+    print(f"{len(docs)} PDFs, {n} pages at {args.dpi} DPI; no cache (OCR + vision): {uncached:.1f}s\n")
+    print(f"{'run':28s} {'seconds':>8s} {'hit ratio':>9s} {'render s':>9s} {'saved s':>8s} {'MB':>6s} {'evicted':>7s}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [
+            ("1: cold (OCR then vision)", None),
+            ("2: rerun", None),
+            ("3: rerun, cap 1/3 of set", "cap"),
+        ]
+        size = None
+        for name, cap in runs:
+            max_bytes = size // 3 if cap else 10 * 1024 ** 3
+            cache = PageImageCache(tmp, max_bytes=max_bytes, rasterize=pdfplumber_rasterize)
+            elapsed = consume(cache, docs, args.dpi)
+            r = cache.report()
+            size = size or r["bytes"]
+            print(f"{name:28s} {elapsed:8.1f} {r['hit_ratio']:9.0%} {r['render_s']:9.1f} {r['saved_s']:8.1f} "
+                  f"{r['bytes'] / 1e6:6.0f} {r['evictions']:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Per-page hybrid routing vs single-mode runs on a synthetic mixed menu PDF:
+born-digital text pages, scanned pages (image only) and a stylised page
+(artwork, no readable prices), written to a temporary PDF.
+
+The text LLM, Azure Read and the vision model are local fakes with
+latencies in proportion to the real services (scaled down ~10x): each
+page's items are known, OCR returns the text on the page (none of the
+items on the stylised one) and the vision model returns the items of the
+page it is shown. Reported per
+mode: items found, estimated cost and wall time, plus the per-page routes.
+
+Pages are rendered with pdfplumber here so the benchmark runs without
+poppler; the pipeline itself renders with pdf2image.
+
+    python -m benchmarks.bench_page_routing [--text-pages 8] [--scanned-pages 3]
+"""
+
+import io
+import json
+import time
+import zlib
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+import pdfplumber
+from PIL import Image, ImageDraw
+
+from benchmarks.fake_azure import FakeAzureOpenAI
+from benchmarks.bench_cascade import responder, LINE_RE
+from benchmarks.bench_vision_concurrency import WORDS
+from restaurant_etl.extractors.pdf_extractor import PDFExtractor
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, AzureBackend
+from restaurant_etl.parsers.hybrid import HybridMenuProcessor
+from restaurant_etl.parsers.image_llm_parser import ImageLLMMenuParser
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.parsers.rate_limiter import RateLimitScheduler
+
+PAGE_W, PAGE_H = 595, 842  # A4 in points
+OCR_LATENCY = 0.3
+
+
+def menu_page(rng, page_no):
+    lines = [f"SECTION {page_no}:"]  # not "Name price" to the fake models
+    for k in range(rng.randint(12, 30)):
+        lines.append(f"{' '.join(rng.sample(WORDS, 2))} {page_no}.{k} ..... {rng.randint(5, 90) * 10}")
+    return lines
+
+
+def scanned_image(lines):
+    img = Image.new("L", (1240, 1754), 250)
+    draw = ImageDraw.Draw(img)
+    for i, line in enumerate(lines):
+        draw.text((120, 120 + i * 40), line, fill=20)
+    return img
+
+
+def write_pdf(path, pages):
+    """Minimal PDF: ("text", lines) pages get a Helvetica text layer, ("image", img) pages one JPEG."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    pages_id = add(None)  # placeholder, filled below
+    for kind, payload in pages:
+        if kind == "text":
+            ops = ["BT /F1 10 Tf 14 TL 60 780 Td"]
+            for line in payload:
+                ops.append("(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T*")
+            ops.append("ET")
+            data = zlib.compress("\n".join(ops).encode("latin-1"))
+            content = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+            resources = b"<< /Font << /F1 %d 0 R >> >>" % font
+        else:
+            buf = io.BytesIO()
+            payload.convert("RGB").save(buf, format="JPEG", quality=80)
+            jpg = buf.getvalue()
+            image = add(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+                        b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n"
+                        % (payload.width, payload.height, len(jpg)) + jpg + b"\nendstream")
+            ops = f"q {PAGE_W} 0 0 {PAGE_H} 0 0 cm /Im0 Do Q".encode()
+            content = add(b"<< /Length %d >>\nstream\n" % len(ops) + ops + b"\nendstream")
+            resources = b"<< /XObject << /Im0 %d 0 R >> >>" % image
+        page_ids.append(add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R /Resources %s >>"
+                            % (pages_id, PAGE_W, PAGE_H, content, resources)))
+    objects[pages_id - 1] = (b"<< /Type /Pages /Count %d /Kids [" % len(page_ids)
+                             + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] >>")
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    Path(path).write_bytes(bytes(out))
+
+
+class BenchExtractor(PDFExtractor):
+    """pdfplumber rendering + a fake Azure Read that returns the text drawn on each page."""
+
+    def __init__(self, drawn_text):
+        super().__init__()
+        self.drawn_text = drawn_text
+        self.last_page = None
+        self.ocr_pages = 0
+
+    def render_page(self, pdf_path, page, dpi=300):
+        self.last_page = page
+        with pdfplumber.open(pdf_path) as pdf:
+            return pdf.pages[page - 1].to_image(resolution=min(dpi, 150)).original
+
+    def _ocr_image(self, img, idx):
+        self.ocr_pages += 1
+        time.sleep(OCR_LATENCY)
+        return self.drawn_text.get(idx, "")
+
+
+def build(truth, drawn_text):
+    extractor = BenchExtractor(drawn_text)
+    text_client = FakeAzureOpenAI(rpm=0, tpm=0, responder=responder(random.Random(0), 0.0))
+    text_pool = DeploymentPool([AzureBackend("https://eastus.example", "gpt-4o", "key", client=text_client)],
+                               scheduler=RateLimitScheduler())
+
+    def vision_respond(messages, model):
+        return json.dumps({"items": truth.get(extractor.last_page, [])})
+
+    vision_client = FakeAzureOpenAI(rpm=0, tpm=0, responder=vision_respond,
+                                    latency=lambda model, out_tokens: 0.3 + out_tokens * 0.002)
+    vision_pool = DeploymentPool([AzureBackend("https://eastus.example", "gpt-4o", "key", client=vision_client)],
+                                 scheduler=RateLimitScheduler())
+    return HybridMenuProcessor(
+        extractor=extractor,
+        parser=LLMMenuParser(pool=text_pool, clean_text=False),
+        vision_parser=ImageLLMMenuParser(pool=vision_pool),
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--text-pages", type=int, default=8)
+    ap.add_argument("--scanned-pages", type=int, default=3)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(5)
+    pages, truth, drawn_text = [], {}, {}
+    kinds = ["text"] * args.text_pages + ["scan"] * args.scanned_pages + ["stylised"]
+    rng.shuffle(kinds)
+    for page_no, kind in enumerate(kinds, 1):
+        lines = menu_page(rng, page_no)
+        truth[page_no] = [{"item_name": m["name"], "category": lines[0], "price": float(m["price"])}
+                          for m in LINE_RE.finditer("\n".join(lines))]
+        if kind == "text":
+            pages.append(("text", lines))
+            drawn_text[page_no] = "\n".join(lines)
+        elif kind == "scan":
+            pages.append(("image", scanned_image(lines)))
+            drawn_text[page_no] = "\n".join(lines)
+        else:
+            # prices only as artwork: OCR reads the heading, not the items
+            pages.append(("image", scanned_image(lines)))
+            drawn_text[page_no] = lines[0]
+
+    total = sum(len(v) for v in truth.values())
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "mixed.pdf"
+        write_pdf(pdf_path, pages)
+        print(f"{len(pages)} pages ({args.text_pages} text, {args.scanned_pages} scanned, 1 stylised), "
+              f"{total} items\n")
+        print(f"{'mode':8s} {'items':>7s} {'cost $':>8s} {'seconds':>8s}  routes")
+
+        for mode in ("hybrid", "text", "ocr", "vision"):
+            processor = build(truth, drawn_text)
+            menu = processor.process(str(pdf_path), "Bench", force_route=None if mode == "hybrid" else mode)
+            report = menu.extraction_metadata["routing"]
+            print(f"{mode:8s} {menu.total_items / total:7.1%} {report['cost_usd']:8.4f} "
+                  f"{report['seconds']:8.1f}  {report['routes']}")
+            if mode == "hybrid":
+                hybrid_pages = report["pages"]
+
+        print("\nhybrid routing:")
+        for p in hybrid_pages:
+            print(f"  page {p['page']:2d}: {p['route']:6s} -> {p['final_route']:6s} {p['items']:3d} items "
+                  f"{p['seconds']:5.2f}s ${p['cost_usd']:.4f}  {p['reason']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+CSV vs Parquet run outputs: size on disk, write time and read / scan
+times for downstream readers.
+
+The recorded output/*.csv runs are loaded as MenuData and rewritten
+--runs times for each of --restaurants restaurants (restaurant i gets
+recorded run i mod N), once in the current layout (one timestamped CSV
+per run in a flat folder) and once with write_menu_parquet. The reads
+are:
+
+  full:        every run, all columns
+  scan:        every run, item_name + category + price only
+  restaurant:  all runs of one restaurant
+
+    python -m benchmarks.bench_parquet_output [--restaurants 40] [--runs 5]
+"""
+
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from benchmarks.bench_output_format import load_corpus
+from restaurant_etl.models.menu_models import MenuData
+from restaurant_etl.parsers.postprocess import validate_menu_items
+from restaurant_etl.writers.parquet_writer import write_menu_parquet, read_menus, restaurant_slug
+
+SCAN_COLUMNS = ["item_name", "category", "price"]
+
+
+def recorded_menus():
+    menus = []
+    for name, items in load_corpus().items():
+        valid, _ = validate_menu_items(items)
+        if valid:
+            menus.append(MenuData(restaurant_name=name, items=valid, total_items=len(valid),
+                                  extraction_metadata={"source": name}))
+    return menus
+
+
+def dir_bytes(root):
+    return sum(p.stat().st_size for p in Path(root).rglob("*") if p.is_file())
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--restaurants", type=int, default=40)
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    recorded = recorded_menus()
+    base = datetime(2025, 12, 1, 12, 0, 0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_root, pq_root = Path(tmp) / "csv", Path(tmp) / "parquet"
+        csv_root.mkdir()
+        jobs = []
+        for r in range(args.restaurants):
+            menu = recorded[r % len(recorded)].model_copy(update={"restaurant_name": f"Restaurant {r}"})
+            for run in range(args.runs):
+                jobs.append((menu, base + timedelta(days=run, seconds=r)))
+        rows = sum(m.total_items for m, _ in jobs)
+        print(f"{len(jobs)} runs ({args.restaurants} restaurants x {args.runs}), {rows} rows\n")
+
+        def write_csv():
+            for menu, run_at in jobs:
+                stem = restaurant_slug(menu.restaurant_name)
+                menu.to_dataframe().to_csv(csv_root / f"{stem}_extracted_{run_at:%Y%m%d_%H%M%S}.csv", index=False)
+
+        def write_parquet():
+            for menu, run_at in jobs:
+                write_menu_parquet(menu, pq_root, source=f"{restaurant_slug(menu.restaurant_name)}.pdf", run_at=run_at)
+
+        w_csv, _ = timed(write_csv)
+        w_pq, _ = timed(write_parquet)
+        print(f"{'':12s} {'CSV':>10s} {'Parquet':>10s}")
+        print(f"{'MB on disk':12s} {dir_bytes(csv_root) / 1e6:10.2f} {dir_bytes(pq_root) / 1e6:10.2f}")
+        print(f"{'write s':12s} {w_csv:10.3f} {w_pq:10.3f}")
+
+        csv_files = sorted(csv_root.glob("*.csv"))
+        one = restaurant_slug(jobs[0][0].restaurant_name)
+        reads = {
+            "full": (
+                lambda: pd.concat([pd.read_csv(p) for p in csv_files], ignore_index=True),
+                lambda: read_menus(pq_root).to_pandas(),
+            ),
+            "scan": (
+                lambda: pd.concat([pd.read_csv(p, usecols=SCAN_COLUMNS) for p in csv_files], ignore_index=True),
+                lambda: read_menus(pq_root, columns=SCAN_COLUMNS).to_pandas(),
+            ),
+            "restaurant": (
+                lambda: pd.concat([pd.read_csv(p) for p in csv_root.glob(f"{one}_extracted_*.csv")],
+                                  ignore_index=True),
+                lambda: read_menus(pq_root, restaurants=[jobs[0][0].restaurant_name]).to_pandas(),
+            ),
+        }
+        for name, (read_csv, read_pq) in reads.items():
+            t_csv, df_csv = timed(read_csv)
+            t_pq, df_pq = timed(read_pq)
+            assert len(df_csv) == len(df_pq), (name, len(df_csv), len(df_pq))
+            print(f"{name + ' s':12s} {t_csv:10.3f} {t_pq:10.3f}   ({len(df_pq)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Per-item vs columnar post-processing of LLM items at catalog scale.
+
+Items are sampled from the recorded corpus (output CSVs and the last LLM
+response) and mixed with the shapes the model produces for large
+catalogs: price only in price_display ("₹1,250", "250-350", "Rs. 99/-"),
+"Coke / Sprite" rows with one price per name, rows already carrying a
+numeric price, and a few invalid rows (no name, no price). Each size is
+run through
+
+  per-item:  expand_and_normalize_items, then MenuItem(**item) one by one
+  columnar:  expand_and_normalize_columnar (distinct price strings parsed
+             once, simple shapes in one Arrow string kernel), then
+             validate_menu_items (one TypeAdapter call)
+
+and the outputs of each stage are checked to be identical. The price
+parse cache is cleared before every run (a new catalog's strings).
+
+    python -m benchmarks.bench_postprocess [--sizes 1000 10000 100000]
+"""
+
+import copy
+import time
+import random
+import logging
+import argparse
+
+from benchmarks.bench_output_format import load_corpus
+from restaurant_etl.models.menu_models import MenuItem
+from restaurant_etl.parsers.postprocess import (
+    COLUMNAR_MIN_ITEMS,
+    expand_and_normalize_items,
+    expand_and_normalize_columnar,
+    validate_menu_items,
+)
+from restaurant_etl.utils.price_tokenizer import _parse_str
+
+DISPLAYS = ["₹{p}", "Rs. {p}/-", "{p}", "${p}.50", "{p}-{q}", "₹1,{p}", "{p} / {q}", "MRP {p}", "", "Ask"]
+
+
+def make_items(n, seed=0):
+    rng = random.Random(seed)
+    corpus = [it for items in load_corpus().values() for it in items]
+    items = []
+    for i in range(n):
+        it = dict(rng.choice(corpus)) if corpus else {"item_name": f"Item {i}", "category": "Main"}
+        it["item_name"] = f"{it.get('item_name') or 'Item'} {i}"
+        r = rng.random()
+        p, q = rng.randint(20, 900), rng.randint(20, 900)
+        if r < 0.5:
+            it["price"] = None
+            it["price_display"] = rng.choice(DISPLAYS).format(p=p, q=q)
+        elif r < 0.55:
+            it["item_name"] = f"Coke {i} / Sprite {i}"
+            it["price"] = None
+            it["price_display"] = f"₹{p} / ₹{q}"
+        elif r < 0.56:
+            it["item_name"] = None
+        else:
+            it["price"] = float(p)
+        items.append(it)
+    return items
+
+
+def validate_loop(items):
+    out = []
+    for item in items:
+        try:
+            obj = MenuItem(**item)
+            if obj.has_any_price():
+                out.append(obj)
+        except Exception:
+            pass
+    return out
+
+
+def validate_batch(items):
+    return validate_menu_items(items)[0]
+
+
+def timed(fn, items, repeat):
+    best = None
+    for _ in range(repeat):
+        data = copy.deepcopy(items)
+        _parse_str.cache_clear()
+        start = time.perf_counter()
+        result = fn(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"below {COLUMNAR_MIN_ITEMS} items the columnar function runs the per-item loop\n")
+    print(f"{'items':>8s} {'stage':10s} {'per-item s':>11s} {'columnar s':>11s} {'speedup':>8s}  identical")
+    for n in args.sizes:
+        items = make_items(n)
+        t_loop, a = timed(expand_and_normalize_items, items, args.repeat)
+        t_col, b = timed(expand_and_normalize_columnar, items, args.repeat)
+        print(f"{n:8d} {'expand':10s} {t_loop:11.3f} {t_col:11.3f} {t_loop / t_col:7.1f}x  {a == b}")
+        v_loop, ma = timed(validate_loop, a, args.repeat)
+        v_col, mb = timed(validate_batch, b, args.repeat)
+        same = [m.model_dump() for m in ma] == [m.model_dump() for m in mb]
+        print(f"{'':8s} {'validate':10s} {v_loop:11.3f} {v_col:11.3f} {v_loop / v_col:7.1f}x  {same}")
+        print(f"{'':8s} {'total':10s} {t_loop + v_loop:11.3f} {t_col + v_col:11.3f} "
+              f"{(t_loop + v_loop) / (t_col + v_col):7.1f}x  {len(mb)} items kept")
+
+if __name__ == "__main__":
+    main()
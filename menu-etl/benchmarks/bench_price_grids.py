@@ -0,0 +1,119 @@
+"""
+Exploded per-variant JSON vs compact price grids + local expansion.
+
+Collapses the recorded output CSVs back into the grid contract, expands
+them again with postprocess.expand_price_grids and reports output tokens
+and whether the expanded rows are identical to the originals. The add-on
+rules of the system prompt (base + each add-on, combinations only when
+combine_addons is set) are checked on small hand-written sections.
+
+    python -m benchmarks.bench_price_grids
+"""
+
+import json
+from itertools import groupby
+
+from benchmarks.bench_output_format import load_corpus, as_json_contract
+from restaurant_etl.parsers.postprocess import expand_price_grids
+from restaurant_etl.utils.tokens import estimate_tokens
+
+KEY_FIELDS = ("item_name", "category", "subcategory", "description", "price")
+
+
+def _split_variant(name):
+    if " - " in name:
+        base, label = name.rsplit(" - ", 1)
+        return base, label
+    return name, None
+
+
+def collapse_to_grids(items):
+    """Group consecutive 'Name - Variant' rows into section grids."""
+    rows = []
+    for key, group in groupby(
+        items,
+        key=lambda it: (it.get("category"), it.get("subcategory"), it.get("description"),
+                        _split_variant(it["item_name"])[0]),
+    ):
+        group = list(group)
+        labels = tuple(_split_variant(it["item_name"])[1] for it in group)
+        if len(group) == 1 and labels[0] is not None:
+            # a lone "X - Y" row is just an item name
+            labels = (None,)
+            base = group[0]["item_name"]
+        else:
+            base = key[3]
+        rows.append((key[0], key[1], labels, {
+            "name": base,
+            "description": key[2],
+            "prices": [it.get("price") for it in group],
+        }))
+
+    sections = []
+    for (cat, sub, labels), group in groupby(rows, key=lambda r: (r[0], r[1], r[2])):
+        sections.append({
+            "category": cat,
+            "subcategory": sub,
+            "columns": [] if labels == (None,) else list(labels),
+            "rows": [r[3] for r in group],
+        })
+    return sections
+
+
+# (section, expected (item_name, price) rows); the system prompt's "Regular = 49, Cheese +20, Butter +10"
+_ADDONS = [{"label": "Cheese", "delta": 20}, {"label": "Butter", "delta": 10}]
+ADDON_CASES = {
+    "addons, combine_addons omitted": (
+        {"category": "Vada Pav", "columns": ["Regular"], "addons": _ADDONS, "rows": [{"name": "Vada Pav", "prices": [49]}]},
+        [("Vada Pav - Regular", 49), ("Vada Pav - Cheese", 69), ("Vada Pav - Butter", 59)],
+    ),
+    "addons, combine_addons true": (
+        {"category": "Vada Pav", "columns": ["Regular"], "addons": _ADDONS, "combine_addons": True,
+         "rows": [{"name": "Vada Pav", "prices": [49]}]},
+        [("Vada Pav - Regular", 49), ("Vada Pav - Cheese", 69), ("Vada Pav - Butter", 59),
+         ("Vada Pav - Cheese + Butter", 79)],
+    ),
+    "addons on variant columns": (
+        {"category": "Pasta", "columns": ["Regular", "Baked"], "addons": _ADDONS[:1], "combine_addons": False,
+         "rows": [{"name": "Alfredo", "prices": [99, 149]}]},
+        [("Alfredo - Regular", 99), ("Alfredo - Regular + Cheese", 119),
+         ("Alfredo - Baked", 149), ("Alfredo - Baked + Cheese", 169)],
+    ),
+}
+
+
+def check_addons():
+    for name, (section, expected) in ADDON_CASES.items():
+        got = [(it["item_name"], it["price"]) for it in expand_price_grids([section])]
+        print(f"{name:35s} {len(got):2d} items  {'ok' if got == expected else f'MISMATCH {got}'}")
+    print()
+
+
+def main():
+    check_addons()
+
+    total_exploded = total_grid = 0
+    print(f"{'menu':60s} {'items':>5s} {'json_tok':>8s} {'grid_tok':>8s} {'ratio':>6s} {'identical':>9s}")
+    for name, items in load_corpus().items():
+        items = [it for it in items if it.get("item_name") and it.get("price") is not None]
+        if not items:
+            continue
+        sections = collapse_to_grids(items)
+        expanded = expand_price_grids(sections)
+        # the grid contract always fills subcategory (= category when absent)
+        expected = [
+            {**{f: it.get(f) for f in KEY_FIELDS}, "subcategory": it.get("subcategory") or it.get("category")}
+            for it in items
+        ]
+        same = expected == [{f: it.get(f) for f in KEY_FIELDS} for it in expanded]
+        e = estimate_tokens(as_json_contract(items))
+        g = estimate_tokens(json.dumps({"sections": sections}, separators=(",", ":"), ensure_ascii=False))
+        total_exploded += e
+        total_grid += g
+        print(f"{name[:60]:60s} {len(items):5d} {e:8d} {g:8d} {e / g:5.1f}x {str(same):>9s}")
+    print(f"\nTotal output tokens: exploded={total_exploded} grid={total_grid} "
+          f"({total_exploded / total_grid:.1f}x fewer)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Price outlier validation: what it catches, what it costs, and what
+re-verifying only the flagged items saves.
+
+Detection: each recorded menu (output CSVs and the last LLM response) is
+checked as recorded (flags there are false alarms or real mistakes
+already in the data), then with --errors of its priced items corrupted
+the ways OCR / the model get prices wrong: x10 / x100 (lost decimal
+point), /10 (lost digit), a phone number, a number from the item's own
+name, 0, and half / full plate prices swapped. Reported: injected errors
+caught (recall) and new flags that are not injected errors.
+
+Throughput: find_price_outliers over 1k / 10k / 100k items drawn from
+the corpus, in 50-item categories.
+
+Re-verification: each corrupted menu goes through PriceVerifier with a
+fake model that transcribes the true menu text ("Name ..... price"
+lines, as in bench_cascade). Reported: errors corrected, correct prices
+changed, LLM calls and tokens sent vs re-parsing the whole menu.
+
+    python -m benchmarks.bench_price_outliers [--errors 0.03]
+"""
+
+import copy
+import time
+import random
+import logging
+import argparse
+
+from benchmarks.bench_cascade import menu_text, responder, make_pool
+from benchmarks.bench_output_format import load_corpus
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.validators.price_outliers import PriceVerifier, find_price_outliers
+
+KINDS = ["x10", "x100", "div10", "phone", "name_number", "zero", "half_full"]
+
+
+def corrupt(items, rate, rng):
+    """Copy of items with some prices broken; returns (items, {(index, field): kind})."""
+    items = copy.deepcopy(items)
+    injected = {}
+    for i, it in enumerate(items):
+        if it.get("price") is None or rng.random() >= rate:
+            continue
+        kind = rng.choice(KINDS)
+        digits = [float(t) for t in str(it.get("item_name") or "").split() if t.isdigit()]
+        if kind == "name_number" and not digits:
+            kind = "x10"
+        if kind == "half_full":
+            if it.get("half_plate_price") is None or it.get("full_plate_price") is None:
+                kind = "x100"
+            else:
+                it["half_plate_price"], it["full_plate_price"] = it["full_plate_price"], it["half_plate_price"]
+                injected[(i, "half_plate_price")] = kind
+                continue
+        p = it["price"]
+        it["price"] = {"x10": p * 10, "x100": p * 100, "div10": round(p / 10, 2),
+                       "phone": float(rng.randrange(7000000000, 9999999999)),
+                       "name_number": digits[0] if digits else None, "zero": 0.0}[kind]
+        injected[(i, "price")] = kind
+    return items, injected
+
+
+def detection(corpus, args):
+    rng = random.Random(0)
+    caught, total, false_flags, recorded_flags, items_n = {}, {}, 0, 0, 0
+    for items in corpus.values():
+        items_n += len(items)
+        base = {(f["index"], f["field"]) for f in find_price_outliers(items)}
+        recorded_flags += len(base)
+        bad, injected = corrupt(items, args.errors, rng)
+        flagged = {(f["index"], f["field"]) for f in find_price_outliers(bad)}
+        for key, kind in injected.items():
+            total[kind] = total.get(kind, 0) + 1
+            caught[kind] = caught.get(kind, 0) + (key in flagged)
+        false_flags += len(flagged - base - set(injected))
+
+    print(f"{len(corpus)} menus, {items_n} items; as recorded: {recorded_flags} flags")
+    n, c = sum(total.values()), sum(caught.values())
+    print(f"injected {n} errors, caught {c} ({c / max(1, n):.1%}); {false_flags} new flags on clean prices")
+    for kind in KINDS:
+        if total.get(kind):
+            print(f"  {kind:12s} {caught[kind]:4d}/{total[kind]:<4d}")
+    print()
+
+
+def throughput(corpus):
+    pool = [it for items in corpus.values() for it in items if it.get("price") is not None]
+    rng = random.Random(1)
+    for n in (1000, 10000, 100000):
+        items = [dict(rng.choice(pool), category=f"cat{i // 50}") for i in range(n)]
+        start = time.perf_counter()
+        flags = find_price_outliers(items)
+        elapsed = time.perf_counter() - start
+        print(f"find_price_outliers: {n:6d} items in {elapsed * 1000:7.1f} ms "
+              f"({elapsed / n * 1e6:.2f} us/item, {len(flags)} flags)")
+    print()
+
+
+def verification(corpus, args):
+    rng = random.Random(2)
+    parser = LLMMenuParser(pool=make_pool("gpt-4o", responder(rng, 0.0), 0.00005), clean_text=False)
+    stats = {"errors": 0, "corrected": 0, "wrongly_changed": 0, "calls": 0, "tokens": 0, "menu_tokens": 0}
+    for items in corpus.values():
+        # only items the fake model can read back (one "Name ..... price" line each)
+        items = [it for it in items if it.get("item_name") and it.get("price") is not None]
+        text = menu_text(items)
+        if not text:
+            continue
+        bad, injected = corrupt(items, args.errors, rng)
+        injected = {k: v for k, v in injected.items() if k[1] == "price"}
+        report = PriceVerifier(parser).verify(text, bad)
+        stats["errors"] += len(injected)
+        for i, (good, got) in enumerate(zip(items, bad)):
+            if (i, "price") in injected:
+                stats["corrected"] += got["price"] == good["price"]
+            elif got["price"] != good["price"]:
+                stats["wrongly_changed"] += 1
+        stats["calls"] += report["llm_calls"]
+        stats["tokens"] += report["tokens_sent"]
+        stats["menu_tokens"] += report["menu_tokens"]
+
+    print(f"re-verification: {stats['corrected']}/{stats['errors']} injected price errors corrected, "
+          f"{stats['wrongly_changed']} correct prices changed")
+    print(f"  {stats['calls']} LLM calls, {stats['tokens']} text tokens sent vs {stats['menu_tokens']} "
+          f"to re-parse the menus ({stats['tokens'] / max(1, stats['menu_tokens']):.1%})")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--errors", type=float, default=0.03)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    corpus = load_corpus()
+    detection(corpus, args)
+    throughput(corpus)
+    verification(corpus, args)
+
+
+if __name__ == "__main__":
+    main()
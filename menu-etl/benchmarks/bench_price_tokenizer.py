@@ -0,0 +1,147 @@
+"""
+Price tokenizer: accuracy and throughput against the old _parse_numeric.
+
+The corpus (benchmarks/price_corpus.tsv: raw string, expected price,
+source) holds the real price strings of the recorded runs: every price
+cell of the output/ CSVs, the price_display fields of the last LLM
+response and the price tokens in the text layers of input/ PDFs, plus the
+formats those runs did not happen to contain (European separators, Indian
+grouping and "/-", "k", ranges, per-unit and market prices). --rebuild
+regenerates the recorded part; the format cases are listed below.
+
+Throughput is strings per second over the corpus repeated to --rows,
+per string (no cache) and through the batch API.
+
+    python -m benchmarks.bench_price_tokenizer [--rows 200000] [--rebuild]
+"""
+
+import re
+import csv
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+import pdfplumber
+
+from restaurant_etl.parsers.cascade import PRICE_TOKEN_RE
+from restaurant_etl.utils.price_tokenizer import tokenize_price, parse_prices
+
+ROOT = Path(__file__).resolve().parents[1]
+CORPUS = Path(__file__).with_name("price_corpus.tsv")
+PRICE_COLUMNS = ("price", "half_plate_price", "full_plate_price", "small_price", "medium_price", "large_price")
+
+FORMAT_CASES = [
+    ("1.250,00", 1250.0), ("€ 9,90", 9.9), ("12,50 €", 12.5), ("1.250.000", 1250000.0),
+    ("₹ 1,250/-", 1250.0), ("Rs. 99/-", 99.0), ("1,25,000", 125000.0), ("INR 450", 450.0),
+    ("12.5k", 12500.0), ("2K", 2000.0),
+    ("250-350", 250.0), ("250 – 350", 250.0), ("250 to 350", 250.0), ("₹250 - ₹350", 250.0), ("$12~$15", 12.0),
+    ("₹120/kg", 120.0), ("$8.00 per bottle", 8.0), ("₹60 per 100g", 60.0), ("2 pcs ₹250", 250.0),
+    ("MP", None), ("M.P.", None), ("Market Price", None), ("Seasonal", None), ("Ask server", None),
+    ("MRP 120", 120.0), ("", None),
+]
+
+
+def legacy_parse_numeric(s):
+    """postprocess._parse_numeric before the tokenizer."""
+    if s is None:
+        return None
+    s = str(s).strip()
+    s = re.sub(r"[\$₹€,]", "", s)
+    if "-" in s:
+        s = s.split("-")[0]
+    m = re.compile(r"\d+[\.,]?\d*").search(s)
+    if not m:
+        return None
+    try:
+        return float(m.group().replace(',', ''))
+    except Exception:
+        return None
+
+
+def rebuild_corpus():
+    rows = []
+    for path in sorted((ROOT / "output").glob("*.csv")):
+        with open(path, newline="", encoding="utf-8") as f:
+            for r in csv.DictReader(f):
+                for col in PRICE_COLUMNS:
+                    if r.get(col):
+                        rows.append((r[col], float(r[col]), f"output/{path.name}:{col}"))
+                if r.get("price_display"):
+                    rows.append((r["price_display"], float(r["price"]) if r.get("price") else None,
+                                 f"output/{path.name}:price_display"))
+    log = ROOT / "logs" / "last_llm_response.json"
+    if log.exists():
+        for it in json.loads(json.loads(log.read_text())["raw"])["items"]:
+            if it.get("price_display"):
+                rows.append((it["price_display"], it.get("price"), "logs/last_llm_response.json"))
+    for path in sorted((ROOT / "input").glob("*.pdf")):
+        with pdfplumber.open(path) as pdf:
+            text = "\n".join(p.extract_text() or "" for p in pdf.pages)
+        for tok in PRICE_TOKEN_RE.findall(text):
+            # the text layers only use "$ 14.95" / "1250" style prices
+            rows.append((tok, float(re.sub(r"[^\d.]", "", tok)), f"input/{path.name}"))
+    rows.extend((raw, expected, "format") for raw, expected in FORMAT_CASES)
+
+    with open(CORPUS, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter="\t", lineterminator="\n")
+        w.writerow(["raw", "expected", "source"])
+        for raw, expected, source in rows:
+            w.writerow([raw, "" if expected is None else expected, source])
+    return len(rows)
+
+
+def load_corpus():
+    with open(CORPUS, newline="", encoding="utf-8") as f:
+        return [(r["raw"], float(r["expected"]) if r["expected"] else None, r["source"])
+                for r in csv.DictReader(f, delimiter="\t")]
+
+
+def accuracy(parse, corpus):
+    wrong = []
+    for raw, expected, source in corpus:
+        got = parse(raw)
+        if not (got == expected or (got is not None and expected is not None and abs(got - expected) < 1e-9)):
+            wrong.append((raw, expected, got, source))
+    return wrong
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200000)
+    ap.add_argument("--rebuild", action="store_true")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    if args.rebuild or not CORPUS.exists():
+        print(f"wrote {rebuild_corpus()} strings to {CORPUS.name}")
+    corpus = load_corpus()
+    recorded = [c for c in corpus if c[2] != "format"]
+    formats = [c for c in corpus if c[2] == "format"]
+    print(f"corpus: {len(recorded)} recorded strings, {len(formats)} format cases\n")
+
+    print(f"{'parser':12s} {'recorded ok':>12s} {'formats ok':>11s}")
+    for name, parse in (("legacy", legacy_parse_numeric), ("tokenizer", lambda s: tokenize_price(s).value)):
+        wrong_rec, wrong_fmt = accuracy(parse, recorded), accuracy(parse, formats)
+        print(f"{name:12s} {len(recorded) - len(wrong_rec):7d}/{len(recorded):<4d} "
+              f"{len(formats) - len(wrong_fmt):6d}/{len(formats):<4d}")
+        for raw, expected, got, _ in wrong_fmt:
+            print(f"    {raw!r:22s} expected {expected}, got {got}")
+
+    column = [c[0] for c in corpus] * (args.rows // len(corpus) + 1)
+    column = column[:args.rows]
+    print(f"\nthroughput over {len(column)} strings:")
+    for name, fn in (
+        ("legacy per string", lambda col: [legacy_parse_numeric(s) for s in col]),
+        ("tokenizer per string", lambda col: [tokenize_price(s).value for s in col]),
+        ("tokenizer batch", parse_prices),
+    ):
+        start = time.perf_counter()
+        fn(column)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:22s} {len(column) / elapsed:12,.0f} strings/s")
+
+
+if __name__ == "__main__":
+    main()
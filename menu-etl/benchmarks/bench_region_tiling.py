@@ -0,0 +1,70 @@
+"""
+Region tiling for vision mode on the PDFs in input/: regions per page,
+image tokens, and the detail the model gets (model pixels per inch of the
+page after the service's downscale) for whole pages vs layout regions.
+
+With --live (Azure credentials in .env) every menu is also parsed both
+ways and the item counts are compared.
+
+    python -m benchmarks.bench_region_tiling [--pages 4] [--live]
+"""
+
+import time
+import argparse
+from pathlib import Path
+
+from benchmarks.bench_image_encoding import render_pages
+from restaurant_etl.extractors.layout_regions import LayoutAnalyzer
+from restaurant_etl.parsers.image_encoding import ImageEncodingPolicy
+
+ROOT = Path(__file__).resolve().parents[1]
+DPI = 300
+
+
+def detail(policy, image):
+    """Model pixels per inch of page, after resizing to the model's working resolution."""
+    return policy.prepare(image).width / image.width * DPI
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=4, help="pages per menu")
+    ap.add_argument("--live", action="store_true")
+    args = ap.parse_args()
+
+    layout = LayoutAnalyzer()
+    policy = ImageEncodingPolicy()
+    menus = {p.name: render_pages(p, args.pages) for p in sorted((ROOT / "input").glob("*.pdf"))}
+
+    print(f"{'menu':32s} {'pages':>5s} {'regions':>7s} {'ms/page':>8s} "
+          f"{'tokens page':>11s} {'tiled':>6s} {'dpi page':>8s} {'tiled':>6s}")
+    for name, pages in menus.items():
+        start = time.perf_counter()
+        tiled = [layout.crop(img) for img in pages]
+        elapsed = (time.perf_counter() - start) / len(pages)
+
+        page_tokens = sum(policy.encode(img).tokens for img in pages)
+        region_tokens = sum(policy.encode(r).tokens for regions in tiled for r in regions)
+        # area-weighted over the page content each image carries
+        page_dpi = sum(detail(policy, img) for img in pages) / len(pages)
+        regions = [r for rs in tiled for r in rs]
+        area = sum(r.width * r.height for r in regions)
+        region_dpi = sum(detail(policy, r) * r.width * r.height for r in regions) / area
+        print(f"{name[:32]:32s} {len(pages):5d} {len(regions):7d} {elapsed * 1000:8.0f} "
+              f"{page_tokens:11d} {region_tokens:6d} {page_dpi:8.0f} {region_dpi:6.0f}")
+
+    if args.live:
+        from restaurant_etl.parsers.image_llm_parser import ImageLLMMenuParser
+
+        print()
+        whole = ImageLLMMenuParser()
+        split = ImageLLMMenuParser(layout=layout)
+        for name, pages in menus.items():
+            a = whole.parse_images(pages)
+            b = split.parse_images(pages)
+            print(f"{name[:40]:40s} items page={len(a):4d} tiled={len(b):4d} "
+                  f"requests page={whole.last_run['requests']} tiled={split.last_run['requests']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Load test: blind 1s/2s/4s retries vs the shared rate-limit scheduler.
+
+Runs parallel "Dagster runs" (threads) against FakeAzureOpenAI with a
+compressed quota window. A request that runs out of retries is resubmitted
+(as a failed Dagster run would be) until all of them have succeeded, so the
+headline number is the wall time to finish the whole workload; failing fast
+doesn't count as throughput. The scheduled side goes through DeploymentPool,
+the same path LLMMenuParser uses.
+
+    python -m benchmarks.bench_scheduler --workers 8 --requests 20
+"""
+
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_azure import FakeAzureOpenAI, FakeRateLimitError
+from restaurant_etl.parsers.deployment_pool import AzureBackend, DeploymentPool
+from restaurant_etl.parsers.rate_limiter import RateLimitScheduler
+from restaurant_etl.parsers.prompt_templates import SYSTEM_PROMPT
+from restaurant_etl.utils.tokens import estimate_tokens
+
+MODEL = "gpt-4o"
+MAX_TOKENS = 1000
+MESSAGES = [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": "x" * 2000}]
+
+
+def _call(client):
+    return client.chat.completions.create(model=MODEL, messages=MESSAGES, max_tokens=MAX_TOKENS)
+
+
+def _until_done(one, workers, total):
+    """Resubmit failed requests until all succeed. Returns (rounds, first-round successes)."""
+    pending = list(range(total))
+    rounds = first_ok = 0
+    with ThreadPoolExecutor(workers) as pool:
+        while pending:
+            results = list(pool.map(one, pending))
+            if not rounds:
+                first_ok = sum(results)
+            pending = [i for i, ok in zip(pending, results) if not ok]
+            rounds += 1
+    return rounds, first_ok
+
+
+def run_blind(client, workers, requests, scale, max_retries=3):
+    def one(_):
+        delay = 1.0
+        for attempt in range(1, max_retries + 1):
+            try:
+                _call(client)
+                return True
+            except FakeRateLimitError:
+                if attempt == max_retries:
+                    return False
+                time.sleep(delay * scale)
+                delay *= 2
+
+    return _until_done(one, workers, workers * requests)
+
+
+def run_scheduled(client, workers, requests, scale, rpm, tpm, max_retries=3):
+    backend = AzureBackend("https://eastus.example", MODEL, "key", rpm=rpm, tpm=tpm, client=client)
+    pool = DeploymentPool([backend], scheduler=RateLimitScheduler(period=client.period),
+                          cooldown=client.period)
+    est = sum(estimate_tokens(m["content"]) for m in MESSAGES) + MAX_TOKENS
+
+    def one(_):
+        try:
+            pool.submit(lambda b: _call(b.client), est_tokens=est,
+                        max_retries=max_retries, base_delay=scale)
+            return True
+        except FakeRateLimitError:
+            return False
+
+    return _until_done(one, workers, workers * requests)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=10, help="requests per worker")
+    ap.add_argument("--rpm", type=int, default=30)
+    ap.add_argument("--tpm", type=int, default=60000)
+    ap.add_argument("--period", type=float, default=3.0, help="seconds standing in for one minute")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+    scale = args.period / 60.0
+    total = args.workers * args.requests
+
+    for name, runner in (("blind retries", run_blind), ("scheduler", run_scheduled)):
+        client = FakeAzureOpenAI(rpm=args.rpm, tpm=args.tpm, period=args.period)
+        kwargs = {"rpm": args.rpm, "tpm": args.tpm} if runner is run_scheduled else {}
+        start = time.perf_counter()
+        rounds, first_ok = runner(client, args.workers, args.requests, scale, **kwargs)
+        elapsed = time.perf_counter() - start
+        print(f"{name:14s} all {total} done in {elapsed:.1f}s "
+              f"({elapsed / args.period:.1f} quota windows, {rounds} round(s)) "
+              f"first-round ok={first_ok}/{total} calls={client.calls} 429s={client.throttled}")
+
+
+if __name__ == "__main__":
+    main()
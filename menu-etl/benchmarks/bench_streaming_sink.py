@@ -0,0 +1,86 @@
+"""
+Streaming sinks vs collect-then-write: wall time, peak Python memory
+(tracemalloc) and what survives a crash.
+
+--chunks chunks of --items-per-chunk postprocessed items each (from
+bench_postprocess.make_items) are written either
+
+  buffered:  all items kept, validated once, to_dataframe().to_csv() at the end
+  <format>:  open_sink(), write_items + checkpoint (fsync) per chunk, close()
+
+The crash column aborts each writer before the last chunk and counts the
+items recover_items() gets back (buffered: nothing was written).
+
+    python -m benchmarks.bench_streaming_sink [--chunks 20] [--items-per-chunk 500]
+"""
+
+import time
+import logging
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_postprocess import make_items
+from restaurant_etl.models.menu_models import MenuData
+from restaurant_etl.parsers.postprocess import expand_and_normalize_items, validate_menu_items
+from restaurant_etl.writers.sinks import open_sink, recover_items
+
+FORMATS = ["csv", "jsonl", "parquet"]
+
+
+def write_buffered(chunks, path, crash=False):
+    all_items = []
+    for i, items in enumerate(chunks):
+        if crash and i == len(chunks) - 1:
+            return 0
+        all_items.extend(items)
+    final_items, _ = validate_menu_items(all_items)
+    menu = MenuData(restaurant_name="Bench", items=final_items, total_items=len(final_items))
+    menu.to_dataframe().to_csv(path, index=False)
+    return menu.total_items
+
+
+def write_streamed(chunks, path, crash=False):
+    sink = open_sink(str(path))
+    for i, items in enumerate(chunks):
+        if crash and i == len(chunks) - 1:
+            sink.abort()
+            return len(recover_items(str(path)))
+        sink.write_items(items)
+        sink.checkpoint()
+    sink.close({"restaurant_name": "Bench"})
+    return sink.rows_written
+
+
+def measure(fn, chunks, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn(chunks, path)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6, rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--chunks", type=int, default=20)
+    ap.add_argument("--items-per-chunk", type=int, default=500)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    chunks = [expand_and_normalize_items(make_items(args.items_per_chunk, seed=i)) for i in range(args.chunks)]
+    print(f"{args.chunks} chunks x {args.items_per_chunk} items\n")
+    print(f"{'writer':9s} {'rows':>7s} {'s':>7s} {'peak MB':>8s} {'after crash':>12s}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writers = [("buffered", write_buffered, "csv")] + [(f, write_streamed, f) for f in FORMATS]
+        for name, fn, ext in writers:
+            seconds, peak, rows = measure(fn, chunks, Path(tmp) / f"{name}.{ext}")
+            kept = fn(chunks, Path(tmp) / f"{name}_crash.{ext}", crash=True)
+            print(f"{name:9s} {rows:7d} {seconds:7.3f} {peak:8.1f} {kept:12d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Vision throughput: the old sequential fixed two-image batches vs concurrent,
+adaptively sized requests, against a local fake vision endpoint.
+
+Each synthetic page is a flat gray image whose level encodes the page
+number; the fake model "reads" it back and answers with that page's items
+(page sizes vary from a few dishes to dense lists). Output past max_tokens
+is cut off and a fraction of calls fail with a 500, so the report shows
+pages/s, requests, and how many of the expected items came back, in order.
+
+    python -m benchmarks.bench_vision_concurrency [--pages 30] [--error-rate 0.05]
+"""
+
+import io
+import json
+import time
+import base64
+import random
+import logging
+import argparse
+
+from PIL import Image
+
+from benchmarks.fake_azure import FakeAzureOpenAI
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, AzureBackend
+from restaurant_etl.parsers.image_llm_parser import ImageLLMMenuParser, SYSTEM_PROMPT
+from restaurant_etl.parsers.rate_limiter import RateLimitScheduler
+from restaurant_etl.utils.tokens import estimate_tokens
+
+LEVEL_STEP = 8  # gray level per page number
+WORDS = ["Paneer", "Butter", "Masala", "Tikka", "Chicken", "Tandoori", "Garlic", "Naan", "Dal",
+         "Makhani", "Veg", "Biryani", "Hyderabadi", "Kadai", "Mushroom", "Malai", "Kofta", "Jeera"]
+
+
+class FakeServerError(Exception):
+    status_code = 500
+
+
+def make_pages(n, rng):
+    pages, truth = [], []
+    for i in range(n):
+        pages.append(Image.new("RGB", (1240, 1754), (i * LEVEL_STEP,) * 3))
+        count = rng.choice([4, 8, 12, 20, 30, 45, 60, 80])
+        truth.append([{"item_name": " ".join(rng.sample(WORDS, 3)) + f" ({i + 1}.{k})", "category": f"Section {i + 1}",
+                       "price": rng.randint(50, 900)} for k in range(count)])
+    return pages, truth
+
+
+def vision_responder(truth, rng, error_rate):
+    def respond(messages, model):
+        if rng.random() < error_rate:
+            raise FakeServerError("500 internal server error")
+        items = []
+        for part in messages[-1]["content"]:
+            if part["type"] != "image_url":
+                continue
+            raw = base64.b64decode(part["image_url"]["url"].split(",", 1)[1])
+            level = Image.open(io.BytesIO(raw)).convert("L").getpixel((0, 0))
+            items.extend(truth[round(level / LEVEL_STEP)])
+        return json.dumps({"items": items})
+    return respond
+
+
+def make_parser(truth, error_rate, seed=0, max_concurrency=None):
+    client = FakeAzureOpenAI(
+        rpm=0, tpm=0,
+        responder=vision_responder(truth, random.Random(seed), error_rate),
+        # ~10x faster than the real service: fixed overhead + per output token
+        latency=lambda model, out_tokens: 0.3 + out_tokens * 0.002,
+    )
+    backend = AzureBackend("https://eastus.example", "gpt-4o", "key", client=client)
+    pool = DeploymentPool([backend], scheduler=RateLimitScheduler())
+    return ImageLLMMenuParser(pool=pool, max_concurrency=max_concurrency), client
+
+
+def legacy_parse_images(parser, images, batch_size=2):
+    """The old loop: fixed batches, one at a time, 2500 output tokens, any final error aborts."""
+    all_items = []
+    for i in range(0, len(images), batch_size):
+        content = [{"type": "text", "text": SYSTEM_PROMPT}]
+        content += [{"type": "image_url", "image_url": {"url": parser._image_to_base64(img)}}
+                    for img in images[i:i + batch_size]]
+        response = parser.pool.submit(
+            lambda backend: backend.client.chat.completions.create(
+                model=backend.deployment, messages=[{"role": "user", "content": content}],
+                temperature=0, max_tokens=2500),
+            est_tokens=estimate_tokens(SYSTEM_PROMPT) + 2500,
+            max_retries=parser.max_retries,
+        )
+        parsed = parser._safe_json_load(response.choices[0].message.content) or {"items": []}
+        all_items.extend(parsed.get("items", []))
+    return all_items
+
+
+def score(truth, items):
+    expected = [it["item_name"] for page in truth for it in page]
+    got = [it.get("item_name") for it in items]
+    in_order = got == sorted(got, key=lambda name: expected.index(name) if name in expected else -1)
+    return len(set(got) & set(expected)) / len(expected), in_order
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=30)
+    ap.add_argument("--error-rate", type=float, default=0.05)
+    ap.add_argument("--concurrency", type=int, default=4)
+    args = ap.parse_args()
+    logging.disable(logging.ERROR)
+
+    pages, truth = make_pages(args.pages, random.Random(7))
+    total = sum(len(p) for p in truth)
+    print(f"{args.pages} pages, {total} items, error rate {args.error_rate:.0%}\n")
+    print(f"{'mode':34s} {'seconds':>8s} {'pages/s':>8s} {'requests':>9s} {'items':>7s} {'order':>6s}")
+
+    runs = {
+        "sequential, 2 per request (old)": lambda p: legacy_parse_images(p, pages),
+        "sequential, adaptive": lambda p: p.parse_images(pages, max_concurrency=1),
+        f"concurrent x{args.concurrency}, 2 per request": lambda p: p.parse_images(
+            pages, batch_size=2, max_concurrency=args.concurrency),
+        f"concurrent x{args.concurrency}, adaptive": lambda p: p.parse_images(
+            pages, max_concurrency=args.concurrency),
+    }
+    for name, run in runs.items():
+        parser, client = make_parser(truth, args.error_rate)
+        start = time.perf_counter()
+        try:
+            items = run(parser)
+        except Exception as e:
+            print(f"{name:34s} aborted: {e}")
+            continue
+        elapsed = time.perf_counter() - start
+        recall, in_order = score(truth, items)
+        print(f"{name:34s} {elapsed:8.1f} {args.pages / elapsed:8.2f} {client.calls:9d} "
+              f"{recall:7.1%} {'yes' if in_order else 'NO':>6s}")
+        if parser.last_run and run is not runs["sequential, 2 per request (old)"]:
+            r = parser.last_run
+            print(f"{'':34s} truncated->split={r['truncated_splits']} retries={r['retries']} "
+                  f"failed pages={r['failed_pages']} out tokens/page~{r['output_tokens_per_page']}")
+
+
+if __name__ == "__main__":
+    main()
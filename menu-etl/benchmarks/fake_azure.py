@@ -0,0 +1,193 @@
+"""
+Local stand-ins for Azure OpenAI used by the benchmark scripts.
+
+FakeAzureOpenAI mimics `client.chat.completions.create` closely enough for
+the parsers, enforces per-deployment RPM/TPM quotas over a (compressible)
+window and answers over-quota calls with a 429 carrying Retry-After.
+Output longer than max_tokens is cut off with finish_reason="length".
+It also carries a local Batch API (`files` / `batches`) that completes a
+job `batch_delay` seconds after submission.
+"""
+
+import json
+import time
+import random
+import threading
+from collections import deque
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from restaurant_etl.utils.tokens import estimate_tokens
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after:.2f}s")
+        self.response = SimpleNamespace(
+            status_code=429,
+            headers={"retry-after-ms": str(int(retry_after * 1000))},
+        )
+
+
+def _default_responder(messages, model):
+    return json.dumps({"items": [], "extraction_metadata": {"total_items_extracted": 0}})
+
+
+class _Quota:
+    def __init__(self, rpm: int, tpm: int, period: float):
+        self.rpm, self.tpm, self.period = rpm, tpm, period
+        self.events = deque()  # (timestamp, tokens)
+        self.lock = threading.Lock()
+
+    def admit(self, tokens: int):
+        with self.lock:
+            now = time.monotonic()
+            while self.events and now - self.events[0][0] >= self.period:
+                self.events.popleft()
+            used = sum(t for _, t in self.events)
+            if len(self.events) >= self.rpm or used + tokens > self.tpm:
+                oldest = self.events[0][0] if self.events else now
+                raise FakeRateLimitError(max(0.05, self.period - (now - oldest)))
+            self.events.append((now, tokens))
+
+
+class _Completions:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def create(self, model, messages, max_tokens=4096, **kwargs):
+        owner = self.owner
+        prompt_tokens = sum(
+            estimate_tokens(m["content"]) if isinstance(m["content"], str) else 1000
+            for m in messages
+        )
+        quota = owner.quota_for(model)
+        if quota is not None:
+            try:
+                quota.admit(prompt_tokens + max_tokens)
+            except FakeRateLimitError:
+                with owner.lock:
+                    owner.throttled += 1
+                raise
+
+        with owner.lock:
+            owner.calls += 1
+        content = owner.responder(messages, model)
+        completion_tokens = estimate_tokens(content)
+        finish_reason = "stop"
+        if completion_tokens > max_tokens:
+            # cut off like the service does when the output runs past max_tokens
+            content = content[:len(content) * max_tokens // completion_tokens]
+            completion_tokens = estimate_tokens(content)
+            finish_reason = "length"
+        time.sleep(owner.latency(model, completion_tokens))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+
+class _Files:
+    def __init__(self):
+        self.store = {}
+        self.uploads = 0
+
+    def create(self, file, purpose="batch"):
+        data = file.read() if hasattr(file, "read") else file
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        self.uploads += 1
+        return SimpleNamespace(id=self.put(data), purpose=purpose, bytes=len(data))
+
+    def put(self, data: str) -> str:
+        file_id = f"file-{len(self.store) + 1}"
+        self.store[file_id] = data
+        return file_id
+
+    def content(self, file_id):
+        return SimpleNamespace(text=self.store[file_id])
+
+
+class _Batches:
+    def __init__(self, owner):
+        self.owner = owner
+        self.jobs = {}
+
+    def create(self, input_file_id, endpoint, completion_window="24h"):
+        batch_id = f"batch-{len(self.jobs) + 1}"
+        self.jobs[batch_id] = SimpleNamespace(
+            id=batch_id, input_file_id=input_file_id, endpoint=endpoint, status="validating",
+            submitted=time.monotonic(), output_file_id=None, error_file_id=None,
+        )
+        return self.jobs[batch_id]
+
+    def retrieve(self, batch_id):
+        job = self.jobs[batch_id]
+        if job.status == "validating":
+            job.status = "in_progress"
+        elif job.status == "in_progress" and time.monotonic() - job.submitted >= self.owner.batch_delay:
+            self._complete(job)
+        return job
+
+    def _complete(self, job):
+        owner = self.owner
+        files = owner.files
+        out, errors = [], []
+        for line in files.store[job.input_file_id].splitlines():
+            if not line.strip():
+                continue
+            req = json.loads(line)
+            if owner._rng.random() < owner.batch_fail_rate:
+                errors.append({"custom_id": req["custom_id"], "response": None,
+                               "error": {"code": "server_error", "message": "internal error"}})
+                continue
+            body = req["body"]
+            content = owner.responder(body["messages"], body["model"])
+            prompt_tokens = sum(estimate_tokens(m["content"]) for m in body["messages"])
+            completion_tokens = estimate_tokens(content)
+            out.append({"custom_id": req["custom_id"], "error": None, "response": {
+                "status_code": 200,
+                "body": {
+                    "choices": [{"message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens},
+                },
+            }})
+        job.output_file_id = files.put("\n".join(json.dumps(r) for r in out))
+        if errors:
+            job.error_file_id = files.put("\n".join(json.dumps(r) for r in errors))
+        job.status = "completed"
+
+
+class FakeAzureOpenAI:
+    def __init__(self, rpm: int = 60, tpm: int = 60000, period: float = 60.0,
+                 responder: Optional[Callable] = None,
+                 latency: Optional[Callable] = None,
+                 batch_delay: float = 0.0, batch_fail_rate: float = 0.0):
+        self.rpm, self.tpm, self.period = rpm, tpm, period
+        self.responder = responder or _default_responder
+        self.latency = latency or (lambda model, out_tokens: 0.05 + out_tokens * 0.0005)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self._quotas = {}
+        self.chat = SimpleNamespace(completions=_Completions(self))
+        self.batch_delay = batch_delay
+        self.batch_fail_rate = batch_fail_rate
+        self._rng = random.Random(3)
+        self.files = _Files()
+        self.batches = _Batches(self)
+
+    def quota_for(self, model: str) -> Optional[_Quota]:
+        if not self.rpm and not self.tpm:
+            return None
+        with self.lock:
+            if model not in self._quotas:
+                self._quotas[model] = _Quota(self.rpm, self.tpm, self.period)
+            return self._quotas[model]
@@ -3,13 +3,15 @@ from dagster import asset
 from pathlib import Path
 import logging
 
+from dagster_project.resources import MenuClientsResource
+
 # compute project root reliably
 PROJECT_ROOT = Path(__file__).resolve().parents[1].parent  # menu-etl/
 INPUT_DIR = PROJECT_ROOT / "input"
 OUTPUT_DIR = PROJECT_ROOT / "output"
 
 @asset
-def menu_etl_asset() -> str:
+def menu_etl_asset(menu_clients: MenuClientsResource) -> str:
     input_dir = INPUT_DIR
     output_dir = OUTPUT_DIR
     output_dir.mkdir(exist_ok=True)
@@ -17,8 +19,8 @@ def menu_etl_asset() -> str:
     if not input_dir.exists():
         raise FileNotFoundError(f"Input folder not found: {input_dir}")
 
-    extractor = UniversalExtractor()
-    parser = LLMMenuParser()
+    extractor = menu_clients.extractor
+    parser = menu_clients.parser
 
     results = []
     for file in input_dir.iterdir():
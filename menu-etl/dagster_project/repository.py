@@ -1,9 +1,11 @@
 from dagster import Definitions
 from dagster_project.assets.menu_assets import menu_etl_asset
 from dagster_project.jobs.menu_job import menu_job
+from dagster_project.resources import MenuClientsResource
 
 defs = Definitions(
     assets=[menu_etl_asset],
     jobs=[menu_job],
+    resources={"menu_clients": MenuClientsResource()},
 )
 
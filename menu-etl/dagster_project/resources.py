@@ -0,0 +1,41 @@
+from dagster import ConfigurableResource, InitResourceContext
+from pydantic import PrivateAttr
+
+from restaurant_etl.extractors.universal_extractor import UniversalExtractor
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+from restaurant_etl.utils.http_clients import configure_http_clients, close_http_clients
+
+
+class MenuClientsResource(ConfigurableResource):
+    """
+    Extractor + LLM parser held for a whole run, on the process-wide pooled
+    HTTP clients (restaurant_etl.utils.http_clients). Connections are closed
+    when the run ends.
+    """
+
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    http2: bool = True
+
+    _extractor: UniversalExtractor = PrivateAttr(default=None)
+    _parser: LLMMenuParser = PrivateAttr(default=None)
+
+    def setup_for_execution(self, context: InitResourceContext) -> None:
+        configure_http_clients(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            http2=self.http2,
+        )
+        self._extractor = UniversalExtractor()
+        self._parser = LLMMenuParser()
+
+    def teardown_after_execution(self, context: InitResourceContext) -> None:
+        close_http_clients()
+
+    @property
+    def extractor(self) -> UniversalExtractor:
+        return self._extractor
+
+    @property
+    def parser(self) -> LLMMenuParser:
+        return self._parser
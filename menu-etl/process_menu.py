@@ -7,7 +7,9 @@ import logging
 
 from restaurant_etl.extractors.pdf_image_extractor import PDFImageExtractor
 from restaurant_etl.parsers.image_llm_parser import ImageLLMMenuParser
+from restaurant_etl.extractors.page_cache import get_page_cache
 from restaurant_etl.models.menu_models import MenuItem, MenuData
+from restaurant_etl.writers.parquet_writer import write_menu_parquet
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,7 +18,9 @@ logger = logging.getLogger(__name__)
 # PROCESS SINGLE FILE (IMAGE MODE)
 # ============================================================
 
-def process_single_menu(file_path: str, output_dir: str = "output"):
+def process_single_menu(file_path: str, output_dir: str = "output",
+                        extractor: PDFImageExtractor = None, parser: ImageLLMMenuParser = None,
+                        output_format: str = "csv"):
     print("\n" + "=" * 70)
     print("  MENU EXTRACTION PIPELINE (IMAGE → LLM → CSV)")
     print("=" * 70 + "\n")
@@ -37,14 +41,20 @@ def process_single_menu(file_path: str, output_dir: str = "output"):
     print(" STEP 1: Converting PDF to images")
     print("-" * 70)
 
-    extractor = PDFImageExtractor()
+    extractor = extractor or PDFImageExtractor()
     images = extractor.extract_images(str(file_path))
 
     if not images:
         print(" ❌ No images extracted")
         return None
 
-    print(f" Extracted {len(images)} page images\n")
+    print(f" Extracted {len(images)} page images")
+    cache = get_page_cache()
+    if cache is not None:
+        stats = cache.report()
+        print(f"   Page cache: hit ratio {stats['hit_ratio']:.0%}, "
+              f"{stats['saved_s']:.1f}s of rasterization saved")
+    print()
 
     # -----------------------------------------
     # STEP 2 — IMAGE → LLM
@@ -52,7 +62,7 @@ def process_single_menu(file_path: str, output_dir: str = "output"):
     print(" STEP 2: Parsing images using GPT-4o Vision")
     print("-" * 70)
 
-    parser = ImageLLMMenuParser()
+    parser = parser or ImageLLMMenuParser()
     raw_items = parser.parse_images(images)
 
     if not raw_items:
@@ -116,11 +126,14 @@ def process_single_menu(file_path: str, output_dir: str = "output"):
 
     df = menu_data.to_dataframe()
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_path = output_dir / f"{file_path.stem}_vision_{timestamp}.csv"
-    df.to_csv(out_path, index=False)
+    if output_format == "parquet":
+        out_path = write_menu_parquet(menu_data, output_dir, source=file_path)
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        out_path = output_dir / f"{file_path.stem}_vision_{timestamp}.csv"
+        df.to_csv(out_path, index=False)
 
-    print(f" ✅ Saved CSV: {out_path}")
+    print(f" ✅ Saved {output_format.upper()}: {out_path}")
     print(f" Rows: {len(df)} | Columns: {len(df.columns)}\n")
 
     print(" PREVIEW")
@@ -139,16 +152,19 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("input", help="PDF file or folder")
     parser.add_argument("--output", default="output")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
     args = parser.parse_args()
 
     path = Path(args.input)
 
     if path.is_file():
-        process_single_menu(str(path), args.output)
+        process_single_menu(str(path), args.output, output_format=args.format)
     else:
+        extractor, llm_parser = PDFImageExtractor(), ImageLLMMenuParser()
         for f in path.iterdir():
             if f.suffix.lower() == ".pdf":
-                process_single_menu(str(f), args.output)
+                process_single_menu(str(f), args.output, extractor=extractor, parser=llm_parser,
+                                    output_format=args.format)
 
 
 if __name__ == "__main__":
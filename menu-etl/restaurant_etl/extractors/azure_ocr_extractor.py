@@ -1,23 +1,13 @@
-import os
-from azure.ai.formrecognizer import DocumentAnalysisClient
-from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
 
+from restaurant_etl.utils.http_clients import get_document_analysis_client
+
 load_dotenv()
 
 
 class AzureOCRExtractor:
     def __init__(self):
-        endpoint = os.getenv("AZURE_DOC_INTEL_ENDPOINT")
-        key = os.getenv("AZURE_DOC_INTEL_KEY")
-
-        if not endpoint or not key:
-            raise ValueError("Azure Document Intelligence credentials missing")
-
-        self.client = DocumentAnalysisClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
+        self.client = get_document_analysis_client()
 
     def extract_text(self, pdf_path: str) -> str:
         """
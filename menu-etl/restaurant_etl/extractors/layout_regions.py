@@ -0,0 +1,219 @@
+"""
+Page layout analysis for vision mode: split a page image into content
+regions (columns, boxed sections, bands) with projection profiles.
+
+Recursive XY-cut on an ink mask (pixels that differ from the page's
+background colour, so dark menus work too). A region is split into
+columns where a vertical gutter runs through its full height, otherwise
+into bands at horizontal whitespace; thin full-width rules (box borders,
+dividers) count as whitespace, and a frame around a region is peeled off.
+Consecutive bands are merged back while the result keeps an aspect ratio
+the model sees at full detail and at most `max_band_lines` text lines, so
+a sparse page stays one region and a dense one or a tall poster is cut
+into pieces whose output fits a response. Every region is trimmed to its
+ink, which also crops the margins.
+
+Regions come back in reading order: columns left to right, bands top to
+bottom.
+"""
+
+import math
+import logging
+from typing import List, Tuple, Optional
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+Box = Tuple[int, int, int, int]  # left, top, right, bottom
+
+WORK_PIXELS = 2_500_000  # analysis runs on a downscaled copy
+INK_CONTRAST = 60        # grey levels away from the background that count as ink
+BLANK_FRACTION = 0.003   # a row/column with less ink than this is whitespace
+RULE_FRACTION = 0.6      # ... and one with more is a rule line, if thin
+# the model sees a region at full detail up to 2048 on the long side and 768 on the short
+MAX_ASPECT = 2048 / 768
+
+
+def _runs(flags: np.ndarray) -> List[Tuple[int, int]]:
+    """[start, end) of each run of True."""
+    padded = np.concatenate(([False], flags, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def ink_mask(image: Image.Image) -> np.ndarray:
+    gray = np.asarray(image.convert("L"), dtype=np.int16)
+    background = int(np.median(gray))
+    return np.abs(gray - background) > INK_CONTRAST
+
+
+class LayoutAnalyzer:
+    def __init__(self, min_column_gap: float = 0.02, min_column_width: float = 0.15, min_column_height: float = 0.2,
+                 min_band_gap: float = 0.017, max_band_lines: int = 40, max_rule: float = 0.006, max_frame: float = 0.03,
+                 min_region: float = 0.08, max_depth: int = 6, max_regions: int = 24,
+                 padding: float = 0.01):
+        # lengths are fractions of the page's short side
+        self.min_column_gap = min_column_gap
+        self.min_column_width = min_column_width
+        self.min_column_height = min_column_height
+        self.min_band_gap = min_band_gap
+        # merged bands stay under this many text lines (dense sections overflow the output)
+        self.max_band_lines = max_band_lines
+        self.max_rule = max_rule
+        # page borders / margins in a contrasting colour, peeled off the edges
+        self.max_frame = max_frame
+        self.min_region = min_region
+        self.max_depth = max_depth
+        self.max_regions = max_regions
+        self.padding = padding
+
+    # --------------------------------------------------------
+
+    def regions(self, image: Image.Image) -> List[Box]:
+        """Content regions of the page in reading order, in image pixels."""
+        scale = min(1.0, math.sqrt(WORK_PIXELS / (image.width * image.height)))
+        small = image if scale == 1.0 else image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))), Image.BILINEAR)
+        mask = ink_mask(small)
+        h, w = mask.shape
+        side = min(h, w)
+        self._col_gap = max(2, int(self.min_column_gap * side))
+        self._col_width = self.min_column_width * w
+        self._col_height = self.min_column_height * side
+        self._band_gap = max(2, int(self.min_band_gap * side))
+        self._rule = max(1, int(self.max_rule * side))
+        self._frame = max(1, int(self.max_frame * side))
+
+        boxes = self._cut(mask, (0, 0, w, h), 0)
+        # specks: crop marks, page numbers, ornaments
+        boxes = [b for b in boxes if b[2] - b[0] >= self.min_region * side or b[3] - b[1] >= self.min_region * side]
+        if not boxes:
+            return [(0, 0, image.width, image.height)]
+        if len(boxes) > self.max_regions:
+            boxes = [self._union(boxes)]
+
+        pad = int(self.padding * side)
+        return [
+            (
+                max(0, int((x0 - pad) / scale)), max(0, int((y0 - pad) / scale)),
+                min(image.width, int((x1 + pad) / scale) + 1), min(image.height, int((y1 + pad) / scale) + 1),
+            )
+            for x0, y0, x1, y1 in boxes
+        ]
+
+    def crop(self, image: Image.Image) -> List[Image.Image]:
+        return [image.crop(box) for box in self.regions(image)]
+
+    # --------------------------------------------------------
+
+    def _gaps(self, profile: np.ndarray, span: int, min_gap: int) -> List[Tuple[int, int]]:
+        separator = profile <= max(1, BLANK_FRACTION * span)
+        for start, end in _runs(profile >= RULE_FRACTION * span):
+            if end - start <= self._rule:
+                separator[start:end] = True
+        # interior gaps only; the region is already trimmed to its ink
+        return [(s, e) for s, e in _runs(separator) if e - s >= min_gap and s > 0 and e < len(profile)]
+
+    def _trim(self, mask: np.ndarray, box: Box) -> Optional[Box]:
+        x0, y0, x1, y1 = box
+        sub = mask[y0:y1, x0:x1]
+        rows = np.flatnonzero(sub.any(axis=1))
+        cols = np.flatnonzero(sub.any(axis=0))
+        if not len(rows) or not len(cols):
+            return None
+        return x0 + cols[0], y0 + rows[0], x0 + cols[-1] + 1, y0 + rows[-1] + 1
+
+    def _peel(self, mask: np.ndarray, box: Box) -> Optional[Box]:
+        """Drop a frame or box border (thin rule along an edge) and re-trim."""
+        x0, y0, x1, y1 = box
+        sub = mask[y0:y1, x0:x1]
+
+        def edges(profile, span):
+            runs = [r for r in _runs(profile >= RULE_FRACTION * span) if r[1] - r[0] <= self._frame]
+            lead = next((e for s, e in runs if s == 0), 0)
+            trail = next((len(profile) - s for s, e in runs if e == len(profile)), 0)
+            return lead, trail
+
+        top, bottom = edges(sub.sum(axis=1), x1 - x0)
+        left, right = edges(sub.sum(axis=0), y1 - y0)
+        if not (top or bottom or left or right):
+            return box
+        return self._trim(mask, (x0 + left, y0 + top, x1 - right, y1 - bottom))
+
+    def _lines(self, mask: np.ndarray, box: Box) -> int:
+        x0, y0, x1, y1 = box
+        return len(_runs(mask[y0:y1, x0:x1].sum(axis=1) > max(1, BLANK_FRACTION * (x1 - x0))))
+
+    def _cut(self, mask: np.ndarray, box: Box, depth: int) -> List[Box]:
+        box = self._trim(mask, box)
+        if box is not None:
+            box = self._peel(mask, box)
+        if box is None:
+            return []
+        x0, y0, x1, y1 = box
+        if depth >= self.max_depth:
+            return [box]
+        sub = mask[y0:y1, x0:x1]
+
+        # columns first: a gutter through the full height (a full-width title blocks it);
+        # short bands only have gaps between words
+        gaps = self._gaps(sub.sum(axis=0), y1 - y0, self._col_gap) if y1 - y0 >= self._col_height else []
+        edges = self._column_edges([0] + [(s + e) // 2 for s, e in gaps] + [x1 - x0])
+        if len(edges) > 2:
+            out = []
+            for a, b in zip(edges, edges[1:]):
+                out.extend(self._cut(mask, (x0 + a, y0, x0 + b, y1), depth + 1))
+            return out
+
+        gaps = self._gaps(sub.sum(axis=1), x1 - x0, self._band_gap)
+        if not gaps:
+            return [box]
+        edges = [0] + [(s + e) // 2 for s, e in gaps] + [y1 - y0]
+        bands = [self._cut(mask, (x0, y0 + a, x1, y0 + b), depth + 1) for a, b in zip(edges, edges[1:])]
+        return self._merge_bands(mask, [b for b in bands if b])
+
+    def _column_edges(self, edges: List[int]) -> List[int]:
+        # a narrow "column" is a price list or an ornament strip: keep it with its neighbour
+        edges = list(edges)
+        while len(edges) > 2:
+            widths = [b - a for a, b in zip(edges, edges[1:])]
+            narrow = min(range(len(widths)), key=widths.__getitem__)
+            if widths[narrow] >= self._col_width:
+                break
+            # prices sit right of their items, so a narrow column joins the one on its left
+            del edges[narrow if narrow > 0 else 1]
+        return edges
+
+    def _merge_bands(self, mask: np.ndarray, bands: List[List[Box]]) -> List[Box]:
+        # a band that split into columns stays as is; plain bands are merged while
+        # the result is still seen at full detail and holds few enough text lines
+        out: List[Box] = []
+        current: Optional[Box] = None
+        lines = 0
+        for band in bands:
+            if len(band) == 1:
+                band_lines = self._lines(mask, band[0])
+                if current is not None:
+                    merged = self._union([current, band[0]])
+                    if (merged[3] - merged[1] <= MAX_ASPECT * (merged[2] - merged[0])
+                            and lines + band_lines <= self.max_band_lines):
+                        current, lines = merged, lines + band_lines
+                        continue
+                    out.append(current)
+                current, lines = band[0], band_lines
+                continue
+            if current is not None:
+                out.append(current)
+                current = None
+            out.extend(band)
+        if current is not None:
+            out.append(current)
+        return out
+
+    @staticmethod
+    def _union(boxes: List[Box]) -> Box:
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
@@ -0,0 +1,204 @@
+"""
+On-disk cache of rasterized PDF pages, shared by the OCR and vision paths.
+
+Keyed by the PDF's content hash, page number, DPI and colour mode, so a
+rerun (or the vision pass after an OCR pass) never renders a page twice.
+Pages are stored as PNG (fast compression level) with the render time in
+a text chunk, read back through mmap, and evicted least-recently-used once
+the cache grows past max_bytes.
+
+Opt-in: the shared cache exists only when PAGE_CACHE_DIR names a
+directory (a cold run pays for writing the PNGs, so one-off runs are
+faster without it).
+
+    PAGE_CACHE_DIR     (unset: no cache)
+    PAGE_CACHE_MAX_MB  (default 2048; 0 disables the cache)
+"""
+
+import os
+import mmap
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Callable, Tuple
+
+import pdfplumber
+from PIL import Image, PngImagePlugin
+from pdf2image import convert_from_path
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+PNG_COMPRESS_LEVEL = 1  # ~4x faster than the default for ~15% larger files
+
+
+def _pdf2image_rasterize(pdf_path: str, first_page: int, last_page: int, dpi: int) -> List[Image.Image]:
+    return convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page)
+
+
+class PageImageCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 2048 * 1024 * 1024,
+                 rasterize: Optional[Callable] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # rasterize(pdf_path, first_page, last_page, dpi) -> [PIL images]
+        self.rasterize = rasterize or _pdf2image_rasterize
+
+        self._lock = threading.Lock()
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._entries: Dict[Path, List] = {}  # path -> [size, last_used]
+        for path in self.cache_dir.glob("*/*.png"):
+            st = path.stat()
+            self._entries[path] = [st.st_size, st.st_mtime]
+        self.stats = {"hits": 0, "misses": 0, "render_s": 0.0, "saved_s": 0.0, "evictions": 0}
+
+    # --------------------------------------------------------
+
+    def pdf_hash(self, pdf_path: str) -> str:
+        st = os.stat(pdf_path)
+        memo = (os.path.abspath(pdf_path), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if memo in self._hashes:
+                return self._hashes[memo]
+        h = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        with self._lock:
+            self._hashes[memo] = h.hexdigest()
+        return self._hashes[memo]
+
+    def _path(self, digest: str, page: int, dpi: int, mode: str) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}-p{page}-{dpi}-{mode}.png"
+
+    # --------------------------------------------------------
+
+    def get_page(self, pdf_path: str, page: int, dpi: int = 300, mode: str = "RGB") -> Optional[Image.Image]:
+        """One 1-based page, from the cache or freshly rendered."""
+        return self.get_pages(pdf_path, [page], dpi=dpi, mode=mode)[0]
+
+    def get_pages(self, pdf_path: str, pages: Optional[List[int]] = None, dpi: int = 300,
+                  mode: str = "RGB") -> List[Optional[Image.Image]]:
+        """The given 1-based pages (all by default), in order."""
+        pdf_path = str(pdf_path)
+        if pages is None:
+            with pdfplumber.open(pdf_path) as pdf:
+                pages = list(range(1, len(pdf.pages) + 1))
+        digest = self.pdf_hash(pdf_path)
+
+        images: Dict[int, Optional[Image.Image]] = {}
+        for page in pages:
+            images[page] = self._read(self._path(digest, page, dpi, mode))
+        missing = [p for p in pages if images[p] is None]
+
+        # one rasterizer call per run of consecutive missing pages
+        runs = []
+        for p in sorted(set(missing)):
+            if runs and p == runs[-1][1] + 1:
+                runs[-1][1] = p
+            else:
+                runs.append([p, p])
+        for first, last in runs:
+            start = time.perf_counter()
+            rendered = self.rasterize(pdf_path, first, last, dpi)
+            if len(rendered) != last - first + 1:
+                raise RuntimeError(f"Rasterizer returned {len(rendered)} image(s) for pages {first}-{last} "
+                                   f"of {pdf_path}")
+            per_page = (time.perf_counter() - start) / max(1, len(rendered))
+            with self._lock:
+                self.stats["misses"] += last - first + 1
+                self.stats["render_s"] += per_page * len(rendered)
+            for page, img in zip(range(first, last + 1), rendered):
+                img = img.convert(mode) if img.mode != mode else img
+                images[page] = img
+                self._write(self._path(digest, page, dpi, mode), img, per_page)
+
+        self._evict()
+        return [images[p] for p in pages]
+
+    # --------------------------------------------------------
+
+    def _read(self, path: Path) -> Optional[Image.Image]:
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                img = Image.open(mm)
+                img.load()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cached page {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+
+        now = time.time()
+        os.utime(path, (now, now))
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats["saved_s"] += float(img.info.get("render_s", 0.0))
+            if path in self._entries:
+                self._entries[path][1] = now
+        return img
+
+    def _write(self, path: Path, img: Image.Image, render_s: float):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        info = PngImagePlugin.PngInfo()
+        info.add_text("render_s", f"{render_s:.4f}")
+        tmp = path.with_name(path.name + f".{threading.get_ident()}.tmp")
+        img.save(tmp, format="PNG", compress_level=PNG_COMPRESS_LEVEL, pnginfo=info)
+        tmp.replace(path)
+        with self._lock:
+            self._entries[path] = [path.stat().st_size, time.time()]
+
+    def _evict(self):
+        with self._lock:
+            total = sum(size for size, _ in self._entries.values())
+            if total <= self.max_bytes:
+                return
+            for path, (size, _) in sorted(self._entries.items(), key=lambda e: e[1][1]):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                del self._entries[path]
+                total -= size
+                self.stats["evictions"] += 1
+
+    # --------------------------------------------------------
+
+    def report(self) -> Dict:
+        with self._lock:
+            s = dict(self.stats)
+            s["bytes"] = sum(size for size, _ in self._entries.values())
+            s["pages_cached"] = len(self._entries)
+        lookups = s["hits"] + s["misses"]
+        s["hit_ratio"] = round(s["hits"] / lookups, 3) if lookups else 0.0
+        s["render_s"] = round(s["render_s"], 2)
+        s["saved_s"] = round(s["saved_s"], 2)
+        return s
+
+
+# ============================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================
+
+_CACHE = None
+_CACHE_LOADED = False
+_CACHE_LOCK = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageImageCache]:
+    """Shared page cache, or None unless PAGE_CACHE_DIR is set (and PAGE_CACHE_MAX_MB > 0)."""
+    global _CACHE, _CACHE_LOADED
+    with _CACHE_LOCK:
+        if not _CACHE_LOADED:
+            cache_dir = os.getenv("PAGE_CACHE_DIR")
+            max_mb = int(os.getenv("PAGE_CACHE_MAX_MB", "2048"))
+            if cache_dir and max_mb > 0:
+                _CACHE = PageImageCache(cache_dir, max_bytes=max_mb * 1024 * 1024)
+                logger.info(f"Page image cache at {_CACHE.cache_dir} ({max_mb} MB)")
+            _CACHE_LOADED = True
+        return _CACHE
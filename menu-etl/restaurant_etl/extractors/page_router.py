@@ -0,0 +1,104 @@
+"""
+Per-page routing between the text, OCR and vision pipelines.
+
+Each page is classified from what pdfplumber reads without rendering it:
+characters in the text layer (and how many are unmapped glyphs), the area
+covered by embedded images, vector drawing objects and price tokens.
+
+- text:   a usable text layer with prices -> text LLM (cheapest)
+- ocr:    little or broken text over a page-sized image (scans, photos of
+          menus) -> Azure Read, then the text LLM
+- vision: stylised pages: lettering drawn as vector outlines, or a text
+          layer whose prices are in the artwork -> vision LLM
+- skip:   blank or title pages (a few characters, no prices, no images)
+
+OCR pages whose OCR text still has no prices are escalated to vision by
+the hybrid processor.
+"""
+
+import logging
+from typing import List, Dict, Tuple
+
+import pdfplumber
+
+from restaurant_etl.parsers.cascade import count_price_tokens
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+ROUTES = ("text", "ocr", "vision", "skip")
+
+
+class PageRoute:
+    def __init__(self, page: int, route: str, reason: str, features: Dict):
+        self.page = page
+        self.route = route
+        self.reason = reason
+        self.features = features
+        self.text = features.pop("text", "")
+
+    def to_dict(self) -> Dict:
+        return {"page": self.page, "route": self.route, "reason": self.reason, **self.features}
+
+
+class PageRouter:
+    def __init__(self, min_chars: int = 40, max_garbage: float = 0.1, min_image_coverage: float = 0.1,
+                 artwork_coverage: float = 0.3, vector_lettering: int = 1000):
+        self.min_chars = min_chars
+        # share of (cid:N) / replacement glyphs above which the text layer is unusable
+        self.max_garbage = max_garbage
+        self.min_image_coverage = min_image_coverage
+        self.artwork_coverage = artwork_coverage
+        # curves + rects on a page with no text: lettering converted to outlines
+        # (roughly one per glyph; logos and ornaments stay well below)
+        self.vector_lettering = vector_lettering
+
+    # --------------------------------------------------------
+
+    def classify(self, pdf_path: str) -> List[PageRoute]:
+        routes = []
+        with pdfplumber.open(pdf_path) as pdf:
+            for i, page in enumerate(pdf.pages, 1):
+                features = self._features(page)
+                route, reason = self.route(features)
+                routes.append(PageRoute(i, route, reason, features))
+        logger.info("Page routes: " + ", ".join(f"{r.page}:{r.route}" for r in routes))
+        return routes
+
+    def _features(self, page) -> Dict:
+        chars = page.chars
+        garbage = sum(1 for c in chars if c["text"].startswith("(cid:") or c["text"] == "�")
+
+        page_area = float(page.width * page.height) or 1.0
+        covered = 0.0
+        for img in page.images:
+            w = max(0.0, min(img["x1"], page.width) - max(img["x0"], 0))
+            h = max(0.0, min(img["bottom"], page.height) - max(img["top"], 0))
+            covered += w * h
+
+        text = (page.extract_text() or "").strip() if len(chars) > garbage else ""
+        return {
+            "chars": len(chars),
+            "garbage_ratio": round(garbage / len(chars), 3) if chars else 0.0,
+            "image_coverage": round(min(1.0, covered / page_area), 3),
+            "vector_objects": len(page.curves) + len(page.rects),
+            "price_tokens": count_price_tokens(text),
+            "text": text,
+        }
+
+    def route(self, f: Dict) -> Tuple[str, str]:
+        usable_text = f["chars"] >= self.min_chars and f["garbage_ratio"] <= self.max_garbage
+        if usable_text:
+            if f["price_tokens"] == 0 and (f["image_coverage"] >= self.artwork_coverage
+                                           or f["vector_objects"] >= self.vector_lettering):
+                return "vision", "text layer without prices over artwork"
+            return "text", "born-digital text"
+        if f["image_coverage"] >= self.min_image_coverage:
+            return "ocr", "scanned / image page"
+        if f["chars"] and f["garbage_ratio"] > self.max_garbage:
+            return "ocr", "unmapped glyphs in text layer"
+        if f["vector_objects"] >= self.vector_lettering:
+            return "vision", "vector-outlined lettering"
+        if f["price_tokens"]:
+            return "text", "short text with prices"
+        return "skip", "blank / title page"
@@ -1,14 +1,17 @@
 import pdfplumber
 from pathlib import Path
 import logging
-from typing import Dict
+from typing import Dict, List, Optional, Iterable
 import os
+import hashlib
 import tempfile
 
 from dotenv import load_dotenv
-from azure.ai.formrecognizer import DocumentAnalysisClient
-from azure.core.credentials import AzureKeyCredential
 from pdf2image import convert_from_path
+from pdfminer.pdftypes import PDFStream, resolve1
+
+from restaurant_etl.extractors.page_cache import get_page_cache
+from restaurant_etl.utils.http_clients import get_document_analysis_client
 
 load_dotenv()
 
@@ -66,55 +69,127 @@ class PDFExtractor:
     # -------------------- AZURE OCR --------------------
 
     def _get_ocr_client(self):
+        # shared across extractor instances (keep-alive connection pool)
         if not self._ocr_client:
-            endpoint = os.getenv("AZURE_DOC_INTEL_ENDPOINT")
-            key = os.getenv("AZURE_DOC_INTEL_KEY")
-
-            if not endpoint or not key:
-                raise ValueError("Azure Document Intelligence credentials missing")
-
-            self._ocr_client = DocumentAnalysisClient(
-                endpoint=endpoint,
-                credential=AzureKeyCredential(key),
-            )
-
-            logger.info("✓ Azure OCR client initialized")
+            self._ocr_client = get_document_analysis_client()
 
         return self._ocr_client
 
     def _azure_ocr_per_page(self, pdf_path: Path) -> str:
-        client = self._get_ocr_client()
         pages_text = []
 
-        images = convert_from_path(pdf_path, dpi=300)
+        cache = get_page_cache()
+        images = cache.get_pages(str(pdf_path), dpi=300) if cache is not None else convert_from_path(pdf_path, dpi=300)
 
         for idx, img in enumerate(images, 1):
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=True) as tmp:
-                img.save(tmp.name, format="PNG")
-
-                try:
-                    with open(tmp.name, "rb") as f:
-                        poller = client.begin_analyze_document(
-                            model_id="prebuilt-read",
-                            document=f,
-                        )
-
-                    result = poller.result()
-
-                    lines = []
-                    for page in result.pages:
-                        for line in page.lines:
-                            lines.append(line.content)
-
-                    page_text = "\n".join(lines).strip()
-                    if page_text:
-                        pages_text.append(f"--- Page {idx} ---\n{page_text}")
-                        logger.info(f"✓ OCR page {idx}: {len(lines)} lines")
-                    else:
-                        logger.warning(f"OCR page {idx}: no text")
-
-                except Exception as e:
-                    logger.error(f"OCR failed on page {idx}: {e}")
+            page_text = self._ocr_image(img, idx)
+            if page_text:
+                pages_text.append(f"--- Page {idx} ---\n{page_text}")
 
         return "\n\n".join(pages_text)
 
+    def _ocr_image(self, img, idx: int) -> str:
+        client = self._get_ocr_client()
+
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=True) as tmp:
+            img.save(tmp.name, format="PNG")
+
+            try:
+                with open(tmp.name, "rb") as f:
+                    poller = client.begin_analyze_document(
+                        model_id="prebuilt-read",
+                        document=f,
+                    )
+
+                result = poller.result()
+
+                lines = []
+                for page in result.pages:
+                    for line in page.lines:
+                        lines.append(line.content)
+
+                page_text = "\n".join(lines).strip()
+                if page_text:
+                    logger.info(f"✓ OCR page {idx}: {len(lines)} lines")
+                else:
+                    logger.warning(f"OCR page {idx}: no text")
+                return page_text
+
+            except Exception as e:
+                logger.error(f"OCR failed on page {idx}: {e}")
+                return ""
+
+    # -------------------- PAGE-LEVEL API --------------------
+
+    def page_fingerprints(self, pdf_path: str) -> List[str]:
+        """
+        Hash of each page's content streams and the images/forms it draws,
+        read without extracting text, so unchanged pages of a revised menu
+        can be recognised cheaply.
+        """
+        fingerprints = []
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages:
+                h = hashlib.sha256()
+                seen = set()
+                for stream in page.page_obj.contents:
+                    _hash_stream(h, stream, seen)
+                _hash_resources(h, page.page_obj.resources, seen)
+                fingerprints.append(h.hexdigest())
+        return fingerprints
+
+    def extract_pages(self, pdf_path: str, pages: Optional[Iterable[int]] = None,
+                      min_chars: int = 20) -> Dict[int, Dict[str, str]]:
+        """
+        Text of the given 1-based pages (all by default). Pages with almost no
+        text layer are OCR'd individually.
+        """
+        pdf_path = Path(pdf_path)
+        results = {}
+        with pdfplumber.open(pdf_path) as pdf:
+            wanted = sorted(set(pages)) if pages is not None else range(1, len(pdf.pages) + 1)
+            for i in wanted:
+                txt = (pdf.pages[i - 1].extract_text() or "").strip()
+                results[i] = {"text": txt, "method": "text"}
+
+        for i, res in results.items():
+            if len(res["text"]) < min_chars:
+                image = self.render_page(pdf_path, i)
+                if image is not None:
+                    res["text"] = self._ocr_image(image, i)
+                    res["method"] = "azure_ocr"
+        return results
+
+    def render_page(self, pdf_path, page: int, dpi: int = 300):
+        """One 1-based page as a PIL image (None if it can't be rendered)."""
+        cache = get_page_cache()
+        try:
+            if cache is not None:
+                return cache.get_page(str(pdf_path), page, dpi=dpi)
+            images = convert_from_path(pdf_path, dpi=dpi, first_page=page, last_page=page)
+        except Exception as e:
+            # poppler errors (PDFPageCountError, ...) and short rasterizer output
+            logger.warning(f"Could not render page {page} of {pdf_path}: {e}")
+            return None
+        return images[0] if images else None
+
+
+def _hash_stream(h, obj, seen: set, depth: int = 0):
+    obj = resolve1(obj)
+    if not isinstance(obj, PDFStream) or obj.objid in seen and obj.objid is not None:
+        return
+    seen.add(obj.objid)
+    h.update(obj.get_rawdata() or obj.get_data())
+    if depth < 3:
+        _hash_resources(h, obj.attrs.get("Resources"), seen, depth + 1)
+
+
+def _hash_resources(h, resources, seen: set, depth: int = 0):
+    resources = resolve1(resources)
+    if not isinstance(resources, dict):
+        return
+    xobjects = resolve1(resources.get("XObject"))
+    if isinstance(xobjects, dict):
+        for name in sorted(xobjects):
+            h.update(str(name).encode())
+            _hash_stream(h, xobjects[name], seen, depth)
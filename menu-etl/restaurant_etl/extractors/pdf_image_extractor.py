@@ -2,6 +2,8 @@ from pdf2image import convert_from_path
 from pathlib import Path
 import logging
 
+from restaurant_etl.extractors.page_cache import get_page_cache
+
 logger = logging.getLogger(__name__)
 
 class PDFImageExtractor:
@@ -13,11 +15,15 @@ class PDFImageExtractor:
 
         logger.info(f"Converting PDF to images: {pdf_path.name}")
 
-        images = convert_from_path(
-            pdf_path,
-            dpi=300,
-            fmt="png"
-        )
+        cache = get_page_cache()
+        if cache is not None:
+            images = cache.get_pages(str(pdf_path), dpi=300)
+        else:
+            images = convert_from_path(
+                pdf_path,
+                dpi=300,
+                fmt="png"
+            )
 
         logger.info(f"Extracted {len(images)} page images")
         return images
@@ -0,0 +1,148 @@
+"""
+Columnar MenuData: the items of a menu as typed Arrow columns.
+
+Built straight from the parser's item dicts. Each field becomes one
+Arrow array in a single conversion, which is the bulk validation: string
+fields must hold str / None and price fields numbers / None. Rows that
+fail the conversion (wrong types, numeric strings ...) are validated one
+by one as MenuItem, so the rows kept and their values are the same as
+MenuData's. Rows without a price are dropped, as in _build_menu_data.
+
+to_arrow() returns the table itself and to_dataframe() wraps the Arrow
+buffers in ArrowDtype columns without per-row copies. `items` is a lazy
+list of MenuItem built on first access, for code written against
+MenuData.
+"""
+
+from typing import Optional, List, Dict, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from restaurant_etl.models.menu_models import MenuItem, MenuData
+
+PRICE_FIELDS = [f for f in MenuItem.model_fields if f == "price" or f.endswith("_price")]
+STRING_FIELDS = [f for f in MenuItem.model_fields if f not in PRICE_FIELDS]
+
+SCHEMA = pa.schema([
+    pa.field(f, pa.float64() if f in PRICE_FIELDS else pa.string(), nullable=f != "item_name")
+    for f in MenuItem.model_fields
+])
+# item_name may be null while building; those rows are dropped as invalid
+_BUILD_SCHEMA = pa.schema([f.with_nullable(True) for f in SCHEMA])
+
+
+def _is_plain(row: Dict) -> bool:
+    """Types the Arrow conversion takes exactly as MenuItem would."""
+    for f in STRING_FIELDS:
+        v = row.get(f)
+        if v is not None and type(v) is not str:
+            return False
+    for f in PRICE_FIELDS:
+        v = row.get(f)
+        if v is not None and type(v) not in (float, int):
+            return False
+    return True
+
+
+def _to_table(rows: List[Dict]) -> pa.Table:
+    return pa.Table.from_arrays(
+        [pa.array([r.get(f.name) for r in rows], type=f.type) for f in _BUILD_SCHEMA],
+        schema=_BUILD_SCHEMA,
+    )
+
+
+class _LazyItems(Sequence):
+    """MenuItem view over the table, converted on first access."""
+
+    def __init__(self, table: pa.Table):
+        self._table = table
+        self._items: Optional[List[MenuItem]] = None
+
+    def _load(self) -> List[MenuItem]:
+        if self._items is None:
+            self._items = [MenuItem.model_construct(**row) for row in self._table.to_pylist()]
+        return self._items
+
+    def __len__(self):
+        return self._table.num_rows
+
+    def __getitem__(self, i):
+        return self._load()[i]
+
+    def __iter__(self):
+        return iter(self._load())
+
+
+class ColumnarMenuData:
+    def __init__(self, restaurant_name: str, table: pa.Table, extraction_metadata: Optional[dict] = None):
+        self.restaurant_name = restaurant_name
+        self.table = table
+        self.extraction_metadata = extraction_metadata
+        self._items = _LazyItems(table)
+
+    # --------------------------------------------------------
+
+    @classmethod
+    def from_items(cls, items: List[Dict], restaurant_name: str,
+                   extraction_metadata: Optional[dict] = None) -> "ColumnarMenuData":
+        rows = [it for it in items if isinstance(it, dict)]
+        invalid = len(items) - len(rows)
+        try:
+            table = _to_table(rows)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # per-row validation only for the rows the columns could not take
+            checked = []
+            for row in rows:
+                if _is_plain(row):
+                    checked.append(row)
+                    continue
+                try:
+                    checked.append(MenuItem(**row).model_dump())
+                except Exception:
+                    invalid += 1
+            table = _to_table(checked)
+
+        named = pc.is_valid(table["item_name"])
+        invalid += table.num_rows - (pc.sum(named).as_py() or 0)
+        priced = pc.is_valid(table[PRICE_FIELDS[0]])
+        for f in PRICE_FIELDS[1:]:
+            priced = pc.or_(priced, pc.is_valid(table[f]))
+        table = table.filter(pc.and_(named, priced)).cast(SCHEMA)
+
+        metadata = dict(extraction_metadata or {})
+        metadata.setdefault("invalid_items", invalid)
+        return cls(restaurant_name, table, metadata)
+
+    @classmethod
+    def from_menu_data(cls, menu: MenuData) -> "ColumnarMenuData":
+        return cls.from_items([it.model_dump() for it in menu.items], menu.restaurant_name,
+                              menu.extraction_metadata)
+
+    # --------------------------------------------------------
+
+    @property
+    def items(self) -> Sequence[MenuItem]:
+        return self._items
+
+    @property
+    def total_items(self) -> int:
+        return self.table.num_rows
+
+    def to_arrow(self) -> pa.Table:
+        return self.table
+
+    def to_dataframe(self, arrow_dtypes: bool = True) -> pd.DataFrame:
+        """Arrow-backed columns (no copy); arrow_dtypes=False gives MenuData's numpy dtypes."""
+        if arrow_dtypes:
+            return self.table.to_pandas(types_mapper=pd.ArrowDtype)
+        return self.table.to_pandas()
+
+    def to_menu_data(self) -> MenuData:
+        return MenuData(
+            restaurant_name=self.restaurant_name,
+            items=list(self.items),
+            total_items=self.total_items,
+            extraction_metadata=self.extraction_metadata,
+        )
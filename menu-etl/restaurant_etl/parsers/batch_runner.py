@@ -0,0 +1,230 @@
+"""
+Offline Batch API mode for bulk menu backfills.
+
+Chunk requests for many menus are written to JSONL input files
+(custom_id = "<menu_id>::<chunk_no>") and submitted as Azure OpenAI batch
+jobs, which run at the discounted batch rate and outside the realtime
+RPM/TPM quota. Progress lives in a state directory so a restarted run
+resumes the submitted jobs instead of paying for them twice:
+
+    state_dir/
+        state.json          menus, chunks, file ids, batch ids, statuses
+        input-000.jsonl     request lines (one file per job)
+        output-000.jsonl    downloaded results
+        errors-000.jsonl    per-request errors, if any
+
+The batch deployment defaults to the parser's deployment; set
+AZURE_OPENAI_BATCH_DEPLOYMENT_NAME for a separate Global-Batch deployment.
+"""
+
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from restaurant_etl.models.menu_models import MenuData
+from restaurant_etl.parsers.llm_parser import LLMMenuParser, postprocess_fn
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+BATCH_ENDPOINT = "/chat/completions"
+
+
+def _custom_id(menu_id: str, chunk_no: int) -> str:
+    return f"{menu_id}::{chunk_no}"
+
+
+def _split_custom_id(custom_id: str):
+    menu_id, _, chunk_no = custom_id.rpartition("::")
+    return menu_id, int(chunk_no)
+
+
+class BatchMenuRunner:
+    def __init__(self, parser: LLMMenuParser, state_dir: str, client: Any = None,
+                 deployment: Optional[str] = None, poll_interval: float = 60.0,
+                 completion_window: str = "24h", max_requests_per_job: int = 50000,
+                 retry_missing: bool = True):
+        self.parser = parser
+        backend = parser.pool.backends[0]
+        self.client = client or backend.client
+        self.deployment = deployment or os.getenv("AZURE_OPENAI_BATCH_DEPLOYMENT_NAME") or backend.deployment
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+        self.max_requests_per_job = max_requests_per_job
+        # chunks the batch didn't answer (expired/failed lines) go through the realtime path
+        self.retry_missing = retry_missing
+
+    # --------------------------------------------------------
+
+    def run(self, menus: Dict[str, str], restaurant_names: Optional[Dict[str, str]] = None) -> Dict[str, MenuData]:
+        """menus: menu_id -> extracted menu text. Returns menu_id -> MenuData."""
+        state = self._load_state()
+        if state is None:
+            state = self.prepare(menus, restaurant_names)
+        elif set(state["menus"]) != set(menus):
+            raise ValueError(f"{self.state_dir} holds a different batch; use a fresh state_dir")
+        else:
+            logger.info(f"Resuming batch run from {self.state_dir}")
+
+        self.submit(state)
+        self.wait(state)
+        return self.collect(state)
+
+    # --------------------------------------------------------
+
+    def prepare(self, menus: Dict[str, str], restaurant_names: Optional[Dict[str, str]] = None) -> Dict:
+        restaurant_names = restaurant_names or {}
+        state = {"deployment": self.deployment, "menus": {}, "jobs": []}
+        lines = []
+        for menu_id, text in menus.items():
+            chunks = self.parser._chunks(text)
+            state["menus"][menu_id] = {
+                "restaurant_name": restaurant_names.get(menu_id),
+                "chunks": chunks,
+            }
+            for chunk_no, chunk in enumerate(chunks):
+                lines.append(json.dumps({
+                    "custom_id": _custom_id(menu_id, chunk_no),
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {
+                        "model": self.deployment,
+                        "messages": self.parser._messages(chunk),
+                        "temperature": 0,
+                        "max_tokens": self.parser.max_tokens,
+                    },
+                }, ensure_ascii=False))
+
+        for n, start in enumerate(range(0, len(lines), self.max_requests_per_job)):
+            name = f"input-{n:03d}.jsonl"
+            (self.state_dir / name).write_text("\n".join(lines[start:start + self.max_requests_per_job]) + "\n",
+                                               encoding="utf-8")
+            state["jobs"].append({"input": name, "status": "prepared"})
+
+        self._save_state(state)
+        logger.info(f"Prepared {len(lines)} requests for {len(menus)} menus in {len(state['jobs'])} job(s)")
+        return state
+
+    def submit(self, state: Dict):
+        for job in state["jobs"]:
+            if job.get("batch_id"):
+                continue
+            if not job.get("input_file_id"):
+                with open(self.state_dir / job["input"], "rb") as f:
+                    job["input_file_id"] = self.client.files.create(file=f, purpose="batch").id
+                self._save_state(state)
+            batch = self.client.batches.create(
+                input_file_id=job["input_file_id"],
+                endpoint=BATCH_ENDPOINT,
+                completion_window=self.completion_window,
+            )
+            job["batch_id"] = batch.id
+            job["status"] = batch.status
+            self._save_state(state)
+            logger.info(f"Submitted batch {batch.id} ({job['input']})")
+
+    def wait(self, state: Dict):
+        while True:
+            pending = [j for j in state["jobs"] if j["status"] not in TERMINAL_STATUSES]
+            for job in pending:
+                batch = self.client.batches.retrieve(job["batch_id"])
+                if batch.status != job["status"]:
+                    logger.info(f"Batch {job['batch_id']}: {job['status']} -> {batch.status}")
+                    job["status"] = batch.status
+                if batch.status in TERMINAL_STATUSES:
+                    self._download(job, batch)
+                self._save_state(state)
+            if all(j["status"] in TERMINAL_STATUSES for j in state["jobs"]):
+                return
+            time.sleep(self.poll_interval)
+
+    def _download(self, job: Dict, batch):
+        # expired/cancelled jobs still return the requests that finished
+        n = job["input"][len("input-"):-len(".jsonl")]
+        for kind, file_id in (("output", getattr(batch, "output_file_id", None)),
+                              ("errors", getattr(batch, "error_file_id", None))):
+            if file_id and not job.get(kind):
+                name = f"{kind}-{n}.jsonl"
+                (self.state_dir / name).write_text(self.client.files.content(file_id).text, encoding="utf-8")
+                job[kind] = name
+
+    # --------------------------------------------------------
+
+    def collect(self, state: Dict) -> Dict[str, MenuData]:
+        items = {menu_id: {} for menu_id in state["menus"]}
+        usage = {menu_id: {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0} for menu_id in state["menus"]}
+        failed = 0
+
+        for job in state["jobs"]:
+            if not job.get("output"):
+                continue
+            for line in (self.state_dir / job["output"]).read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                menu_id, chunk_no = _split_custom_id(record["custom_id"])
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    failed += 1
+                    continue
+                body = response["body"]
+                u = usage[menu_id]
+                u["calls"] += 1
+                u["prompt_tokens"] += body.get("usage", {}).get("prompt_tokens", 0)
+                u["completion_tokens"] += body.get("usage", {}).get("completion_tokens", 0)
+                try:
+                    parsed = self.parser._decode(body["choices"][0]["message"]["content"])
+                except Exception as e:
+                    logger.error(f"Could not decode {record['custom_id']}: {e}")
+                    failed += 1
+                    continue
+                items[menu_id][chunk_no] = postprocess_fn(parsed.get("items", []))
+
+        results = {}
+        for menu_id, menu in state["menus"].items():
+            self.parser._reset_usage()  # deduper / category report per menu
+            missing = [n for n in range(len(menu["chunks"])) if n not in items[menu_id]]
+            if missing and self.retry_missing:
+                logger.info(f"{menu_id}: {len(missing)} chunk(s) missing from batch output; parsing realtime")
+                for n in missing:
+                    items[menu_id][n] = self.parser._parse_chunk(menu["chunks"][n])
+                missing = []
+
+            all_items = [it for n in sorted(items[menu_id]) for it in items[menu_id][n]]
+            if self.parser.deduper is not None:
+                all_items = self.parser.deduper.add(all_items)
+            if self.parser.verify_prices:
+                self.parser._verify_prices("\n\n".join(menu["chunks"]), all_items)
+            results[menu_id] = self.parser._build_menu_data(
+                all_items,
+                menu["restaurant_name"],
+                mode="batch",
+                llm_usage=usage[menu_id],
+                batch_ids=[j.get("batch_id") for j in state["jobs"]],
+                missing_chunks=missing,
+                dedupe=self.parser.deduper.report() if self.parser.deduper else None,
+                price_validation=self.parser.price_validation,
+            )
+
+        logger.info(f"Collected {len(results)} menus ({failed} failed request(s))")
+        return results
+
+    # --------------------------------------------------------
+
+    def _load_state(self) -> Optional[Dict]:
+        path = self.state_dir / "state.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _save_state(self, state: Dict):
+        path = self.state_dir / "state.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
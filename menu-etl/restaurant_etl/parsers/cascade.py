@@ -0,0 +1,111 @@
+"""
+Cheap-model-first cascade for chunk parsing.
+
+The fast deployment parses every chunk first; its result is accepted only
+if cheap local checks pass, otherwise the chunk escalates to the large
+deployment:
+
+- the response decoded (JSON / compact / grid)
+- items validate as MenuItem
+- price coverage: most items have a price (MenuItem.has_any_price)
+- item count is in line with the price tokens found in the chunk text
+"""
+
+import re
+import threading
+from typing import Optional, List, Dict
+from collections import Counter
+
+from restaurant_etl.models.menu_models import MenuItem
+
+# USD per 1M (input, output) tokens, used only for the savings estimate
+DEFAULT_TIER_PRICES = {
+    "fast": (0.15, 0.60),
+    "large": (2.50, 10.00),
+}
+
+# a price-looking number: currency-prefixed, or a standalone 2-5 digit
+# number not followed by a unit (pcs, ml, gm, inch marks ...)
+PRICE_TOKEN_RE = re.compile(
+    r"(?:[$₹€£]\s?\d[\d,]*(?:\.\d{1,2})?)"
+    r"|(?<![\w.])\d{2,5}(?:\.\d{1,2})?(?![\w.%\"'])(?!\s?(?:pcs|pc|ml|gm|g|kg|ltr|l|cm|inch)\b)",
+    re.IGNORECASE,
+)
+
+MIN_PRICE_COVERAGE = 0.8
+MIN_ITEMS_PER_PRICE_TOKEN = 0.6
+MAX_INVALID_FRACTION = 0.2
+
+
+def count_price_tokens(text: str) -> int:
+    return len(PRICE_TOKEN_RE.findall(text or ""))
+
+
+def check_chunk_result(chunk: str, items: Optional[List[Dict]]) -> Optional[str]:
+    """Return the reason a fast-tier result should escalate, or None if it passes."""
+    if items is None:
+        return "invalid_response"
+
+    valid = []
+    for it in items:
+        try:
+            valid.append(MenuItem(**it))
+        except Exception:
+            continue
+    if items and (len(items) - len(valid)) / len(items) > MAX_INVALID_FRACTION:
+        return "validation_failed"
+
+    priced = sum(1 for it in valid if it.has_any_price())
+    if valid and priced / len(valid) < MIN_PRICE_COVERAGE:
+        return "low_price_coverage"
+
+    expected = count_price_tokens(chunk)
+    if expected and priced < MIN_ITEMS_PER_PRICE_TOKEN * expected:
+        return "too_few_items"
+    return None
+
+
+class CascadeStats:
+    def __init__(self, prices: Optional[Dict] = None):
+        self.prices = prices or DEFAULT_TIER_PRICES
+        self._lock = threading.Lock()
+        self.chunks = 0
+        self.escalated = 0
+        self.reasons = Counter()
+
+    def record(self, reason: Optional[str]):
+        with self._lock:
+            self.chunks += 1
+            if reason:
+                self.escalated += 1
+                self.reasons[reason] += 1
+
+    def _cost(self, usage: Dict, tier: str) -> float:
+        p_in, p_out = self.prices[tier]
+        return (usage["prompt_tokens"] * p_in + usage["completion_tokens"] * p_out) / 1e6
+
+    def report(self, tier_usage: Dict[str, Dict]) -> Dict:
+        fast = tier_usage.get("fast")
+        large = tier_usage.get("large")
+        actual = sum(self._cost(u, t) for t, u in tier_usage.items())
+        # same work done entirely on the large tier: every chunk once at large prices
+        accepted_share = 1 - self.escalated / self.chunks if self.chunks else 0.0
+        large_only = self._cost(large, "large") + self._cost(fast, "large") * accepted_share
+
+        fast_latency_per_call = fast["latency_s"] / fast["calls"] if fast["calls"] else 0.0
+        large_latency_per_call = large["latency_s"] / large["calls"] if large["calls"] else None
+        accepted = self.chunks - self.escalated
+        latency_saved = (
+            accepted * (large_latency_per_call - fast_latency_per_call)
+            - self.escalated * fast_latency_per_call
+            if large_latency_per_call is not None else None
+        )
+        return {
+            "chunks": self.chunks,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalated / self.chunks, 3) if self.chunks else 0.0,
+            "escalation_reasons": dict(self.reasons),
+            "cost_usd": round(actual, 4),
+            "cost_usd_large_only": round(large_only, 4),
+            "latency_saved_s": round(latency_saved, 2) if latency_saved is not None else None,
+        }
@@ -0,0 +1,245 @@
+"""
+Canonical category names across all menus and tenants.
+
+The model writes the same section a dozen ways ("Ala Carte", "A La Carte",
+"À la carte", "SOUPS" / "Soup", "Lamb Specialities" / "Lamb Specialties"),
+and every variant fans out in similarity search and master-product
+matching downstream. CategoryIndex maps each raw category to one
+canonical name:
+
+1. raw string memo: a dict hit for anything seen before
+2. normalized key: accents / case / punctuation folded, "&" -> "and",
+   plurals and "'s" dropped, spaces removed ("alacarte", "soup"); the
+   canonical names are also keyed before plurals are dropped, for names
+   written without spaces ("MomosMania")
+3. fuzzy: hashed character-trigram vectors of the canonical names give
+   the nearest candidates in one matrix product; a candidate is accepted
+   only when the names are one OCR slip apart (dedupe.near_identical),
+   so "Veg Starters" never becomes "Non Veg Starters"
+
+A category that matches nothing becomes a new canonical name (all-caps
+names are title-cased). The index is shared by the process and persisted
+as JSON, so it grows across runs and tenants:
+
+    CATEGORY_INDEX_PATH   (default .cache/categories.json)
+
+    index = get_category_index()
+    report = index.canonicalize_items(items)   # in place, one lookup per distinct category
+    index.save()
+"""
+
+import os
+import re
+import json
+import logging
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Optional, List, Dict
+
+import numpy as np
+
+from restaurant_etl.parsers.dedupe import near_identical
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_APOSTROPHE_RE = re.compile(r"['’`]s\b|['’`]")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+STOPWORDS = {"and", "n", "the", "of"}
+DIMS = 1 << 10
+
+
+def _singular(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize_category(name) -> str:
+    """Space-separated folded words: "PIZZA'S & Calzones" -> "pizza calzone"."""
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode().lower()
+    text = _APOSTROPHE_RE.sub("", text.replace("&", " and "))
+    return " ".join(_singular(t) for t in _NON_WORD_RE.sub(" ", text).split() if t not in STOPWORDS)
+
+
+def _loose_key(name) -> str:
+    """Folded letters only, before plurals / stopwords go: "MomosMania" == "Momos Mania"."""
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode().lower()
+    return "~" + _NON_WORD_RE.sub("", text.replace("&", "and"))
+
+
+def _vector(norm: str) -> np.ndarray:
+    text = f" {norm} "
+    v = np.zeros(DIMS, dtype=np.float32)
+    for i in range(len(text) - 2):
+        h = int.from_bytes(hashlib.blake2b(text[i:i + 3].encode(), digest_size=4).digest(), "little")
+        v[h % DIMS] += 1.0
+    n = np.linalg.norm(v)
+    return v / n if n else v
+
+
+def _display(name: str) -> str:
+    name = " ".join(str(name).split())
+    if not name.isupper():
+        return name
+    return " ".join(w[:1] + w[1:].lower() for w in name.split())  # not .title(): "BIRYANI'S" -> "Biryani's"
+
+
+class CategoryIndex:
+    def __init__(self, path: Optional[str] = None, candidates: int = 5, min_cosine: float = 0.5):
+        self.path = Path(path) if path else None
+        self.candidates = candidates
+        self.min_cosine = min_cosine
+        self._lock = threading.Lock()
+        self.canonical: List[str] = []
+        self._norm: List[str] = []
+        self._keys: Dict[str, int] = {}
+        self._memo: Dict[str, Optional[str]] = {}
+        self._vectors = np.zeros((64, DIMS), dtype=np.float32)  # rows beyond len(canonical) unused
+        self._dirty = False
+        self.stats = {"lookups": 0, "memo": 0, "key": 0, "fuzzy": 0, "new": 0}
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    # --------------------------------------------------------
+
+    def lookup(self, name, learn: bool = True) -> Optional[str]:
+        """Canonical name for a raw category (None/empty stays None)."""
+        with self._lock:
+            self.stats["lookups"] += 1
+            if name in self._memo:
+                self.stats["memo"] += 1
+                return self._memo[name]
+            canonical = self._resolve(name, learn)
+            if canonical is not None:
+                self._memo[name] = canonical
+            return canonical
+
+    def _resolve(self, name, learn: bool) -> Optional[str]:
+        norm = normalize_category(name)
+        if not norm:
+            return None
+        key = norm.replace(" ", "")
+        for k in (key, _loose_key(name)):
+            if k in self._keys:
+                self.stats["key"] += 1
+                if k != key:
+                    self._keys[key] = self._keys[k]
+                    self._dirty = True
+                return self.canonical[self._keys[k]]
+
+        vector = _vector(norm)
+        idx = self._nearest(norm, vector)
+        if idx is not None:
+            self.stats["fuzzy"] += 1
+            self._keys[key] = idx
+            self._dirty = True
+            return self.canonical[idx]
+        if not learn:
+            return None
+
+        self.stats["new"] += 1
+        self._add(_display(name), norm, key, vector)
+        return self.canonical[-1]
+
+    def _nearest(self, norm: str, vector: np.ndarray) -> Optional[int]:
+        n = len(self.canonical)
+        if not n:
+            return None
+        scores = self._vectors[:n] @ vector
+        k = min(self.candidates, n)
+        top = np.argpartition(scores, n - k)[n - k:]
+        for idx in top[np.argsort(scores[top])[::-1]]:
+            if scores[idx] < self.min_cosine:
+                break
+            if near_identical(norm, self._norm[idx]):
+                return int(idx)
+        return None
+
+    def _add(self, display: str, norm: str, key: str, vector: Optional[np.ndarray] = None):
+        n = len(self.canonical)
+        if n == len(self._vectors):
+            self._vectors = np.vstack([self._vectors, np.zeros_like(self._vectors)])
+        self._vectors[n] = vector if vector is not None else _vector(norm)
+        self.canonical.append(display)
+        self._norm.append(norm)
+        self._keys[key] = n
+        self._keys.setdefault(_loose_key(display), n)
+        self._dirty = True
+
+    # --------------------------------------------------------
+
+    def canonicalize_items(self, items: List[Dict], field: str = "category",
+                           seen: Optional[Dict[str, str]] = None) -> Dict:
+        """Rewrite item[field] in place; one lookup per distinct raw value (raw -> canonical added to `seen`)."""
+        raw = {it.get(field) for it in items if isinstance(it, dict)}
+        mapping = {r: self.lookup(r) for r in raw if r}
+        if seen is not None:
+            seen.update(mapping)
+        for it in items:
+            if isinstance(it, dict) and it.get(field) in mapping:
+                it[field] = mapping[it[field]]
+        return {
+            "distinct_before": len(mapping),
+            "distinct_after": len(set(mapping.values())),
+            "renamed": {r: c for r, c in mapping.items() if r != c},
+        }
+
+    def report(self) -> Dict:
+        with self._lock:
+            s = dict(self.stats)
+        s["canonical"] = len(self.canonical)
+        s["aliases"] = len(self._keys)
+        return s
+
+    # --------------------------------------------------------
+
+    def save(self, path: Optional[str] = None):
+        path = Path(path) if path else self.path
+        if path is None:
+            return
+        with self._lock:
+            if not self._dirty and path == self.path:
+                return
+            aliases = {k: self.canonical[i] for k, i in self._keys.items()}
+            data = {"canonical": self.canonical, "aliases": aliases}
+            self._dirty = False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        tmp.replace(path)
+
+    def load(self, path: Optional[str] = None):
+        path = Path(path) if path else self.path
+        data = json.loads(path.read_text(encoding="utf-8"))
+        with self._lock:
+            for name in data["canonical"]:
+                norm = normalize_category(name)
+                self._add(name, norm, norm.replace(" ", ""))
+            position = {name: i for i, name in enumerate(self.canonical)}
+            for key, name in data["aliases"].items():
+                if name in position:
+                    self._keys[key] = position[name]
+            self._dirty = False
+        logger.info(f"Loaded {len(self.canonical)} canonical categories from {path}")
+
+
+# ============================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_category_index() -> CategoryIndex:
+    """Shared index, loaded from CATEGORY_INDEX_PATH on first use."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = CategoryIndex(os.getenv("CATEGORY_INDEX_PATH", ".cache/categories.json"))
+        return _INDEX
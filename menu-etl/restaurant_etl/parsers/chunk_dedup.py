@@ -0,0 +1,355 @@
+"""
+Near-duplicate chunk reuse across menus (franchise outlets, re-uploads).
+
+Chunks are normalized (lowercased, whitespace collapsed, price tokens
+masked) and indexed with MinHash/LSH. When a new chunk is close to one that
+was already parsed, the line diff decides what happens:
+
+- same lines, prices changed: cached items are reused with their prices
+  patched from the aligned lines (no LLM call)
+- a few lines added/changed: cached items of unchanged lines are kept and
+  only the differing lines (plus the nearest header line for context) are
+  sent to the LLM
+- otherwise the chunk is parsed from scratch
+
+Cached items are anchored to the line containing their name; a chunk whose
+items can't all be anchored is only reused when it is identical.
+
+The index keeps copies of the items (the parser edits its own in place)
+and only the `max_entries` most recently used chunks. The shared index is
+persisted as JSON, so outlets processed in later runs reuse it too:
+
+    CHUNK_INDEX_PATH   (default .cache/chunk_index.json)
+"""
+
+import os
+import re
+import json
+import difflib
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+import numpy as np
+
+from restaurant_etl.parsers.cascade import PRICE_TOKEN_RE
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+PRICE_FIELDS = ("price", "half_plate_price", "full_plate_price", "small_price", "medium_price", "large_price")
+PRICE_MASK = "<p>"
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _split_prices(line: str) -> Tuple[str, List[float]]:
+    """
+    Split the trailing run of price tokens off a line. Numbers earlier in the
+    line ("Pizza 12", "6 Pcs") stay part of the text.
+    """
+    tokens = list(PRICE_TOKEN_RE.finditer(line))
+    values, cut = [], len(line.rstrip())
+    for m in reversed(tokens):
+        # between prices only spaces and / | , (dot leaders end the run)
+        if line[m.end():cut].strip(" \t/|,") != "":
+            break
+        try:
+            values.append(float(re.sub(r"[^\d.]", "", m.group().replace(",", ""))))
+        except ValueError:
+            break
+        cut = m.start()
+    return line[:cut], values[::-1]
+
+
+def normalize_line(line: str) -> str:
+    text, values = _split_prices(line)
+    return " ".join(text.lower().split() + [PRICE_MASK] * len(values))
+
+
+def _price_values(line: str) -> List[float]:
+    return _split_prices(line)[1]
+
+
+def _lines(chunk: str) -> List[str]:
+    return [l for l in chunk.splitlines() if l.strip()]
+
+
+class ReusePlan:
+    def __init__(self, kind: str, items: List[Dict], reparse_text: Optional[str] = None,
+                 similarity: float = 1.0):
+        self.kind = kind  # "exact" | "price_patch" | "partial"
+        self.items = items
+        self.reparse_text = reparse_text
+        self.similarity = similarity
+
+
+class ChunkReuseIndex:
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.7,
+                 max_changed_fraction: float = 0.35, seed: int = 1, path: Optional[str] = None,
+                 max_entries: Optional[int] = 20000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_changed_fraction = max_changed_fraction
+        self.path = Path(path) if path else None
+        # least recently used chunks are dropped beyond this; None keeps everything
+        self.max_entries = max_entries
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()  # oldest use first
+        self._next_id = 0
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._dirty = False
+        self.stats = {"lookups": 0, "exact": 0, "price_patch": 0, "partial": 0, "miss": 0,
+                      "chars_total": 0, "chars_sent": 0, "evicted": 0}
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    # --------------------------------------------------------
+
+    def _minhash(self, norm_lines: List[str]) -> np.ndarray:
+        words = " \n ".join(norm_lines).split()
+        shingles = {" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))}
+        hv = np.array(
+            [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles],
+            dtype=np.uint64,
+        )
+        phv = ((np.outer(hv, self._a) + self._b) % _MERSENNE) & _MAX_HASH
+        return phv.min(axis=0)
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    @staticmethod
+    def _anchor(items: List[Dict], norm_lines: List[str]) -> List[Optional[int]]:
+        # items come out in reading order: search forward from the previous anchor first
+        anchors, start = [], 0
+        for it in items:
+            name = " ".join(str(it.get("item_name") or "").lower().split())
+            order = list(range(start, len(norm_lines))) + list(range(start))
+            idx = next((i for i in order if name and name in norm_lines[i]), None)
+            anchors.append(idx)
+            if idx is not None:
+                start = idx
+        return anchors
+
+    # --------------------------------------------------------
+
+    def add(self, chunk: str, items: List[Dict]):
+        lines = _lines(chunk)
+        norm = [normalize_line(l) for l in lines]
+        if not norm:
+            return
+        sig = self._minhash(norm)
+        # a copy: the caller goes on to canonicalize / dedupe / correct its items in place
+        items = [dict(it) for it in items if isinstance(it, dict)]
+        entry = {"lines": lines, "norm": norm, "items": items, "anchors": self._anchor(items, norm),
+                 "keys": list(self._band_keys(sig))}
+        with self._lock:
+            idx = entry["id"] = self._next_id
+            self._next_id += 1
+            self._entries[idx] = entry
+            for key in entry["keys"]:
+                self._buckets.setdefault(key, []).append(idx)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._evict()
+            self._dirty = True
+
+    def _evict(self):
+        _, entry = self._entries.popitem(last=False)
+        for key in entry["keys"]:
+            ids = self._buckets.get(key, [])
+            if entry["id"] in ids:
+                ids.remove(entry["id"])
+            if not ids:
+                self._buckets.pop(key, None)
+        self.stats["evicted"] += 1
+
+    def plan(self, chunk: str) -> Optional[ReusePlan]:
+        plan = self._plan(chunk)
+        with self._lock:
+            self.stats["lookups"] += 1
+            self.stats["chars_total"] += len(chunk)
+            self.stats[plan.kind if plan else "miss"] += 1
+            self.stats["chars_sent"] += len(plan.reparse_text or "") if plan else len(chunk)
+        return plan
+
+    def _plan(self, chunk: str) -> Optional[ReusePlan]:
+        lines = _lines(chunk)
+        norm = [normalize_line(l) for l in lines]
+        if not norm:
+            return None
+
+        sig = self._minhash(norm)
+        with self._lock:
+            candidates = {i for key in self._band_keys(sig) for i in self._buckets.get(key, ())}
+            entries = [self._entries[i] for i in candidates if i in self._entries]
+
+        best, best_sim = None, 0.0
+        new_set = set(norm)
+        for e in entries:
+            old_set = set(e["norm"])
+            sim = len(old_set & new_set) / len(old_set | new_set)
+            if sim > best_sim:
+                best, best_sim = e, sim
+        if best is None or best_sim < self.threshold:
+            return None
+        with self._lock:
+            if best["id"] in self._entries:
+                self._entries.move_to_end(best["id"])
+
+        return self._diff_plan(best, lines, norm, best_sim)
+
+    def _diff_plan(self, entry: Dict, lines: List[str], norm: List[str], sim: float) -> Optional[ReusePlan]:
+        old_lines, old_norm = entry["lines"], entry["norm"]
+        matcher = difflib.SequenceMatcher(a=old_norm, b=norm, autojunk=False)
+
+        line_map: Dict[int, int] = {}  # old line -> new line (same masked text)
+        changed_new: List[int] = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                for k in range(i2 - i1):
+                    line_map[i1 + k] = j1 + k
+            else:
+                changed_new.extend(range(j1, j2))
+
+        if len(changed_new) > self.max_changed_fraction * len(norm):
+            return None
+        if changed_new and any(a is None for a in entry["anchors"]):
+            return None
+
+        # prices that changed anywhere in the chunk, for items whose price sits on another line
+        changes: Dict[float, float] = {}
+        ambiguous = set()
+        for old_i, new_i in line_map.items():
+            for old, new in zip(_price_values(old_lines[old_i]), _price_values(lines[new_i])):
+                if old != new:
+                    if changes.get(old, new) != new:
+                        ambiguous.add(old)
+                    changes[old] = new
+
+        kept, price_changed = [], False
+        for item, anchor in zip(entry["items"], entry["anchors"]):
+            if anchor is not None and anchor not in line_map:
+                continue  # its line was removed or rewritten; the new line is re-parsed
+            line_prices = {}
+            if anchor is not None:
+                line_prices = dict(zip(_price_values(old_lines[anchor]), _price_values(lines[line_map[anchor]])))
+            patched = self._patch_prices(item, line_prices, changes, ambiguous)
+            if patched is None:
+                if anchor is None:
+                    return None
+                changed_new.append(line_map[anchor])  # can't patch reliably: re-parse this line
+                continue
+            price_changed = price_changed or patched != item
+            kept.append(patched)
+
+        if not changed_new:
+            return ReusePlan("price_patch" if price_changed else "exact", kept, similarity=sim)
+
+        changed_new = sorted(set(changed_new))
+        # nearest preceding price-free line gives the LLM the section header
+        context = []
+        for j in range(changed_new[0] - 1, -1, -1):
+            if PRICE_MASK not in norm[j] and not re.search(r"\d\s*$", norm[j]):
+                context = [lines[j]]
+                break
+        reparse = "\n".join(context + [lines[j] for j in changed_new])
+        return ReusePlan("partial", kept, reparse_text=reparse, similarity=sim)
+
+    @staticmethod
+    def _patch_prices(item: Dict, line_prices: Dict[float, float], changes: Dict[float, float],
+                      ambiguous: set) -> Optional[Dict]:
+        """Item with prices moved to the new values, or None if a price can't be placed."""
+        mapping = {}
+        for field in PRICE_FIELDS:
+            value = item.get(field)
+            if value is None:
+                continue
+            if value in line_prices:
+                mapping[value] = line_prices[value]
+            elif value in ambiguous:
+                return None
+            else:
+                mapping[value] = changes.get(value, value)
+
+        if all(old == new for old, new in mapping.items()):
+            return dict(item)
+        patched = dict(item)
+        for field in PRICE_FIELDS:
+            if item.get(field) is not None:
+                patched[field] = mapping[item[field]]
+        if patched.get("price_display"):
+            patched["price_display"] = re.sub(
+                r"\d+(?:\.\d+)?",
+                lambda m: f"{mapping.get(float(m.group()), float(m.group())):g}",
+                patched["price_display"],
+            )
+        return patched
+
+    # --------------------------------------------------------
+
+    def report(self) -> Dict:
+        with self._lock:
+            s = dict(self.stats)
+        avoided = s["exact"] + s["price_patch"]
+        s["llm_calls_avoided"] = avoided
+        s["avoided_rate"] = round(avoided / s["lookups"], 3) if s["lookups"] else 0.0
+        s["sent_char_fraction"] = round(s["chars_sent"] / s["chars_total"], 3) if s["chars_total"] else 0.0
+        s["entries"] = len(self._entries)
+        return s
+
+    # --------------------------------------------------------
+
+    def save(self, path: Optional[str] = None):
+        path = Path(path) if path else self.path
+        if path is None:
+            return
+        with self._lock:
+            if not self._dirty and path == self.path:
+                return
+            # oldest use first, so load() rebuilds the same order
+            data = [{"lines": e["lines"], "items": e["items"]} for e in self._entries.values()]
+            self._dirty = False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def load(self, path: Optional[str] = None):
+        path = Path(path) if path else self.path
+        if not path.exists():
+            return
+        for e in json.loads(path.read_text(encoding="utf-8")):
+            self.add("\n".join(e["lines"]), e["items"])
+        self._dirty = False
+        logger.info(f"Loaded {len(self._entries)} cached chunks from {path}")
+
+
+# ============================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_chunk_index() -> ChunkReuseIndex:
+    """Shared index so every parser in the process (e.g. a folder of outlet menus) reuses the same cache."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = ChunkReuseIndex(path=os.getenv("CHUNK_INDEX_PATH", ".cache/chunk_index.json"))
+        return _INDEX
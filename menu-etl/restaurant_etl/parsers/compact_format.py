@@ -0,0 +1,136 @@
+"""
+Compact, header-once response contract for menu items.
+
+Instead of repeating eleven JSON keys per item (mostly null), the model
+writes one header line of short keys followed by pipe-delimited rows:
+
+    @n|c|s|p|pd
+    Onion Kulcha|Breads||5.5|$5.50
+    Paratha (Vegan)|||6.5|$6.50
+
+- Only columns that are used anywhere need to appear in the header.
+- Empty cell = null, except category/subcategory where an empty cell
+  repeats the value from the previous row and "-" means null.
+- A new "@..." line may redefine the columns mid-response.
+
+decode_compact() expands this back into the regular MenuItem dicts. A
+reply without any "@" header is not compact output (the model answered
+in JSON or prose); callers check has_compact_header() first.
+"""
+
+import re
+from typing import List, Dict, Optional, Iterable
+
+SHORT_KEYS = {
+    "n": "item_name",
+    "v": "variant",
+    "c": "category",
+    "s": "subcategory",
+    "d": "description",
+    "p": "price",
+    "hp": "half_plate_price",
+    "fp": "full_plate_price",
+    "sp": "small_price",
+    "mp": "medium_price",
+    "lp": "large_price",
+    "pd": "price_display",
+}
+LONG_KEYS = {v: k for k, v in SHORT_KEYS.items()}
+
+NUMERIC_FIELDS = {
+    "price", "half_plate_price", "full_plate_price",
+    "small_price", "medium_price", "large_price",
+}
+CARRY_FORWARD = {"category", "subcategory"}
+NULL_MARKER = "-"
+
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_HEADER_RE = re.compile(r"^\s*@\w", re.MULTILINE)
+
+
+def has_compact_header(raw: str) -> bool:
+    return _HEADER_RE.search(raw or "") is not None
+
+
+def _to_number(cell: str) -> Optional[float]:
+    m = _NUMBER_RE.search(cell.replace(",", ""))
+    return float(m.group()) if m else None
+
+
+def decode_compact(raw: str) -> List[Dict]:
+    """Expand header-once delimited rows into MenuItem-shaped dicts."""
+    items = []
+    columns: List[str] = []
+    previous: Dict[str, Optional[str]] = {}
+
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line or line.startswith("```"):
+            continue
+        if line.startswith("@"):
+            columns = [SHORT_KEYS.get(k.strip(), k.strip()) for k in line[1:].split("|")]
+            continue
+        if not columns:
+            continue
+
+        cells = line.split("|")
+        if len(cells) > len(columns):
+            # stray pipes belong to the last column
+            cells = cells[:len(columns) - 1] + ["|".join(cells[len(columns) - 1:])]
+
+        item: Dict = {}
+        for field, cell in zip(columns, cells):
+            cell = cell.strip()
+            if field in CARRY_FORWARD and not cell:
+                item[field] = previous.get(field)
+            elif field in CARRY_FORWARD and cell == NULL_MARKER:
+                item[field] = None
+            elif not cell:
+                item[field] = None
+            elif field in NUMERIC_FIELDS:
+                item[field] = _to_number(cell)
+            else:
+                item[field] = cell
+
+        if not item.get("item_name"):
+            continue
+        for field in CARRY_FORWARD:
+            if field in item:
+                previous[field] = item[field]
+            else:
+                item[field] = previous.get(field)
+        items.append(item)
+
+    return items
+
+
+def _format_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).replace("|", "/").replace("\n", " ")
+
+
+def encode_compact(items: Iterable[Dict], fields: Optional[List[str]] = None) -> str:
+    """Inverse of decode_compact; used to size the contract against JSON."""
+    items = list(items)
+    if fields is None:
+        fields = [f for f in SHORT_KEYS.values() if any(it.get(f) is not None for it in items)]
+
+    lines = ["@" + "|".join(LONG_KEYS.get(f, f) for f in fields)]
+    previous: Dict = {}
+    for it in items:
+        cells = []
+        for f in fields:
+            value = it.get(f)
+            if f in CARRY_FORWARD and value is not None and value == previous.get(f):
+                cells.append("")
+            elif f in CARRY_FORWARD and value is None and previous.get(f) is not None:
+                cells.append(NULL_MARKER)
+            else:
+                cells.append(_format_cell(value))
+            if f in CARRY_FORWARD:
+                previous[f] = value
+        lines.append("|".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,211 @@
+"""
+Duplicate items from overlapping chunks and repeated pages.
+
+Chunks are parsed independently, so an item next to a chunk boundary, or
+on a page that is printed twice, comes back more than once. ItemDeduper
+drops them as items stream in, in linear time:
+
+- exact: one dict lookup on (normalized name, normalized variant, prices).
+  Names are case / accent / punctuation folded ("À la Carte" == "a la carte").
+- fuzzy: names one OCR slip apart ("Paneer Tikka" / "Paneer Tika" /
+  "Paneer Tikak", "Ala Carte" / "Alacarte"). Each name is indexed, within
+  its (variant, prices) block, under its delete-one-letter variants, so
+  the candidates come from dict lookups rather than a scan. A candidate
+  only counts when exactly one word differs by one dropped / added /
+  swapped letter (words of 4+ letters, no digits): menus are full of near-identical
+  names that are different dishes ("... Gravy - Palak" / "... - Korma",
+  "Tikka" / "Tikki", "Veg" / "Egg"), which a plain similarity ratio merges.
+
+Items in different categories are never duplicates (a drink listed under
+Beverages and again under Combos); a missing category matches any. The
+first occurrence is kept; empty fields of the kept item are filled from
+its duplicates (a description the other chunk saw, a category).
+
+    deduper = ItemDeduper()
+    for items in chunks:
+        unique = deduper.add(items)
+    deduper.report()
+"""
+
+import re
+import threading
+import unicodedata
+from collections import deque
+from typing import Optional, List, Dict, Tuple
+
+PRICE_FIELDS = ("price", "half_plate_price", "full_plate_price", "small_price", "medium_price", "large_price")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+MIN_TYPO_LEN = 4
+MAX_REMOVED_LOGGED = 50  # examples kept for the run metadata; the counts cover everything
+
+
+def normalize_name(name) -> str:
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode()
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def _price_key(item: Dict) -> Tuple:
+    key = []
+    for f in PRICE_FIELDS:
+        v = item.get(f)
+        try:
+            key.append(round(float(v), 2) if v is not None else None)
+        except (TypeError, ValueError):
+            key.append(str(v))
+    return tuple(key)
+
+
+def dedupe_key(item: Dict) -> Tuple[str, str, Tuple]:
+    return normalize_name(item.get("item_name")), normalize_name(item.get("variant")), _price_key(item)
+
+
+def _category(item: Dict) -> str:
+    return normalize_name(item.get("category"))
+
+
+def _same_section(category: str, kept: Dict) -> bool:
+    """Same category, or one side has none (a chunk that starts mid-section has no header to read)."""
+    other = _category(kept)
+    return not category or not other or category == other
+
+
+def _index_keys(name: str) -> List[str]:
+    tokens = name.split()
+    keys = [name, "#" + "".join(tokens)]
+    for i, t in enumerate(tokens):
+        if len(t) >= MIN_TYPO_LEN - 1 and t.isalpha():
+            for j in range(len(t)):
+                keys.append(" ".join(tokens[:i] + [t[:j] + t[j + 1:]] + tokens[i + 1:]))
+    return keys
+
+
+def _one_slip(a: str, b: str) -> bool:
+    """b is a with one letter dropped, added or two adjacent letters swapped."""
+    if not (a.isalpha() and b.isalpha()):
+        return False  # "Pizza 12" / "Pizza 112" are different items
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) == 1:
+        return len(b) >= MIN_TYPO_LEN - 1 and any(a[:j] + a[j + 1:] == b for j in range(len(a)))
+    if len(a) != len(b) or len(a) < MIN_TYPO_LEN:
+        return False
+    diff = [j for j in range(len(a)) if a[j] != b[j]]
+    return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+
+
+def near_identical(a: str, b: str) -> bool:
+    """Normalized names that differ only by spacing or one slip in one word."""
+    if a.replace(" ", "") == b.replace(" ", ""):
+        return True
+    ta, tb = a.split(), b.split()
+    if len(ta) != len(tb):
+        return False
+    diff = [(x, y) for x, y in zip(ta, tb) if x != y]
+    return len(diff) == 1 and _one_slip(*diff[0])
+
+
+class ItemDeduper:
+    """
+    max_chunks: only compare against the last N add() calls (chunk / page
+    boundaries) and forget older items, so memory stays flat when items
+    are streamed out; None keeps everything (a page printed twice anywhere
+    in the menu is caught).
+    """
+
+    def __init__(self, fuzzy: bool = True, max_chunks: Optional[int] = None):
+        self.fuzzy = fuzzy
+        self.max_chunks = max_chunks
+        self._lock = threading.Lock()
+        self._seen: Dict[Tuple, List[Dict]] = {}
+        self._blocks: Dict[Tuple, Dict[str, List[Tuple[str, Dict]]]] = {}
+        self._generations: deque = deque()  # per add(): [(key, index keys, item)]
+        self.seen = 0
+        self.counts = {"exact": 0, "fuzzy": 0}
+        self.removed: List[Dict] = []  # the first MAX_REMOVED_LOGGED only
+
+    def add(self, items: List[Dict]) -> List[Dict]:
+        """The items not seen before (in order); duplicates are counted (first few listed in .removed)."""
+        unique = []
+        with self._lock:
+            added = []
+            for item in items:
+                if not isinstance(item, dict):
+                    unique.append(item)  # left for validation to reject
+                    continue
+                self.seen += 1
+                kept, match = self._match(item, added)
+                if kept is None:
+                    unique.append(item)
+                    continue
+                for k, v in item.items():
+                    if v not in (None, "") and kept.get(k) in (None, ""):
+                        kept[k] = v
+                self.counts[match] += 1
+                if len(self.removed) < MAX_REMOVED_LOGGED:
+                    self.removed.append({"item_name": item.get("item_name"), "kept": kept.get("item_name"),
+                                         "match": match})
+            if self.max_chunks is not None:
+                self._generations.append(added)
+                while len(self._generations) > self.max_chunks:
+                    self._forget(self._generations.popleft())
+        return unique
+
+    def _match(self, item: Dict, added: List) -> Tuple[Optional[Dict], Optional[str]]:
+        key = dedupe_key(item)
+        name, variant, prices = key
+        if not name:
+            return None, None  # no name: validation drops it
+        category = None  # normalized only when there is a candidate
+        for kept in self._seen.get(key, ()):
+            category = _category(item) if category is None else category
+            if _same_section(category, kept):
+                return kept, "exact"
+
+        keys = _index_keys(name) if self.fuzzy else []
+        block = self._blocks.setdefault((variant, prices), {}) if self.fuzzy else {}
+        for k in keys:
+            for other, kept in block.get(k, ()):
+                if near_identical(name, other):
+                    category = _category(item) if category is None else category
+                    if _same_section(category, kept):
+                        return kept, "fuzzy"
+
+        self._seen.setdefault(key, []).append(item)
+        for k in keys:
+            block.setdefault(k, []).append((name, item))
+        added.append((key, keys, item))
+        return None, None
+
+    def _forget(self, added: List):
+        for key, keys, item in added:
+            kept = [it for it in self._seen.get(key, ()) if it is not item]
+            if kept:
+                self._seen[key] = kept
+            else:
+                self._seen.pop(key, None)
+            block = self._blocks.get(key[1:])
+            if block is None:
+                continue
+            for k in keys:
+                entries = [e for e in block.get(k, ()) if e[1] is not item]
+                if entries:
+                    block[k] = entries
+                else:
+                    block.pop(k, None)
+            if not block:
+                del self._blocks[key[1:]]
+
+    def report(self) -> Dict:
+        return {
+            "items_seen": self.seen,
+            "duplicates_removed": self.counts["exact"] + self.counts["fuzzy"],
+            "exact": self.counts["exact"],
+            "fuzzy": self.counts["fuzzy"],
+            "removed": self.removed,
+        }
+
+
+def dedupe_items(items: List[Dict], **kwargs) -> Tuple[List[Dict], Dict]:
+    deduper = ItemDeduper(**kwargs)
+    unique = deduper.add(items)
+    return unique, deduper.report()
@@ -0,0 +1,294 @@
+"""
+Pool of Azure OpenAI endpoint/deployment/key entries.
+
+Requests are routed to the healthy backend with the best ratio of remaining
+quota (from the shared rate-limit scheduler) to observed latency. Backends
+that fail repeatedly are ejected for a cooldown that doubles on each
+ejection. Configure several regions with AZURE_OPENAI_POOL, a JSON list:
+
+    [{"endpoint": "...", "deployment": "gpt-4o", "api_key": "...",
+      "api_version": "2024-08-01-preview", "rpm": 300, "tpm": 50000}, ...]
+
+Without it the pool holds the single AZURE_OPENAI_* deployment. A cheaper
+tier for the model cascade is configured the same way with the
+AZURE_OPENAI_FAST_* variables.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Optional, List, Dict, Callable, Any, Iterable
+from urllib.parse import urlparse
+
+from restaurant_etl.parsers.rate_limiter import (
+    RateLimitScheduler,
+    get_scheduler,
+    _retry_after_seconds,
+    _status_code,
+)
+from restaurant_etl.utils.http_clients import get_http_client
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_API_VERSION = "2024-08-01-preview"
+
+
+class AzureBackend:
+    def __init__(self, endpoint: str, deployment: str, api_key: str,
+                 api_version: str = DEFAULT_API_VERSION,
+                 rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 client: Any = None):
+        self.endpoint = endpoint
+        self.deployment = deployment
+        self.api_key = api_key
+        self.api_version = api_version
+        self.rpm = rpm
+        self.tpm = tpm
+        parsed = urlparse(endpoint)
+        # host + path: two gateway routes on one host are separate quotas
+        self.name = f"{(parsed.netloc + parsed.path.rstrip('/')) or endpoint}/{deployment}"
+        self._client = client
+        self._http_client = None
+
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    @property
+    def client(self):
+        # rebuilt if the shared connection pool was closed (e.g. end of a Dagster run)
+        if self._client is None or (self._http_client is not None and self._http_client.is_closed):
+            from openai import AzureOpenAI
+            self._http_client = get_http_client()
+            self._client = AzureOpenAI(
+                api_key=self.api_key,
+                azure_endpoint=self.endpoint,
+                api_version=self.api_version,
+                http_client=self._http_client,
+            )
+        return self._client
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def metrics(self) -> Dict:
+        return {
+            "deployment": self.deployment,
+            "requests": self.requests,
+            "failures": self.failures,
+            "throttled": self.throttled,
+            "latency_ewma_s": round(self.latency_ewma, 3) if self.latency_ewma else None,
+            "ejections": self.ejections,
+            "healthy": self.is_healthy(time.monotonic()),
+        }
+
+
+class DeploymentPool:
+    def __init__(self, backends: List[AzureBackend],
+                 scheduler: Optional[RateLimitScheduler] = None,
+                 eject_after: int = 3, cooldown: float = 30.0,
+                 latency_alpha: float = 0.2):
+        if not backends:
+            raise ValueError("DeploymentPool needs at least one backend")
+        names = [b.name for b in backends]
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate backends in pool (same endpoint and deployment): {duplicates}")
+        self.backends = backends
+        self.scheduler = scheduler or get_scheduler()
+        self.eject_after = eject_after
+        self.cooldown = cooldown
+        self.latency_alpha = latency_alpha
+        self._lock = threading.Lock()
+
+        # the scheduler is shared by the text, vision and fast pools: a deployment
+        # already known there keeps its buckets (and what it has consumed)
+        for b in backends:
+            self.scheduler.configure_once(b.name, rpm=b.rpm, tpm=b.tpm)
+
+    # --------------------------------------------------------
+
+    @classmethod
+    def from_env(cls, scheduler: Optional[RateLimitScheduler] = None) -> "DeploymentPool":
+        raw = os.getenv("AZURE_OPENAI_POOL")
+        if raw:
+            entries = json.loads(raw)
+        else:
+            entries = [{
+                "endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
+                "deployment": os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+                "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
+            }]
+        return cls.from_entries(entries, scheduler=scheduler,
+                                rpm=os.getenv("AZURE_OPENAI_RPM_LIMIT"),
+                                tpm=os.getenv("AZURE_OPENAI_TPM_LIMIT"))
+
+    @classmethod
+    def fast_from_env(cls, scheduler: Optional[RateLimitScheduler] = None) -> Optional["DeploymentPool"]:
+        """
+        Cheap tier for the model cascade: AZURE_OPENAI_FAST_POOL (same JSON
+        shape as AZURE_OPENAI_POOL) or AZURE_OPENAI_FAST_DEPLOYMENT_NAME on the
+        default endpoint. None when neither is set.
+        """
+        raw = os.getenv("AZURE_OPENAI_FAST_POOL")
+        deployment = os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT_NAME")
+        if raw:
+            entries = json.loads(raw)
+        elif deployment:
+            entries = [{
+                "endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
+                "deployment": deployment,
+                "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
+            }]
+        else:
+            return None
+        return cls.from_entries(entries, scheduler=scheduler,
+                                rpm=os.getenv("AZURE_OPENAI_FAST_RPM_LIMIT"),
+                                tpm=os.getenv("AZURE_OPENAI_FAST_TPM_LIMIT"))
+
+    @classmethod
+    def from_entries(cls, entries: List[Dict], scheduler: Optional[RateLimitScheduler] = None,
+                     rpm: Optional[str] = None, tpm: Optional[str] = None) -> "DeploymentPool":
+        default_version = os.getenv("AZURE_OPENAI_API_VERSION", DEFAULT_API_VERSION)
+        backends = []
+        for e in entries:
+            if not all([e.get("endpoint"), e.get("deployment"), e.get("api_key")]):
+                raise ValueError("Missing Azure OpenAI credentials in .env")
+            backends.append(AzureBackend(
+                endpoint=e["endpoint"],
+                deployment=e["deployment"],
+                api_key=e["api_key"],
+                api_version=e.get("api_version", default_version),
+                rpm=e.get("rpm", int(rpm) if rpm else None),
+                tpm=e.get("tpm", int(tpm) if tpm else None),
+            ))
+        return cls(backends, scheduler=scheduler)
+
+    # --------------------------------------------------------
+
+    def select(self, exclude: Iterable[str] = ()) -> AzureBackend:
+        """Pick the healthy backend with the most quota per second of latency."""
+        now = time.monotonic()
+        exclude = set(exclude)
+        with self._lock:
+            candidates = [b for b in self.backends if b.name not in exclude and b.is_healthy(now)]
+            if not candidates:
+                candidates = [b for b in self.backends if b.is_healthy(now)]
+            if not candidates:
+                # everything ejected: use whichever comes back first
+                return min(self.backends, key=lambda b: b.ejected_until)
+
+            known = [b.latency_ewma for b in candidates if b.latency_ewma]
+            default_latency = sum(known) / len(known) if known else 1.0
+
+        def score(b: AzureBackend) -> float:
+            remaining = self.scheduler.remaining(b.name)
+            remaining = 1.0 if remaining is None else remaining
+            return remaining / (b.latency_ewma or default_latency)
+
+        return max(candidates, key=score)
+
+    def record_success(self, backend: AzureBackend, latency: float):
+        with self._lock:
+            backend.requests += 1
+            backend.consecutive_failures = 0
+            if backend.latency_ewma is None:
+                backend.latency_ewma = latency
+            else:
+                a = self.latency_alpha
+                backend.latency_ewma = a * latency + (1 - a) * backend.latency_ewma
+
+    def record_failure(self, backend: AzureBackend, exc: Exception):
+        with self._lock:
+            backend.requests += 1
+            if _status_code(exc) == 429:
+                backend.throttled += 1
+                return
+            backend.failures += 1
+            backend.consecutive_failures += 1
+            if backend.consecutive_failures >= self.eject_after:
+                backend.ejections += 1
+                backend.consecutive_failures = 0
+                pause = self.cooldown * (2 ** (backend.ejections - 1))
+                backend.ejected_until = time.monotonic() + pause
+                logger.warning(f"Ejecting backend {backend.name} for {pause:.0f}s after repeated failures")
+
+    def metrics(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {b.name: b.metrics() for b in self.backends}
+
+    # --------------------------------------------------------
+
+    def submit(self, fn: Callable[[AzureBackend], Any], est_tokens: int = 0,
+               max_retries: int = 3, base_delay: float = 1.0,
+               exclude: Iterable[str] = ()) -> Any:
+        """
+        Run fn(backend) on the best backend (avoiding `exclude` when possible),
+        moving to another backend when a call fails. Raises the last error
+        when retries run out.
+        """
+        tried = list(exclude)
+        delay = base_delay
+        for attempt in range(1, max_retries + 1):
+            backend = self.select(exclude=tried)
+            self.scheduler.acquire(backend.name, est_tokens)
+            start = time.monotonic()
+            try:
+                result = fn(backend)
+            except Exception as e:
+                self.record_failure(backend, e)
+                tried.append(backend.name)
+                if attempt == max_retries:
+                    raise
+                if _status_code(e) == 429:
+                    retry_after = _retry_after_seconds(e)
+                    self.scheduler.penalize(backend.name, retry_after if retry_after is not None else delay)
+                    logger.warning(f"429 from {backend.name}; rerouting")
+                else:
+                    logger.error(f"Attempt {attempt} on {backend.name} failed: {e}")
+                    if len(self.backends) == 1:
+                        time.sleep(self.scheduler._jittered(delay))
+                delay *= 2
+                continue
+            self.record_success(backend, time.monotonic() - start)
+            return result
+
+
+# ============================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_default_pool() -> DeploymentPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = DeploymentPool.from_env()
+            logger.info(f"Initialized Azure OpenAI pool with {len(_POOL.backends)} backend(s)")
+        return _POOL
+
+
+_FAST_POOL = None
+_FAST_POOL_LOADED = False
+
+
+def get_fast_pool() -> Optional[DeploymentPool]:
+    """Process-wide cheap-tier pool, or None when no fast deployment is configured."""
+    global _FAST_POOL, _FAST_POOL_LOADED
+    with _POOL_LOCK:
+        if not _FAST_POOL_LOADED:
+            _FAST_POOL = DeploymentPool.fast_from_env()
+            _FAST_POOL_LOADED = True
+            if _FAST_POOL:
+                logger.info(f"Initialized fast-tier pool with {len(_FAST_POOL.backends)} backend(s)")
+        return _FAST_POOL
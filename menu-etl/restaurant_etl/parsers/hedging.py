@@ -0,0 +1,119 @@
+"""
+Hedged LLM requests to cut per-chunk tail latency.
+
+If a chunk request is still running after the tracked latency percentile
+(p95 by default), a duplicate is issued (through the pool, so it can land
+on another deployment). The first valid response wins and the other one is
+cancelled if it has not started yet, otherwise its result is discarded
+(the sync OpenAI client can't abort an in-flight HTTP call). Hedges spend
+extra quota, so the policy is opt-in: LLM_HEDGE_PERCENTILE=0.95.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional, Any, Dict, List
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(p * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            return _percentile(list(self._samples), p)
+
+    def __len__(self):
+        return len(self._samples)
+
+
+class HedgePolicy:
+    def __init__(self, percentile: float = 0.95, min_samples: int = 10,
+                 min_delay: float = 2.0, max_workers: int = 8):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.tracker = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-hedge")
+        self._lock = threading.Lock()
+        self._end_to_end = deque(maxlen=5000)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    # --------------------------------------------------------
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging; None until enough samples exist."""
+        if len(self.tracker) < self.min_samples:
+            return None
+        return max(self.min_delay, self.tracker.percentile(self.percentile))
+
+    def run(self, primary: Callable[[], Any], hedge: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        first = self._executor.submit(primary)
+        delay = self.hedge_delay()
+
+        done, _ = wait([first], timeout=delay)
+        if done:
+            result = first.result()  # a fast failure is the pool's to retry
+            self._record(start, hedged=False, hedge_won=False)
+            return result
+
+        logger.info(f"Chunk slower than p{int(self.percentile * 100)} ({delay:.1f}s); sending hedge request")
+        second = self._executor.submit(hedge)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is not None:
+                    error = fut.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                self._record(start, hedged=True, hedge_won=fut is second)
+                return fut.result()
+        raise error
+
+    # --------------------------------------------------------
+
+    def _record(self, start: float, hedged: bool, hedge_won: bool):
+        elapsed = time.monotonic() - start
+        # when the hedge wins this is a lower bound for the primary's latency
+        self.tracker.add(elapsed)
+        with self._lock:
+            self.requests += 1
+            self.hedged += int(hedged)
+            self.hedge_wins += int(hedge_won)
+            self._end_to_end.append(elapsed)
+
+    def report(self) -> Dict:
+        with self._lock:
+            samples = list(self._end_to_end)
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_rate": round(self.hedged / self.requests, 3) if self.requests else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "p50_s": round(_percentile(samples, 0.50) or 0.0, 3),
+                "p99_s": round(_percentile(samples, 0.99) or 0.0, 3),
+            }
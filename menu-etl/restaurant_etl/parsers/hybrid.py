@@ -0,0 +1,143 @@
+"""
+Hybrid per-page pipeline: every page goes to the cheapest pipeline that
+can read it (see extractors/page_router.py) and the items of all pages
+are merged, in page order, into one MenuData.
+
+The `routing` report in extraction_metadata lists each page's route, the
+reason, items found, seconds and estimated cost. process(..., force_route=)
+runs a single-mode pass (everything through text, OCR or vision) for
+comparison.
+"""
+
+import time
+import logging
+from pathlib import Path
+from collections import Counter
+from typing import Optional, Dict, List
+
+from restaurant_etl.extractors.page_cache import get_page_cache
+from restaurant_etl.extractors.page_router import PageRouter, PageRoute, ROUTES
+from restaurant_etl.extractors.pdf_extractor import PDFExtractor
+from restaurant_etl.models.menu_models import MenuData
+from restaurant_etl.parsers.cascade import DEFAULT_TIER_PRICES, count_price_tokens
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Azure Document Intelligence prebuilt-read, USD per page
+OCR_PRICE_PER_PAGE = 0.0015
+
+
+def _llm_cost(usage: Dict, tier: str) -> float:
+    p_in, p_out = DEFAULT_TIER_PRICES[tier]
+    return (usage["prompt_tokens"] * p_in + usage["completion_tokens"] * p_out) / 1e6
+
+
+class HybridMenuProcessor:
+    def __init__(self, extractor: Optional[PDFExtractor] = None, parser: Optional[LLMMenuParser] = None,
+                 vision_parser=None, router: Optional[PageRouter] = None, dpi: int = 300):
+        self.extractor = extractor or PDFExtractor()
+        self.parser = parser or LLMMenuParser()
+        self._vision_parser = vision_parser
+        self.router = router or PageRouter()
+        self.dpi = dpi
+
+    @property
+    def vision_parser(self):
+        # only built when a page actually needs it
+        if self._vision_parser is None:
+            from restaurant_etl.parsers.image_llm_parser import ImageLLMMenuParser
+            self._vision_parser = ImageLLMMenuParser()
+        return self._vision_parser
+
+    # --------------------------------------------------------
+
+    def process(self, pdf_path: str, restaurant_name: Optional[str] = None,
+                force_route: Optional[str] = None) -> MenuData:
+        if force_route is not None and force_route not in ROUTES:
+            raise ValueError(f"Unknown route: {force_route}")
+        pdf_path = Path(pdf_path)
+        start = time.perf_counter()
+        routes = self.router.classify(str(pdf_path))
+        classify_s = time.perf_counter() - start
+
+        self.parser._reset_usage()
+        self.parser._begin_document([r.text for r in routes])
+        all_items: List[Dict] = []
+        pages, texts = [], []
+        for route in routes:
+            if force_route is not None:
+                route.route, route.reason = force_route, "forced"
+            items, page, text = self._process_page(pdf_path, route, escalate=force_route is None)
+            all_items.extend(items)
+            pages.append(page)
+            texts.append(text)
+
+        if self.parser.verify_prices:
+            # vision pages have no text to re-read: their flags stay unconfirmed
+            self.parser._verify_prices("\n\n".join(t for t in texts if t), all_items)
+
+        cache = get_page_cache()
+        report = {
+            "mode": force_route or "hybrid",
+            "pages": pages,
+            "routes": dict(Counter(p["final_route"] for p in pages)),
+            "classify_s": round(classify_s, 3),
+            "seconds": round(time.perf_counter() - start, 2),
+            "cost_usd": round(sum(p["cost_usd"] for p in pages), 4),
+            "page_cache": cache.report() if cache is not None else None,
+        }
+        logger.info(f"{pdf_path.name}: {report['routes']}, ${report['cost_usd']}, {report['seconds']}s")
+        return self.parser._build_menu_data(
+            all_items,
+            restaurant_name,
+            routing=report,
+            **self.parser._run_metadata(),
+        )
+
+    def _process_page(self, pdf_path: Path, route: PageRoute, escalate: bool):
+        start = time.perf_counter()
+        usage_before = {t: dict(u) for t, u in self.parser.tier_usage.items()}
+        cost = 0.0
+        final = route.route
+        items: List[Dict] = []
+        text = None
+
+        if route.route == "text":
+            text = route.text
+            items = self.parser.parse_items(text) if text else []
+        elif route.route in ("ocr", "vision"):
+            image = self.extractor.render_page(str(pdf_path), route.page, dpi=self.dpi)
+            if image is None:
+                final = "failed"
+            elif route.route == "ocr":
+                text = self.extractor._ocr_image(image, route.page)
+                cost += OCR_PRICE_PER_PAGE
+                if escalate and not count_price_tokens(text):
+                    logger.info(f"Page {route.page}: OCR found no prices, escalating to vision")
+                    final = "vision"
+                elif text:
+                    items = self.parser.parse_items(text)
+            if final == "vision":
+                text = None
+                vision = self.vision_parser
+                items = vision.parse_images([image])
+                cost += (vision.last_run["prompt_tokens"] * DEFAULT_TIER_PRICES["large"][0]
+                         + vision.last_run["completion_tokens"] * DEFAULT_TIER_PRICES["large"][1]) / 1e6
+
+        for tier, usage in self.parser.tier_usage.items():
+            before = usage_before.get(tier, {"prompt_tokens": 0, "completion_tokens": 0})
+            cost += _llm_cost({k: usage[k] - before[k] for k in ("prompt_tokens", "completion_tokens")}, tier)
+
+        page = {
+            "page": route.page,
+            "route": route.route,
+            "final_route": final,
+            "reason": route.reason,
+            "items": len(items),
+            "seconds": round(time.perf_counter() - start, 2),
+            "cost_usd": round(cost, 5),
+            "features": route.features,
+        }
+        return items, page, text
@@ -0,0 +1,140 @@
+"""
+Image encoding for the vision parser.
+
+Pages are resized to the resolution the model actually looks at (high
+detail: fit in 2048x2048, then shortest side 768, billed per 512px tile),
+so nothing is uploaded that the service would throw away. They are then
+encoded lossily: the smaller of JPEG/WebP at the starting quality, with
+the quality stepped down until the payload is under max_bytes. Near-gray
+pages are sent as single-channel images.
+
+If shrinking a page by at most `tile_snap` (15%) drops a whole row or
+column of 512px tiles, it is shrunk: an A4 page goes from 768x1086
+(6 tiles, 1105 tokens) to 724x1024 (4 tiles, 765 tokens).
+"""
+
+import math
+import base64
+from io import BytesIO
+from typing import Tuple
+
+from PIL import Image, ImageStat
+
+HIGH_DETAIL_MAX_SIDE = 2048
+HIGH_DETAIL_SHORT_SIDE = 768
+TILE_SIZE = 512
+TILE_TOKENS = 170
+BASE_TOKENS = 85
+
+
+def effective_size(width: int, height: int) -> Tuple[int, int]:
+    """Size the image is scaled to by the service in high-detail mode."""
+    scale = min(1.0, HIGH_DETAIL_MAX_SIDE / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, HIGH_DETAIL_SHORT_SIDE / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _tiles(width: int, height: int) -> int:
+    return math.ceil(width / TILE_SIZE) * math.ceil(height / TILE_SIZE)
+
+
+def image_tokens(width: int, height: int) -> int:
+    return BASE_TOKENS + TILE_TOKENS * _tiles(*effective_size(width, height))
+
+
+def snap_to_tiles(width: int, height: int, max_shrink: float) -> Tuple[int, int]:
+    """Largest size within max_shrink of (width, height) with the fewest tiles."""
+    best = (width, height)
+    for tw in range(1, math.ceil(width / TILE_SIZE) + 1):
+        for th in range(1, math.ceil(height / TILE_SIZE) + 1):
+            scale = min(1.0, tw * TILE_SIZE / width, th * TILE_SIZE / height)
+            if scale < 1 - max_shrink:
+                continue
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            if (_tiles(*size), -size[0]) < (_tiles(*best), -best[0]):
+                best = size
+    return best
+
+
+class EncodedImage:
+    def __init__(self, data_url: str, mime: str, num_bytes: int, size: Tuple[int, int], tokens: int):
+        self.data_url = data_url
+        self.mime = mime
+        self.num_bytes = num_bytes
+        self.size = size
+        self.tokens = tokens
+
+
+class ImageEncodingPolicy:
+    def __init__(self, format: str = "auto", quality: int = 85, min_quality: int = 55,
+                 max_bytes: int = 300_000, grayscale_threshold: float = 6.0,
+                 tile_snap: float = 0.15):
+        if format not in ("auto", "jpeg", "webp", "png"):
+            raise ValueError(f"Unknown image format: {format}")
+        self.format = format
+        self.quality = quality
+        self.min_quality = min_quality
+        self.max_bytes = max_bytes
+        # mean colour saturation below which a page is sent as grayscale
+        self.grayscale_threshold = grayscale_threshold
+        self.tile_snap = tile_snap
+
+    # --------------------------------------------------
+
+    def prepare(self, image: Image.Image) -> Image.Image:
+        size = effective_size(*image.size)
+        if self.tile_snap:
+            size = snap_to_tiles(*size, max_shrink=self.tile_snap)
+        if size != image.size:
+            image = image.resize(size, Image.LANCZOS)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if image.mode == "RGB" and self._is_grayscale(image):
+            image = image.convert("L")
+        return image
+
+    def _is_grayscale(self, image: Image.Image) -> bool:
+        small = image.copy()
+        small.thumbnail((128, 128))
+        saturation = ImageStat.Stat(small.convert("HSV")).mean[1]
+        return saturation < self.grayscale_threshold
+
+    def _save(self, image: Image.Image, fmt: str, quality: int) -> BytesIO:
+        buffer = BytesIO()
+        if fmt == "png":
+            image.save(buffer, format="PNG", optimize=True)
+        elif fmt == "webp":
+            image.save(buffer, format="WEBP", quality=quality, method=4)
+        else:
+            image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+        return buffer
+
+    def _best(self, image: Image.Image, quality: int) -> Tuple[str, BytesIO]:
+        formats = ("jpeg", "webp") if self.format == "auto" else (self.format,)
+        encoded = [(fmt, self._save(image, fmt, quality)) for fmt in formats]
+        return min(encoded, key=lambda e: e[1].tell())
+
+    def encode(self, image: Image.Image) -> EncodedImage:
+        image = self.prepare(image)
+        tokens = image_tokens(*image.size)
+
+        quality = self.quality
+        fmt, buffer = self._best(image, quality)
+        while buffer.tell() > self.max_bytes and quality > self.min_quality and fmt != "png":
+            quality = max(self.min_quality, quality - 10)
+            fmt, buffer = self._best(image, quality)
+
+        # base64 straight from the buffer's memory, no intermediate bytes copy
+        view = buffer.getbuffer()
+        num_bytes = view.nbytes
+        encoded = base64.b64encode(view)
+        view.release()
+        return EncodedImage(
+            data_url=f"data:image/{fmt};base64," + encoded.decode("ascii"),
+            mime=f"image/{fmt}",
+            num_bytes=num_bytes,
+            size=image.size,
+            tokens=tokens,
+        )
+
@@ -1,12 +1,18 @@
 import os
-import json
+import asyncio
 import logging
-import base64
-from typing import List
-from io import BytesIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict
 
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+from pdf2image import convert_from_path
+from restaurant_etl.extractors.layout_regions import LayoutAnalyzer
+from restaurant_etl.extractors.page_cache import get_page_cache
+from restaurant_etl.parsers.json_repair import load_menu_json
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, get_default_pool
+from restaurant_etl.parsers.image_encoding import ImageEncodingPolicy, EncodedImage
+from restaurant_etl.utils.tokens import estimate_tokens
 
 load_dotenv() 
 
@@ -48,84 +54,236 @@ OUTPUT FORMAT:
 }
 """
 
+# adaptive request sizing: pages per request are bounded by image tokens in
+# the prompt and by expected output (items per page vary a lot) within max_tokens
+MAX_IMAGES_PER_REQUEST = 8
+IMAGE_TOKEN_BUDGET = 6000
+OUTPUT_TOKENS_PER_PAGE = 900  # prior until this document's responses come in
+OUTPUT_HEADROOM = 0.8
+
 # --------------------------------------------------
 # PARSER
 # --------------------------------------------------
 
 class ImageLLMMenuParser:
-    def __init__(self):
-        api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
-        api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview")
-
-        if not all([api_key, endpoint, deployment]):
-            raise ValueError("Azure OpenAI credentials missing. Check .env file.")
-
-        self.deployment = deployment
-        self.client = AzureOpenAI(
-            api_key=api_key,
-            azure_endpoint=endpoint,
-            api_version=api_version
-        )
+    def __init__(self, pool: Optional[DeploymentPool] = None, encoding: Optional[ImageEncodingPolicy] = None,
+                 max_concurrency: Optional[int] = None, layout: Optional[LayoutAnalyzer] = None):
+        # same backend pool / routing as the text parser
+        self.pool = pool or get_default_pool()
+        self.deployment = self.pool.backends[0].deployment
+        self.max_tokens = 4096
+        self.max_retries = 3
+        # whole-batch retries on top of the pool's per-call retries (errors, undecodable output)
+        self.batch_retries = 2
+
+        # resize to the model's working resolution + lossy encode (LLM_IMAGE_FORMAT=auto|jpeg|webp|png)
+        self.encoding = encoding or ImageEncodingPolicy(format=os.getenv("LLM_IMAGE_FORMAT", "auto"))
+
+        # requests in flight at once; the pool's scheduler still enforces RPM/TPM
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_VISION_CONCURRENCY", "4"))
+        self.max_images_per_request = MAX_IMAGES_PER_REQUEST
+        self.image_token_budget = IMAGE_TOKEN_BUDGET
+        self.output_tokens_per_page = OUTPUT_TOKENS_PER_PAGE
+        self.last_run: Dict = {}
+
+        # split pages into columns / sections, one request each (LLM_VISION_TILING=1)
+        if layout is None and os.getenv("LLM_VISION_TILING", "0") == "1":
+            layout = LayoutAnalyzer()
+        self.layout = layout
 
         logger.info("✓ Azure OpenAI Vision client initialized")
 
     # --------------------------------------------------
 
-    def parse_images(self, images: List, batch_size: int = 2):
-        all_items = []
+    def parse_images(self, images: List, batch_size: Optional[int] = None,
+                     max_concurrency: Optional[int] = None) -> List[Dict]:
+        """
+        Items of all pages, in page order. Requests are sized adaptively unless
+        a fixed batch_size is given.
+        """
+        coro = self.parse_images_async(images, batch_size=batch_size, max_concurrency=max_concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # called from inside an event loop (notebook, async worker): run on a private one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    def parse_pdf(self, pdf_path: str, dpi: int = 300) -> List[Dict]:
+        """Items of every page of a PDF, rendered through the shared page cache."""
+        cache = get_page_cache()
+        if cache is not None:
+            images = cache.get_pages(str(pdf_path), dpi=dpi)
+        else:
+            images = convert_from_path(pdf_path, dpi=dpi)
+        return self.parse_images(images)
+
+    async def parse_images_async(self, images: List, batch_size: Optional[int] = None,
+                                 max_concurrency: Optional[int] = None) -> List[Dict]:
+        if not images:
+            return []
+        num_pages = len(images)
+        page_of = list(range(num_pages))
+        if self.layout is not None:
+            tiled = await asyncio.gather(*(asyncio.to_thread(self.layout.crop, img) for img in images))
+            page_of = [page for page, regions in enumerate(tiled) for _ in regions]
+            images = [region for regions in tiled for region in regions]
+            batch_size = 1
+            logger.info(f"Layout analysis: {num_pages} page(s) -> {len(images)} region(s)")
+        encoded = await asyncio.gather(*(asyncio.to_thread(self.encoding.encode, img) for img in images))
+
+        pending = deque(range(len(images)))
+        requeued = deque()  # (pages, attempt) to send again, ahead of new pages
+        results: Dict[int, List[Dict]] = {}
+        stats = {"pages": num_pages, "regions": len(images), "requests": 0, "retries": 0, "truncated_splits": 0,
+                 "failed_pages": [], "prompt_tokens": 0, "completion_tokens": 0}
+        # running estimate of output tokens per page, learned from this document's responses
+        out_per_page = [float(self.output_tokens_per_page)]
+
+        async def worker():
+            while True:
+                if requeued:
+                    pages, attempt = requeued.popleft()
+                elif pending:
+                    pages, attempt = self._next_batch(pending, encoded, batch_size, out_per_page[0]), 0
+                else:
+                    return
+                await run_batch(pages, attempt)
 
-        for i in range(0, len(images), batch_size):
-            batch = images[i:i + batch_size]
-            logger.info(f"Vision batch {i // batch_size + 1} with {len(batch)} images")
+        async def run_batch(pages: List[int], attempt: int):
+            logger.info(f"Vision request: images {pages[0] + 1}-{pages[-1] + 1} of {len(images)}")
+            stats["requests"] += 1
+            try:
+                items, truncated, out_tokens = await asyncio.to_thread(self._call_vision, [encoded[p] for p in pages])
+            except Exception as e:
+                logger.error(f"Vision request for images {pages[0] + 1}-{pages[-1] + 1} failed: {e}")
+                items, truncated, out_tokens = None, False, 0
+            else:
+                stats["prompt_tokens"] += estimate_tokens(SYSTEM_PROMPT) + sum(encoded[p].tokens for p in pages)
+                stats["completion_tokens"] += out_tokens
 
-            content = [{"type": "text", "text": SYSTEM_PROMPT}]
+            if truncated and len(pages) > 1:
+                # output ran past max_tokens: the estimate was too low, resend in halves
+                out_per_page[0] = max(out_per_page[0], self.max_tokens / len(pages))
+                stats["truncated_splits"] += 1
+                mid = len(pages) // 2
+                requeued.extend([(pages[:mid], attempt), (pages[mid:], attempt)])
+                return
+            if items is None:
+                if attempt < self.batch_retries:
+                    stats["retries"] += 1
+                    await asyncio.sleep(2 ** attempt)
+                    if len(pages) > 1:
+                        mid = len(pages) // 2
+                        requeued.extend([(pages[:mid], attempt + 1), (pages[mid:], attempt + 1)])
+                    else:
+                        requeued.append((pages, attempt + 1))
+                    return
+                stats["failed_pages"].extend(page_of[p] + 1 for p in pages)
+                items = []
+            if truncated:
+                logger.warning(f"Page {page_of[pages[0]] + 1} output truncated at {self.max_tokens} tokens; kept salvaged items")
+            elif out_tokens:
+                out_per_page[0] = 0.7 * out_per_page[0] + 0.3 * out_tokens / len(pages)
+            results[pages[0]] = items
 
-            for img in batch:
-                content.append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": self._image_to_base64(img)
-                    }
-                })
+        workers = max_concurrency or self.max_concurrency
+        await asyncio.gather(*(worker() for _ in range(workers)))
 
-            response = self.client.chat.completions.create(
-                model=self.deployment,
+        stats["failed_pages"] = sorted(set(stats["failed_pages"]))
+        stats["images_per_request"] = round(len(images) / max(1, len(results)), 2)
+        stats["output_tokens_per_page"] = round(out_per_page[0])
+        self.last_run = stats
+        if stats["failed_pages"]:
+            logger.error(f"Vision parse failed for page(s) {stats['failed_pages']}")
+
+        # batches are contiguous page (region) ranges keyed by their first one
+        items = [item for first in sorted(results) for item in results[first]]
+        if self.layout is not None:
+            items = self._carry_categories(items)
+        return items
+
+    def _next_batch(self, pending: deque, encoded: List[EncodedImage], batch_size: Optional[int],
+                    out_per_page: float) -> List[int]:
+        """
+        Take the next pages that fit one request: image tokens within the
+        prompt budget and the expected output within max_tokens (with headroom).
+        """
+        if batch_size:
+            return [pending.popleft() for _ in range(min(batch_size, len(pending)))]
+
+        max_pages = min(self.max_images_per_request,
+                        max(1, int(self.max_tokens * OUTPUT_HEADROOM / max(1.0, out_per_page))))
+        pages = [pending.popleft()]
+        image_tokens = encoded[pages[0]].tokens
+        while pending and len(pages) < max_pages:
+            tokens = encoded[pending[0]].tokens
+            if image_tokens + tokens > self.image_token_budget:
+                break
+            pages.append(pending.popleft())
+            image_tokens += tokens
+        return pages
+
+    def _call_vision(self, images: List[EncodedImage]):
+        """One request for a contiguous run of pages -> (items or None, truncated, completion tokens)."""
+        content = [{"type": "text", "text": SYSTEM_PROMPT}]
+        content.extend({"type": "image_url", "image_url": {"url": img.data_url}} for img in images)
+
+        est_tokens = (
+            estimate_tokens(SYSTEM_PROMPT)
+            + sum(img.tokens for img in images)
+            + self.max_tokens
+        )
+        response = self.pool.submit(
+            lambda backend: backend.client.chat.completions.create(
+                model=backend.deployment,
                 messages=[{"role": "user", "content": content}],
                 temperature=0,
-                max_tokens=2500
-            )
+                max_tokens=self.max_tokens
+            ),
+            est_tokens=est_tokens,
+            max_retries=self.max_retries,
+        )
 
-            raw = response.choices[0].message.content
-            logger.debug(f"RAW VISION OUTPUT:\n{raw[:1000]}")
+        choice = response.choices[0]
+        raw = choice.message.content or ""
+        logger.debug(f"RAW VISION OUTPUT:\n{raw[:1000]}")
 
-            parsed = self._safe_json_load(raw)
-            all_items.extend(parsed.get("items", []))
+        usage = getattr(response, "usage", None)
+        out_tokens = getattr(usage, "completion_tokens", None) or estimate_tokens(raw)
+        truncated = getattr(choice, "finish_reason", None) == "length"
 
-        return all_items
+        parsed = self._safe_json_load(raw)
+        if parsed is None:
+            return None, truncated, out_tokens
+        return parsed.get("items", []), truncated, out_tokens
 
     # --------------------------------------------------
     # HELPERS
     # --------------------------------------------------
 
+    @staticmethod
+    def _carry_categories(items: List[Dict]) -> List[Dict]:
+        # a region below a section header sees the items but not the header
+        category = None
+        for item in items:
+            if item.get("category"):
+                category = item["category"]
+            elif category:
+                item["category"] = category
+        return items
+
     def _image_to_base64(self, image):
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+        return self.encoding.encode(image).data_url
 
     def _safe_json_load(self, text: str):
         """
         Robust JSON extractor for vision output
         """
         try:
-            start = text.find("{")
-            end = text.rfind("}") + 1
-            if start == -1 or end == -1:
-                raise ValueError("No JSON object found")
-            return json.loads(text[start:end])
+            return load_menu_json(text)
         except Exception as e:
             logger.error(" Could not parse JSON from vision output")
             logger.error(text[:1000])
-            return {"items": []}
-
+            return None
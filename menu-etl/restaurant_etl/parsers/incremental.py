@@ -0,0 +1,106 @@
+"""
+Incremental re-extraction of revised menus.
+
+For each tenant the page text and parsed items of the last processed
+version are kept in state_dir/<tenant>.json. A new upload is fingerprinted
+page by page (content streams + drawn images, no text extraction); pages
+seen before are reused as-is, and only new or changed pages are extracted
+and sent to the LLM. A changed page whose extracted text turns out to be
+identical to a previous page (re-saved PDF) also reuses its items.
+"""
+
+import re
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Dict
+
+from restaurant_etl.extractors.pdf_extractor import PDFExtractor
+from restaurant_etl.models.menu_models import MenuData
+from restaurant_etl.parsers.llm_parser import LLMMenuParser
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class IncrementalMenuProcessor:
+    def __init__(self, state_dir: str, extractor: Optional[PDFExtractor] = None,
+                 parser: Optional[LLMMenuParser] = None):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.extractor = extractor or PDFExtractor()
+        self.parser = parser or LLMMenuParser()
+
+    # --------------------------------------------------------
+
+    def process(self, tenant_id: str, pdf_path: str, restaurant_name: Optional[str] = None) -> MenuData:
+        pdf_path = Path(pdf_path)
+        previous = self._load(tenant_id)
+        prev_pages = previous["pages"] if previous else []
+        by_fingerprint = {p["fingerprint"]: p for p in prev_pages}
+        by_text = {p["text"]: p for p in prev_pages if p["text"]}
+
+        fingerprints = self.extractor.page_fingerprints(str(pdf_path))
+        changed = [i for i, fp in enumerate(fingerprints, 1) if fp not in by_fingerprint]
+        extracted = self.extractor.extract_pages(str(pdf_path), pages=changed) if changed else {}
+
+        self.parser._reset_usage()
+        self.parser._begin_document([by_fingerprint[fp]["text"] if fp in by_fingerprint else extracted[i]["text"]
+                                     for i, fp in enumerate(fingerprints, 1)])
+        pages, report = [], {"pages": len(fingerprints), "reused_pages": [], "changed_pages": [],
+                             "text_identical_pages": []}
+        for i, fp in enumerate(fingerprints, 1):
+            if fp in by_fingerprint:
+                page = dict(by_fingerprint[fp], fingerprint=fp)
+                report["reused_pages"].append(i)
+            elif extracted[i]["text"] in by_text:
+                page = dict(by_text[extracted[i]["text"]], fingerprint=fp)
+                report["text_identical_pages"].append(i)
+            else:
+                logger.info(f"Page {i}: changed, parsing")
+                text = extracted[i]["text"]
+                page = {
+                    "fingerprint": fp,
+                    "text": text,
+                    "method": extracted[i]["method"],
+                    # stored as parsed: deduping against other pages happens per version, below
+                    "items": self.parser.parse_items(text, dedupe=False) if text else [],
+                }
+                report["changed_pages"].append(i)
+            pages.append(page)
+
+        used = {p["fingerprint"] for p in pages} | {p["text"] for p in pages}
+        report["removed_pages"] = sum(1 for p in prev_pages if p["fingerprint"] not in used and p["text"] not in used)
+        report["previous_version"] = previous["source_file"] if previous else None
+        logger.info(f"{tenant_id}: {len(report['changed_pages'])}/{len(pages)} page(s) re-parsed")
+
+        self._save(tenant_id, {"source_file": pdf_path.name, "pages": pages})
+
+        all_items = [dict(it) for p in pages for it in p["items"]]
+        if self.parser.deduper is not None:
+            all_items = self.parser.deduper.add(all_items)
+        if self.parser.verify_prices:
+            self.parser._verify_prices("\n\n".join(p["text"] for p in pages if p["text"]), all_items)
+        return self.parser._build_menu_data(
+            all_items,
+            restaurant_name,
+            incremental=report,
+            **self.parser._run_metadata(),
+        )
+
+    # --------------------------------------------------------
+
+    def _path(self, tenant_id: str) -> Path:
+        return self.state_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', tenant_id)}.json"
+
+    def _load(self, tenant_id: str) -> Optional[Dict]:
+        path = self._path(tenant_id)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _save(self, tenant_id: str, state: Dict):
+        path = self._path(tenant_id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
@@ -0,0 +1,314 @@
+"""
+Tolerant JSON loading for LLM responses.
+
+One shared replacement for the per-parser regex repair cascades. Valid
+responses (raw newlines in strings included) are decoded by the C decoder
+in a single pass starting at the {"items" object (or the first bracket),
+so code fences, leading prose and trailing garbage never need a separate
+pass; load_menu_json moves on to later brackets when prose before the
+payload has its own ("[1 item]"). Anything else goes
+through a single linear scan (well-formed sub-values inside it are still
+handed to the C decoder) that accepts:
+
+- Python literals (None / True / False) and NaN
+- raw newlines / tabs inside strings, single-quoted strings
+- trailing commas, missing commas between values
+- truncated output: open strings/objects/arrays are closed at EOF
+- junk between array elements: skipped up to the next value, so nested
+  items survive (unlike the old `{[^{}]*}` salvage)
+"""
+
+import re
+import json
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder(strict=False)  # allow raw control chars in strings
+_WS = re.compile(r"[\s,]*")
+_STR_BODY = {
+    '"': re.compile(r'[^"\\]*'),
+    "'": re.compile(r"[^'\\]*"),
+}
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_BAREWORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_LITERALS = {
+    "null": None, "None": None, "NaN": None, "undefined": None,
+    "true": True, "True": True,
+    "false": False, "False": False,
+}
+# "key": <string | number | literal> in one match, the common case inside items
+_SIMPLE_MEMBER = re.compile(
+    r'[\s,]*"((?:[^"\\]|\\.)*)"\s*:\s*'
+    r'(?:"((?:[^"\\]|\\.)*)"|(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)|(null|true|false|None|True|False|NaN))'
+    r'(?=\s*[,}])'
+)
+_PY_LITERAL_AT = re.compile(r"None|True|False")
+# literals in value position only (after ':' ',' '[' and before ',' '}' ']')
+_PY_LITERALS = re.compile(r"(?<=[:,\[])(\s*)(None|True|False)(?=\s*[,}\]])")
+_JSON_LITERAL = {"None": "null", "True": "true", "False": "false"}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "'": "'"}
+
+_MISSING = object()
+_MENU_START = re.compile(r"""\{\s*["']?(?:items|sections)["']?\s*:""")
+_BRACKET = re.compile(r"[{\[]")
+MAX_START_ATTEMPTS = 20
+
+
+class _Scanner:
+    def __init__(self, text: str):
+        self.s = text
+        self.n = len(text)
+        self.i = 0
+        self.repaired = False
+
+    def skip(self):
+        self.i = _WS.match(self.s, self.i).end()
+
+    # --------------------------------------------------------
+
+    def value(self) -> Any:
+        self.skip()
+        if self.i >= self.n:
+            return _MISSING
+        c = self.s[self.i]
+        if c in "{[\"":
+            # well-formed sub-values go through the C decoder; only the
+            # damaged path down to the error is walked in Python
+            try:
+                val, self.i = _DECODER.raw_decode(self.s, self.i)
+                return val
+            except json.JSONDecodeError:
+                pass
+        if c == "{":
+            return self.obj()
+        if c == "[":
+            return self.arr()
+        if c in "\"'":
+            return self.string()
+        m = _NUMBER.match(self.s, self.i)
+        if m:
+            self.i = m.end()
+            text = m.group()
+            try:
+                return int(text) if text.lstrip("-").isdigit() else float(text)
+            except ValueError:
+                return None
+        m = _BAREWORD.match(self.s, self.i)
+        if m:
+            self.i = m.end()
+            self.repaired = True
+            return _LITERALS.get(m.group(), _MISSING)
+        return _MISSING
+
+    def string(self) -> str:
+        quote = self.s[self.i]
+        if quote != '"':
+            self.repaired = True
+        self.i += 1
+        body = _STR_BODY[quote]
+        parts = []
+        while True:
+            m = body.match(self.s, self.i)
+            parts.append(m.group())
+            self.i = m.end()
+            if self.i >= self.n:
+                self.repaired = True  # truncated inside a string
+                return "".join(parts)
+            c = self.s[self.i]
+            if c == quote:
+                self.i += 1
+                return "".join(parts)
+            # backslash escape
+            esc = self.s[self.i + 1:self.i + 2]
+            if esc == "u" and self.i + 6 <= self.n:
+                try:
+                    parts.append(chr(int(self.s[self.i + 2:self.i + 6], 16)))
+                    self.i += 6
+                    continue
+                except ValueError:
+                    pass
+            parts.append(_ESCAPES.get(esc, esc))
+            self.i += 2
+
+    def _unescape(self, text: str) -> str:
+        if "\\" not in text:
+            return text
+        try:
+            return _DECODER.decode('"' + text + '"')
+        except ValueError:
+            return text
+
+    def obj(self) -> Dict:
+        self.i += 1
+        out = {}
+        while True:
+            m = _SIMPLE_MEMBER.match(self.s, self.i)
+            if m:
+                key, text, number, literal = m.groups()
+                if text is not None:
+                    val = self._unescape(text)
+                elif number is not None:
+                    val = float(number) if any(ch in number for ch in ".eE") else int(number)
+                else:
+                    if literal not in ("null", "true", "false"):
+                        self.repaired = True
+                    val = _LITERALS[literal]
+                out[self._unescape(key)] = val
+                self.i = m.end()
+                continue
+            self.skip()
+            if self.i >= self.n:
+                self.repaired = True
+                return out
+            c = self.s[self.i]
+            if c == "}":
+                self.i += 1
+                return out
+            if c in "\"'":
+                key = self.string()
+            else:
+                m = _BAREWORD.match(self.s, self.i)
+                if not m:
+                    # junk inside an object: drop up to the next member or the end
+                    self.repaired = True
+                    self.resync("}")
+                    continue
+                key = m.group()
+                self.i = m.end()
+                self.repaired = True
+            self.skip()
+            if self.i < self.n and self.s[self.i] == ":":
+                self.i += 1
+            val = self.value()
+            if val is _MISSING:
+                self.repaired = True
+                if self.i >= self.n:
+                    return out
+                if self.s[self.i] != "}":
+                    self.resync("}")
+                continue
+            out[key] = val
+
+    def arr(self) -> list:
+        self.i += 1
+        out = []
+        while True:
+            self.skip()
+            if self.i >= self.n:
+                self.repaired = True
+                return out
+            if self.s[self.i] == "]":
+                self.i += 1
+                return out
+            val = self.value()
+            if val is _MISSING:
+                self.repaired = True
+                if self.i >= self.n:
+                    return out
+                if self.s[self.i] != "]":
+                    self.resync("]")
+                continue
+            out.append(val)
+
+    def resync(self, closer: str):
+        """Skip a run of junk up to something that can continue the container."""
+        stops = ",{[\"'" + closer
+        j = self.i + 1
+        while j < self.n and self.s[j] not in stops:
+            j += 1
+        self.i = j
+
+
+def _start_of_json(raw: str) -> int:
+    starts = [p for p in (raw.find("{"), raw.find("[")) if p != -1]
+    return min(starts) if starts else -1
+
+
+def tolerant_json_loads(raw: str, start: Optional[int] = None) -> Any:
+    """Parse the first JSON value in raw (or the one at `start`), repairing it if needed."""
+    if not raw or not raw.strip():
+        raise ValueError("Empty model output")
+
+    if start is None:
+        start = _start_of_json(raw)
+    if start == -1:
+        raise ValueError(f"[JSON Parse Error] No JSON found in model output.\nSnippet:\n{raw[:500]}")
+
+    try:
+        value, _ = _DECODER.raw_decode(raw, start)
+        return value
+    except json.JSONDecodeError as e:
+        error_pos = e.pos
+
+    if _PY_LITERAL_AT.match(raw, error_pos):
+        # Python-literal dumps are common and uniform: rewrite them in one
+        # regex pass rather than walking every item in Python
+        # same-length replacements, so `start` still holds
+        raw = _PY_LITERALS.sub(lambda m: m.group(1) + _JSON_LITERAL[m.group(2)], raw)
+        try:
+            value, _ = _DECODER.raw_decode(raw, start)
+            logger.warning("Repaired malformed JSON from model output")
+            return value
+        except json.JSONDecodeError:
+            pass
+
+    scanner = _Scanner(raw)
+    scanner.i = start
+    value = scanner.value()
+    if value is _MISSING:
+        raise ValueError(f"[JSON Parse Error] Could not parse model output.\nSnippet:\n{raw[:500]}")
+    if scanner.repaired:
+        logger.warning("Repaired malformed JSON from model output")
+    return value
+
+
+def _menu_starts(raw: str):
+    """Where a menu payload may begin: an {"items" / {"sections" object first, then every bracket in order."""
+    m = _MENU_START.search(raw)
+    if m:
+        yield m.start()
+    for b in _BRACKET.finditer(raw):
+        if m is None or b.start() != m.start():
+            yield b.start()
+
+
+def _is_menu(value: Any) -> bool:
+    if isinstance(value, dict):
+        return "items" in value or "sections" in value
+    return isinstance(value, list) and bool(value) and all(isinstance(v, dict) for v in value)
+
+
+def load_menu_json(raw: str) -> Dict:
+    """
+    tolerant_json_loads, normalised to a dict with an "items" list when the
+    model returned a bare array. Brackets in leading prose ("[1 item]",
+    "{x}") are skipped: later start positions are tried until one decodes
+    to a menu payload.
+    """
+    if not raw or not raw.strip():
+        raise ValueError("Empty model output")
+    first = _MISSING
+    error = None
+    for tried, start in enumerate(_menu_starts(raw)):
+        if tried == MAX_START_ATTEMPTS:
+            break
+        try:
+            parsed = tolerant_json_loads(raw, start)
+        except ValueError as e:
+            error = error or e
+            continue
+        if _is_menu(parsed):
+            return {"items": parsed} if isinstance(parsed, list) else parsed
+        if first is _MISSING:
+            first = parsed
+
+    if first is _MISSING:
+        # no bracket at all, or nothing decodable: same errors as tolerant_json_loads
+        raise error or ValueError(f"[JSON Parse Error] No JSON found in model output.\nSnippet:\n{raw[:500]}")
+    if isinstance(first, list):
+        return {"items": first}
+    if not isinstance(first, dict):
+        raise ValueError(f"[JSON Parse Error] Expected an object, got {type(first).__name__}")
+    return first
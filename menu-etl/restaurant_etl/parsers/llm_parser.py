@@ -1,19 +1,37 @@
 import os
-import json
 import time
 import logging
-import re
-from typing import Optional, List, Dict
+import threading
+from typing import Optional, List, Dict, Set
 
 from dotenv import load_dotenv
 load_dotenv()
 
-from restaurant_etl.models.menu_models import MenuItem, MenuData
-from restaurant_etl.parsers.prompt_templates import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from restaurant_etl.models.menu_models import MenuData
+from restaurant_etl.parsers.prompt_templates import (
+    SYSTEM_PROMPT,
+    USER_PROMPT_TEMPLATE,
+    COMPACT_SYSTEM_PROMPT,
+    COMPACT_USER_PROMPT_TEMPLATE,
+    GRID_SYSTEM_PROMPT,
+    GRID_USER_PROMPT_TEMPLATE,
+)
+from restaurant_etl.parsers.compact_format import decode_compact, has_compact_header
+from restaurant_etl.parsers.json_repair import load_menu_json as _safe_json_load_with_repair
+from restaurant_etl.parsers.postprocess import expand_price_grids, validate_menu_items
+from restaurant_etl.parsers.deployment_pool import DeploymentPool, AzureBackend, get_default_pool, get_fast_pool
+from restaurant_etl.parsers.cascade import CascadeStats, check_chunk_result
+from restaurant_etl.parsers.chunk_dedup import ChunkReuseIndex, get_chunk_index
+from restaurant_etl.parsers.hedging import HedgePolicy
+from restaurant_etl.parsers.dedupe import ItemDeduper
+from restaurant_etl.parsers.categories import CategoryIndex, get_category_index
+from restaurant_etl.utils.tokens import estimate_tokens
+from restaurant_etl.utils.clean_text import boilerplate_lines, preprocess_menu_text
+from restaurant_etl.validators.price_outliers import PriceVerifier, merge_price_reports, validate_prices
 
 # Postprocessing import
 try:
-    from restaurant_etl.parsers.postprocess import expand_and_normalize_items as postprocess_fn
+    from restaurant_etl.parsers.postprocess import expand_and_normalize_columnar as postprocess_fn
 except Exception:
     try:
         from restaurant_etl.parsers.postprocess import postprocess_llm_items as postprocess_fn
@@ -24,77 +42,31 @@ except Exception:
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+STREAM_DEDUPE_CHUNKS = 2  # stream_items: a chunk is deduped against the one before it
 
-# ============================================================
-# JSON REPAIR & SALVAGE
-# ============================================================
 
-def _safe_json_load_with_repair(raw: str) -> Dict:
+def _load_compact(raw: str) -> Dict:
     if not raw:
         raise ValueError("Empty model output")
+    if not has_compact_header(raw):
+        # the model ignored the contract: read it as JSON, or raise so the call is retried
+        return _safe_json_load_with_repair(raw)
+    return {"items": decode_compact(raw)}
 
-    raw = raw.strip()
-
-    # --- Strip markdown code fences ---
-    if raw.startswith("```"):
-        raw = raw.strip("`")
-        raw = raw.replace("json", "", 1).strip()
-
-    # --- Try direct parse ---
-    try:
-        parsed = json.loads(raw)
-        if isinstance(parsed, list):
-            return {"items": parsed}
-        return parsed
-    except Exception:
-        pass
-
-    # --- Trim trailing garbage ---
-    last_obj = raw.rfind("}")
-    last_arr = raw.rfind("]")
-    last_pos = max(last_obj, last_arr)
-
-    if last_pos != -1:
-        candidate = raw[: last_pos + 1]
-        try:
-            parsed = json.loads(candidate)
-            if isinstance(parsed, list):
-                return {"items": parsed}
-            return parsed
-        except Exception:
-            pass
-
-    # --- Replace Python literals & bad chars ---
-    repaired = raw
-    repaired = repaired.replace("\r", " ").replace("\t", " ")
-    repaired = repaired.replace("\n", "\\n")
-    repaired = re.sub(r":\s*None\b", ": null", repaired)
-    repaired = re.sub(r":\s*True\b", ": true", repaired)
-    repaired = re.sub(r":\s*False\b", ": false", repaired)
 
-    try:
-        parsed = json.loads(repaired)
-        if isinstance(parsed, list):
-            return {"items": parsed}
+def _load_grid(raw: str) -> Dict:
+    parsed = _safe_json_load_with_repair(raw)
+    if "sections" not in parsed:
         return parsed
-    except Exception:
-        pass
+    return {"items": expand_price_grids(parsed["sections"])}
 
-    # --- FINAL FALLBACK: salvage individual objects ---
-    objects = re.findall(r'\{[^{}]*\}', raw, re.DOTALL)
-    salvaged = []
-
-    for obj in objects:
-        try:
-            salvaged.append(json.loads(obj))
-        except Exception:
-            continue
 
-    if salvaged:
-        logger.warning(f" Salvaged {len(salvaged)} items from partial JSON")
-        return {"items": salvaged}
-
-    raise ValueError(f"[JSON Parse Error] Could not parse model output.\nSnippet:\n{raw[:500]}")
+# output_format -> (system prompt, user prompt template, response decoder)
+OUTPUT_FORMATS = {
+    "json": (SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, _safe_json_load_with_repair),
+    "compact": (COMPACT_SYSTEM_PROMPT, COMPACT_USER_PROMPT_TEMPLATE, _load_compact),
+    "grid": (GRID_SYSTEM_PROMPT, GRID_USER_PROMPT_TEMPLATE, _load_grid),
+}
 
 
 # ============================================================
@@ -102,68 +74,218 @@ def _safe_json_load_with_repair(raw: str) -> Dict:
 # ============================================================
 
 class LLMMenuParser:
-    def __init__(self):
+    def __init__(self, pool: Optional[DeploymentPool] = None, output_format: Optional[str] = None,
+                 hedge: Optional[HedgePolicy] = None, fast_pool: Optional[DeploymentPool] = None,
+                 chunk_index: Optional[ChunkReuseIndex] = None, columnar: Optional[bool] = None,
+                 dedupe: Optional[bool] = None, category_index: Optional[CategoryIndex] = None,
+                 clean_text: Optional[bool] = None, verify_prices: Optional[bool] = None):
         try:
             from openai import AzureOpenAI
         except Exception as e:
             raise ImportError("AzureOpenAI SDK missing") from e
 
-        self.api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        self.endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
-        self.api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview")
-
-        if not all([self.api_key, self.endpoint, self.deployment]):
-            raise ValueError("Missing Azure OpenAI credentials in .env")
+        # pool of endpoint/deployment/key entries (AZURE_OPENAI_POOL or the single .env deployment)
+        self.pool = pool or get_default_pool()
+        self.deployment = self.pool.backends[0].deployment
 
-        self.client = AzureOpenAI(
-            api_key=self.api_key,
-            azure_endpoint=self.endpoint,
-            api_version=self.api_version,
-        )
+        # cheap tier tried first when configured (AZURE_OPENAI_FAST_*); see cascade.py
+        self.fast_pool = fast_pool or get_fast_pool()
+        self.pools = {"large": self.pool, "fast": self.fast_pool}
 
         self.max_retries = 3
         self.max_tokens = 4096
 
-        logger.info(f"✓ AzureOpenAI client initialized (version={self.api_version})")
+        self.output_format = output_format or os.getenv("LLM_OUTPUT_FORMAT", "json")
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output_format: {self.output_format} (use one of {list(OUTPUT_FORMATS)})")
 
-    # --------------------------------------------------------
+        # opt-in: strip page markers, dot leaders, contact lines, repeated footers before chunking (MENU_CLEAN_TEXT=1)
+        self.clean_text = clean_text if clean_text is not None else os.getenv("MENU_CLEAN_TEXT", "0") == "1"
 
-    def parse_menu(self, menu_text: str, restaurant_name: Optional[str] = None) -> MenuData:
-        chunks = self._split_into_chunks(menu_text, max_chars=1000)
+        # drop items repeated across chunk boundaries / pages (MENU_DEDUPE=0 turns it off)
+        self.dedupe = dedupe if dedupe is not None else os.getenv("MENU_DEDUPE", "1") == "1"
 
-        all_items = []
+        # opt-in price outlier checks, flagged items re-read from their own lines (MENU_VERIFY_PRICES=1)
+        self.verify_prices = verify_prices if verify_prices is not None else os.getenv("MENU_VERIFY_PRICES", "0") == "1"
+
+        self._usage_lock = threading.Lock()
+        self._reset_usage()
+
+        # opt-in hedging of slow chunks (LLM_HEDGE_PERCENTILE=0.95)
+        hedge_percentile = os.getenv("LLM_HEDGE_PERCENTILE")
+        if hedge is None and hedge_percentile:
+            hedge = HedgePolicy(percentile=float(hedge_percentile))
+        self.hedge = hedge
+
+        # opt-in reuse of near-duplicate chunks across menus (LLM_CHUNK_REUSE=1)
+        if chunk_index is None and os.getenv("LLM_CHUNK_REUSE", "0") == "1":
+            chunk_index = get_chunk_index()
+        self.chunk_index = chunk_index
+
+        # opt-in canonical category names shared by all menus (MENU_CANONICAL_CATEGORIES=1)
+        if category_index is None and os.getenv("MENU_CANONICAL_CATEGORIES", "0") == "1":
+            category_index = get_category_index()
+        self.category_index = category_index
+
+        # Arrow-backed ColumnarMenuData instead of MenuData (MENU_COLUMNAR=1)
+        self.columnar = columnar if columnar is not None else os.getenv("MENU_COLUMNAR", "0") == "1"
+
+        logger.info(f"✓ AzureOpenAI pool ready ({len(self.pool.backends)} backend(s)"
+                    f"{', cascade on' if self.fast_pool else ''})")
+
+    # --------------------------------------------------------
 
+    def parse_menu(self, menu_text: str, restaurant_name: Optional[str] = None, sink=None) -> MenuData:
+        self._reset_usage()
+        # a sink gets each chunk's items as parsed: the one-item checks run per chunk, before the
+        # write; the category outliers need the whole menu, so they correct MenuData (and are
+        # reported in the metadata the caller closes the sink with), not rows already written
+        all_items = self.parse_items(menu_text, sink=sink, verify=self.verify_prices and sink is not None)
+        if self.verify_prices:
+            self._verify_prices(menu_text, all_items, per_item=sink is None)
+
+        return self._build_menu_data(all_items, restaurant_name, **self._run_metadata())
+
+    def _run_metadata(self) -> Dict:
+        return {
+            "llm_usage": dict(self.usage),
+            "llm_usage_by_tier": {t: dict(u) for t, u in self.tier_usage.items()},
+            "cascade": self.cascade.report(self.tier_usage) if self.fast_pool else None,
+            "backends": self.pool.metrics(),
+            "hedging": self.hedge.report() if self.hedge else None,
+            "chunk_reuse": self.chunk_index.report() if self.chunk_index else None,
+            "dedupe": self.deduper.report() if self.deduper else None,
+            "preprocess": dict(self.preprocess) if self.clean_text else None,
+            "categories": self._category_report() if self.category_index is not None else None,
+            "price_validation": self.price_validation,
+        }
+
+    def parse_items(self, menu_text: str, sink=None, dedupe: bool = True, verify: bool = False) -> List[Dict]:
+        """
+        Postprocessed (not yet validated) item dicts for a piece of menu text.
+        dedupe=False returns every chunk's items as parsed (the caller dedupes);
+        verify=True runs the one-item price checks on each chunk (no category outliers).
+        """
+        all_items = []
+        for items in self._iter_chunk_items(menu_text, dedupe=dedupe, verify=verify):
+            if sink is not None:
+                sink.write_items(items)
+                sink.checkpoint()
+            all_items.extend(items)
+        return all_items
+
+    def stream_items(self, menu_text: str, sink) -> int:
+        """
+        Like parse_items, but each chunk's items go only to the sink
+        (writers/sinks.py) and are not kept. Returns the rows written; the
+        caller closes the sink. With verify_prices only the one-item checks
+        run: category outliers need the whole menu, which is never in memory.
+        """
+        self._reset_usage()
+        if self.dedupe:
+            # rows already written can't be taken back: compare across chunk boundaries only
+            self.deduper = ItemDeduper(max_chunks=STREAM_DEDUPE_CHUNKS)
+        for items in self._iter_chunk_items(menu_text, verify=self.verify_prices):
+            sink.write_items(items)
+            sink.checkpoint()
+        if self.category_index is not None:
+            self.category_index.save()
+        if self.chunk_index is not None:
+            self.chunk_index.save()
+        return sink.rows_written
+
+    def _chunks(self, menu_text: str) -> List[str]:
+        """The chunks every mode sends (realtime, stream, batch)."""
+        if self.clean_text:
+            menu_text = self._preprocess(menu_text)
+        return self._split_into_chunks(menu_text, max_chars=1000)
+
+    def _iter_chunk_items(self, menu_text: str, dedupe: bool = True, verify: bool = False):
+        chunks = self._chunks(menu_text)
         for i, chunk in enumerate(chunks, 1):
             logger.info(f"Calling LLM on chunk {i}/{len(chunks)} ({len(chunk)} chars)")
-            parsed = self._call_llm_with_retries(chunk)
-            if not parsed:
-                continue
-
-            raw_items = parsed.get("items", [])
-            processed_items = postprocess_fn(raw_items)
-            all_items.extend(processed_items)
-
-        final_items = []
-        for item in all_items:
-            try:
-                obj = MenuItem(**item)
-                if obj.has_any_price():
-                    final_items.append(obj)
-            except Exception as e:
-                logger.debug(f"Validation failed: {e}")
+            items = self._parse_or_reuse(chunk)
+            if verify:
+                self._verify_prices(chunk, items, outliers=False)
+            # before the sink sees them, so files and MenuData carry the same names
+            self._canonicalize(items)
+            yield self.deduper.add(items) if self.deduper and dedupe else items
+
+    def _build_menu_data(self, all_items: List[Dict], restaurant_name: Optional[str], **metadata) -> MenuData:
+        if self.category_index is not None:
+            # text chunks were canonicalized as they were parsed; this covers the rest (vision pages)
+            done = set(self.category_map.values())
+            self._canonicalize([it for it in all_items if isinstance(it, dict) and it.get("category") not in done])
+            metadata["categories"] = self._category_report()
+            self.category_index.save()
+        if self.chunk_index is not None:
+            self.chunk_index.save()
+
+        if self.columnar:
+            from restaurant_etl.models.columnar import ColumnarMenuData
+            menu = ColumnarMenuData.from_items(all_items, restaurant_name or "Unknown", {
+                "output_format": self.output_format,
+                **metadata,
+            })
+            menu.extraction_metadata["total_items_extracted"] = menu.total_items
+            return menu
+
+        final_items, invalid = validate_menu_items(all_items)
+        if invalid:
+            logger.debug(f"Validation failed for {invalid} item(s)")
 
         return MenuData(
             restaurant_name=restaurant_name or "Unknown",
             items=final_items,
             total_items=len(final_items),
             extraction_metadata={
-                "total_items_extracted": len(final_items)
+                "total_items_extracted": len(final_items),
+                "output_format": self.output_format,
+                **metadata,
             }
         )
 
     # --------------------------------------------------------
 
+    def _verify_prices(self, menu_text: str, all_items: List[Dict], **checks) -> Dict:
+        report = validate_prices(all_items, **checks)
+        if report["flagged_items"]:
+            logger.info(f"Re-verifying {report['flagged_items']} item(s) with suspicious prices {report['reasons']}")
+            report["verification"] = PriceVerifier(self).verify(menu_text, all_items, report["flags"])
+        # summed over the texts of one run (stream chunks / hybrid and incremental call it once)
+        with self._usage_lock:
+            self.price_validation = (report if self.price_validation is None
+                                     else merge_price_reports(self.price_validation, report))
+        return report
+
+    def _canonicalize(self, items: List[Dict]):
+        if self.category_index is not None:
+            self.category_index.canonicalize_items(items, seen=self.category_map)
+
+    def _category_report(self) -> Dict:
+        return {
+            "distinct_before": len(self.category_map),
+            "distinct_after": len(set(self.category_map.values())),
+            "renamed": {r: c for r, c in self.category_map.items() if r != c},
+        }
+
+    def _begin_document(self, page_texts: List[str]):
+        """Headers / footers of the whole document, for runs that parse it page by page."""
+        if self.clean_text:
+            self.document_boilerplate = boilerplate_lines([t for t in page_texts if t])
+
+    def _preprocess(self, menu_text: str) -> str:
+        emitted = self.document_emitted if self.document_boilerplate is not None else None
+        text, report = preprocess_menu_text(menu_text, self.document_boilerplate, emitted)
+        logger.info(f"Preprocessed text: {report['tokens_before']} -> {report['tokens_after']} input tokens")
+        # summed over the texts of one run (hybrid / incremental parse page by page)
+        with self._usage_lock:
+            self.preprocess["tokens_before"] += report["tokens_before"]
+            self.preprocess["tokens_after"] += report["tokens_after"]
+            for k, v in report["removed"].items():
+                self.preprocess["removed"][k] = self.preprocess["removed"].get(k, 0) + v
+        return text
+
     def _split_into_chunks(self, text: str, max_chars: int) -> List[str]:
         parts = text.split("\n\n")
         chunks, curr = [], ""
@@ -182,35 +304,117 @@ class LLMMenuParser:
 
     # --------------------------------------------------------
 
-    def _call_llm_with_retries(self, chunk: str) -> Optional[Dict]:
-        delay = 1
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                return self._call_llm(chunk)
-            except Exception as e:
-                logger.error(f"Attempt {attempt} failed: {e}")
-                if attempt == self.max_retries:
-                    logger.error(" All retries failed.")
-                    return None
-                time.sleep(delay)
-                delay *= 2
+    def _parse_or_reuse(self, chunk: str) -> List[Dict]:
+        if self.chunk_index is None:
+            return self._parse_chunk(chunk)
+
+        plan = self.chunk_index.plan(chunk)
+        if plan is None:
+            items = self._parse_chunk(chunk)
+        else:
+            logger.info(f"Reusing cached chunk ({plan.kind}, similarity {plan.similarity:.2f})")
+            items = plan.items
+            if plan.reparse_text:
+                items = items + self._parse_chunk(plan.reparse_text)
+        if plan is None or plan.kind != "exact":
+            self.chunk_index.add(chunk, items)
+        return items
+
+    def _parse_chunk(self, chunk: str) -> List[Dict]:
+        if self.fast_pool is not None:
+            parsed = self._call_llm_with_retries(chunk, tier="fast")
+            items = postprocess_fn(parsed.get("items", [])) if parsed else None
+            reason = check_chunk_result(chunk, items)
+            self.cascade.record(reason)
+            if reason is None:
+                return items
+            logger.info(f"Escalating chunk to large model ({reason})")
+
+        parsed = self._call_llm_with_retries(chunk, tier="large")
+        if not parsed:
+            return []
+        return postprocess_fn(parsed.get("items", []))
 
     # --------------------------------------------------------
 
-    def _call_llm(self, chunk: str) -> Dict:
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(menu_text=chunk)}
+    def _reset_usage(self):
+        self.usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_s": 0.0}
+        self.tier_usage = {t: dict(self.usage) for t, p in self.pools.items() if p is not None}
+        self.cascade = CascadeStats()
+        self.deduper = ItemDeduper() if self.dedupe else None
+        self.preprocess = {"tokens_before": 0, "tokens_after": 0, "removed": {}}
+        self.category_map: Dict[str, str] = {}  # raw -> canonical category, this run
+        self.price_validation: Optional[Dict] = None
+        # set by _begin_document; None: each text finds its own repeated headers / footers
+        self.document_boilerplate: Optional[Set[str]] = None
+        self.document_emitted: Set[str] = set()
+
+    def _record_usage(self, response, latency: float, tier: str = "large"):
+        usage = getattr(response, "usage", None)
+        with self._usage_lock:
+            for totals in (self.usage, self.tier_usage[tier]):
+                totals["calls"] += 1
+                totals["latency_s"] = round(totals["latency_s"] + latency, 3)
+                if usage is not None:
+                    totals["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+                    totals["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+
+    def _messages(self, chunk: str) -> List[Dict]:
+        system_prompt, user_template, _ = OUTPUT_FORMATS[self.output_format]
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_template.format(menu_text=chunk)}
         ]
 
-        response = self.client.chat.completions.create(
-            model=self.deployment,
-            messages=messages,
+    def _estimate_request_tokens(self, chunk: str) -> int:
+        # Azure counts max_tokens against TPM when admitting a request
+        prompt = "".join(m["content"] for m in self._messages(chunk))
+        return estimate_tokens(prompt) + self.max_tokens
+
+    def _call_llm_with_retries(self, chunk: str, tier: str = "large") -> Optional[Dict]:
+        pool = self.pools[tier]
+        est_tokens = self._estimate_request_tokens(chunk)
+        primary_backends = []
+
+        def primary():
+            def call(backend):
+                primary_backends.append(backend.name)
+                return self._call_llm(chunk, backend, tier)
+            return pool.submit(call, est_tokens=est_tokens, max_retries=self.max_retries)
+
+        def hedge():
+            # prefer a different deployment than the straggler
+            return pool.submit(
+                lambda backend: self._call_llm(chunk, backend, tier),
+                est_tokens=est_tokens,
+                max_retries=1,
+                exclude=primary_backends[-1:],
+            )
+
+        try:
+            if self.hedge:
+                return self.hedge.run(primary, hedge)
+            return primary()
+        except Exception as e:
+            logger.error(f" All retries failed: {e}")
+            return None
+
+    # --------------------------------------------------------
+
+    def _call_llm(self, chunk: str, backend: AzureBackend, tier: str = "large") -> Dict:
+        start = time.monotonic()
+        response = backend.client.chat.completions.create(
+            model=backend.deployment,
+            messages=self._messages(chunk),
             temperature=0,
             max_tokens=self.max_tokens,
             timeout=60
         )
+        self._record_usage(response, time.monotonic() - start, tier)
 
         raw_output = response.choices[0].message.content
-        return _safe_json_load_with_repair(raw_output)
+        return self._decode(raw_output)
+
+    def _decode(self, raw_output: str) -> Dict:
+        return OUTPUT_FORMATS[self.output_format][2](raw_output)
 
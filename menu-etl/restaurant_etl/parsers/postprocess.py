@@ -1,25 +1,19 @@
 import re
-from typing import List, Dict
+from itertools import combinations
+from typing import List, Dict, Optional, Tuple
 
-PRICE_RE = re.compile(r"\d+[\.,]?\d*")
+import pandas as pd
+from pydantic import TypeAdapter, ValidationError
+
+from restaurant_etl.models.menu_models import MenuItem
+from restaurant_etl.utils.price_tokenizer import parse_price, parse_prices
+
+# below this many items the per-item loop beats building columns
+COLUMNAR_MIN_ITEMS = 5000
 
 
 def _parse_numeric(s: str):
-    if s is None:
-        return None
-    s = str(s).strip()
-    # remove currency symbols and commas
-    s = re.sub(r"[\$₹€,]", "", s)
-    # if range like 250-350, take lower bound
-    if "-" in s:
-        s = s.split("-")[0]
-    m = PRICE_RE.search(s)
-    if not m:
-        return None
-    try:
-        return float(m.group().replace(',', ''))
-    except:
-        return None
+    return parse_price(s)
 
 
 def expand_and_normalize_items(items: List[Dict]) -> List[Dict]:
@@ -49,3 +43,174 @@ def expand_and_normalize_items(items: List[Dict]) -> List[Dict]:
         it["price"] = _parse_numeric(pdisp) if it.get("price") is None else it.get("price")
         out.append(it)
     return out
+
+
+# ============================================================
+# COLUMNAR PATH (large catalogs)
+# ============================================================
+
+def _string_dtype():
+    # Arrow string kernels run the regex in C++; the object fallback loops in Python
+    try:
+        import pyarrow  # noqa: F401
+        return pd.StringDtype("pyarrow")
+    except ImportError:
+        return object
+
+
+# the shapes whose price is simply their first number: an optional leading currency
+# marker, a plain or 1,250-grouped number, an optional "- 350" / "/ 350" second price
+# and "/-". No other currency, unit, "k" or label, so tokenize_price would read the same.
+SIMPLE_PRICE_RE = (r"^\s*(?:(?:₹|\$|€|£|¥|(?i:rs|inr|usd|eur|gbp|aed|dhs?|sgd|aud|cad)\.?)\s*)?"
+                   r"(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+                   r"(?:\s*(?:-|–|/|to)\s*\d+(?:\.\d+)?)?\s*(?:/-)?\s*$")
+
+
+def _parse_numeric_column(values: List[str]) -> List[Optional[float]]:
+    """_parse_numeric over distinct strings: simple shapes in one string kernel, the rest one by one."""
+    col = pd.Series(values, dtype=_string_dtype())
+    simple = pd.to_numeric(col.str.extract(SIMPLE_PRICE_RE, expand=False).str.replace(",", "", regex=False))
+    out = simple.astype(object).where(simple.notna(), None).tolist()
+    rest = [i for i, v in enumerate(out) if v is None]
+    for i, v in zip(rest, parse_prices([values[i] for i in rest])):
+        out[i] = v
+    return out
+
+
+def expand_and_normalize_columnar(items: List[Dict]) -> List[Dict]:
+    """
+    Same output as expand_and_normalize_items (same dicts, same order, the
+    input items updated in place), without the per-item re.split: rows
+    that can't split (no "/" or "," in both name and price_display) only
+    need their price, and the price_display column is parsed once per
+    distinct string (catalogs repeat a few thousand price strings over
+    tens of thousands of rows).
+
+    Rows that may split, or that are not dicts with str / None name and
+    price_display, go through the per-item function unchanged.
+    """
+    if len(items) < COLUMNAR_MIN_ITEMS:
+        return expand_and_normalize_items(items)
+
+    rows, distinct = [], {}
+    for it in items:
+        name = it.get("item_name") if type(it) is dict else None
+        pdisp = (it.get("price_display") or "") if type(it) is dict else None
+        if (type(it) is not dict or not (name is None or type(name) is str) or type(pdisp) is not str
+                or (name and ("/" in name or "," in name) and ("/" in pdisp or "," in pdisp))):
+            rows.append(None)
+        elif it.get("price") is None:
+            rows.append(distinct.setdefault(pdisp, len(distinct)))
+        else:
+            rows.append(-1)
+
+    parsed = _parse_numeric_column(list(distinct))
+    out = []
+    for it, row in zip(items, rows):
+        if row is None:
+            out.extend(expand_and_normalize_items([it]))
+            continue
+        it["price"] = parsed[row] if row >= 0 else it["price"]
+        out.append(it)
+    return out
+
+
+_MENU_ITEMS = TypeAdapter(List[MenuItem])
+
+
+def validate_menu_items(items: List[Dict]) -> Tuple[List[MenuItem], int]:
+    """
+    MenuItem(**item) for every item in one pydantic call, keeping those
+    with a price. Items that fail validation are dropped, as in the
+    per-item loop. Returns (items, number dropped as invalid).
+    """
+    # rows without a string name always fail; dropping them first saves a second pass
+    named = [it for it in items if isinstance(it, dict) and isinstance(it.get("item_name"), str)]
+    invalid = len(items) - len(named)
+    try:
+        models = _MENU_ITEMS.validate_python(named)
+    except ValidationError as e:
+        bad = {err["loc"][0] for err in e.errors() if err["loc"]}
+        invalid += len(bad)
+        models = _MENU_ITEMS.validate_python([it for i, it in enumerate(named) if i not in bad])
+    return [m for m in models if m.has_any_price()], invalid
+
+
+# ============================================================
+# PRICE GRID EXPANSION (output_format="grid")
+# ============================================================
+
+def _combine_addons(addons: List[Dict], combine: bool) -> List[List[Dict]]:
+    singles = [[a] for a in addons]
+    if not combine:
+        return singles
+    combos = []
+    for size in range(2, len(addons) + 1):
+        combos.extend(list(c) for c in combinations(addons, size))
+    return singles + combos
+
+
+def expand_price_grids(sections: List[Dict]) -> List[Dict]:
+    """
+    Explode compact section grids into one item per (row × column) and per
+    add-on combination, exactly as the system prompt asks the model to do:
+
+        {"category": "Pasta", "subcategory": "Veg",
+         "columns": ["Regular", "Cheesy"],
+         "addons": [{"label": "Butter", "delta": 10}], "combine_addons": false,
+         "rows": [{"name": "Alfredo Pasta", "prices": [99, 129]}]}
+
+    A section with one column (or none) keeps bare item names, and its
+    add-ons replace the column label ("Regular", "Cheese", "Cheese + Butter").
+    """
+    out = []
+    for sec in sections or []:
+        category = sec.get("category")
+        subcategory = sec.get("subcategory") or category
+        columns = sec.get("columns") or [None]
+        addons = [a for a in sec.get("addons") or [] if a.get("label") and a.get("delta") is not None]
+        # combinations only when the model says the menu implies them
+        addon_sets = _combine_addons(addons, bool(sec.get("combine_addons", False)))
+        labelled = len(columns) > 1
+
+        for row in sec.get("rows") or []:
+            name = row.get("name")
+            if not name:
+                continue
+            prices = row.get("prices")
+            if prices is None:
+                prices = [row.get("price")]
+            elif not isinstance(prices, list):
+                prices = [prices]
+
+            for col, raw_price in zip(columns, prices):
+                price = raw_price if isinstance(raw_price, (int, float)) else _parse_numeric(raw_price)
+                if price is None:
+                    continue
+                base = f"{name} - {col}" if labelled and col else name
+                variants = [(base, price)]
+                for combo in addon_sets:
+                    label = " + ".join(a["label"] for a in combo)
+                    delta = sum(float(a["delta"]) for a in combo)
+                    if labelled and col:
+                        variant_name = f"{name} - {col} + {label}"
+                    elif col:
+                        variant_name = f"{name} - {label}"
+                    else:
+                        variant_name = f"{name} + {label}"
+                    variants.append((variant_name, price + delta))
+
+                if addon_sets and not labelled and col:
+                    # single labelled column with add-ons: "X - Regular" is the base
+                    variants[0] = (f"{name} - {col}", price)
+
+                for item_name, item_price in variants:
+                    out.append({
+                        "item_name": item_name,
+                        "category": category,
+                        "subcategory": subcategory,
+                        "description": row.get("description"),
+                        "price": float(item_price),
+                        "price_display": None,
+                    })
+    return out
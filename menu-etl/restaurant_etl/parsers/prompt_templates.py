@@ -101,6 +101,86 @@ Remember:
 Return ONLY the JSON object.
 """
 
+# Compact response contract (see parsers/compact_format.py): header-once,
+# pipe-delimited rows with short keys instead of eleven JSON keys per item.
+COMPACT_SYSTEM_PROMPT = SYSTEM_PROMPT.replace(
+    "Extract ALL menu items into a precise,\ndeterministic JSON structure.",
+    "Extract ALL menu items into compact,\npipe-delimited rows under one header line (never JSON).",
+).replace(
+    "- Return ONLY valid JSON matching the schema.",
+    "- Return ONLY rows in the compact format described in the instructions.",
+)
+
+COMPACT_USER_PROMPT_TEMPLATE = r"""
+MENU TEXT:
+{menu_text}
+
+INSTRUCTIONS:
+- Apply the decision rules from the system prompt to extract items.
+- Do NOT return JSON. Return a header line followed by one line per item.
+
+HEADER: "@" followed by the column keys you use, separated by "|".
+Available keys:
+  n = item_name (REQUIRED, variant appended with " - ")
+  c = category
+  s = subcategory
+  d = description
+  p = price
+  hp = half_plate_price, fp = full_plate_price
+  sp = small_price, mp = medium_price, lp = large_price
+  pd = price_display (only for MP / Market Price)
+
+ROWS: one item per line, cells separated by "|", in header order.
+- Leave a cell empty for null.
+- For c and s, an empty cell means "same as the row above"; write "-" for null.
+- Prices are plain numbers. Never put "|" inside a cell.
+- Only include columns that are used by at least one row.
+
+Example:
+@n|c|s|p
+Alfredo Pasta - Regular|Pasta|Veg Pasta|99
+Alfredo Pasta - Cheesy|||129
+
+Return ONLY the header and rows.
+"""
+
+# Grid response contract: the model returns each section as a price grid and
+# postprocess.expand_price_grids explodes item × variant / add-on combinations.
+GRID_SYSTEM_PROMPT = r"""
+You are an expert menu-extraction assistant. Transcribe menu sections into a
+compact JSON grid. Do NOT expand variants yourself; code does that.
+
+RULES:
+1) One section per category/subcategory block.
+   If no subcategory exists, set subcategory = category.
+2) If a section has variant column headers (e.g. Regular / Cheesy / Baked,
+   MD / LG / XL, Half / Full), list them in "columns" and give each row its
+   prices in the same order (null where a cell is empty).
+   If the section has a single price per item, use "columns": [].
+3) Add-on columns or notes ("+20 Cheese", "Add Butter 10") go in "addons"
+   as {"label", "delta"}. Set "combine_addons" true only if combining
+   add-ons is visually implied.
+4) Slash-separated names with matching slash-separated prices are separate rows.
+5) Prices are numbers only, no currency symbols. Do not guess.
+6) Return ONLY valid JSON.
+"""
+
+GRID_USER_PROMPT_TEMPLATE = r"""
+MENU TEXT:
+{menu_text}
+
+Return a single JSON object:
+{{"sections": [
+  {{"category": "Pasta", "subcategory": "Veg Pasta",
+    "columns": ["Regular", "Cheesy", "Baked"],
+    "addons": [{{"label": "Butter", "delta": 10}}],
+    "combine_addons": false,
+    "rows": [{{"name": "Alfredo Pasta", "description": null, "prices": [99, 129, 149]}}]}}
+]}}
+
+Return ONLY the JSON object.
+"""
+
 # Conservative Azure JSON schema compatible structure. Use when response_format=json_schema is enabled.
 AZURE_MENU_SCHEMA = {
   "name": "menu_schema",
@@ -0,0 +1,180 @@
+"""
+Rate-limit-aware request scheduler for Azure OpenAI calls.
+
+Every deployment gets two token buckets (requests-per-minute and
+tokens-per-minute). A request is only admitted once both buckets can cover
+its estimated cost, so parallel chunks queue locally instead of all getting
+429s from Azure at the same moment. When Azure does answer 429 the caller
+(DeploymentPool.submit) passes Retry-After to `penalize`, which blocks the
+whole deployment, and every wait gets jitter so retries don't line up again.
+
+The scheduler is process-wide (see `get_scheduler`); separate processes
+only coordinate through Retry-After + jitter.
+"""
+
+import time
+import random
+import logging
+import threading
+from typing import Optional, Dict
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # a single request larger than the whole bucket is admitted once full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class _DeploymentBudget:
+    def __init__(self, rpm: Optional[int], tpm: Optional[int], period: float):
+        self.requests = TokenBucket(rpm, period) if rpm else None
+        self.tokens = TokenBucket(tpm, period) if tpm else None
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.admitted = 0
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Read retry-after-ms / retry-after from an OpenAI-style HTTP error."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exc, "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value) * scale
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code
+
+
+class RateLimitScheduler:
+    def __init__(self, jitter: float = 0.25, period: float = 60.0):
+        self.jitter = jitter
+        self.period = period
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, _DeploymentBudget] = {}
+
+    # --------------------------------------------------------
+
+    def configure(self, key: str, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                  period: Optional[float] = None):
+        with self._lock:
+            self._budgets[key] = _DeploymentBudget(rpm, tpm, period or self.period)
+
+    def configure_once(self, key: str, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                       period: Optional[float] = None) -> bool:
+        """Like configure, but leaves an already-known deployment's buckets alone. True if added."""
+        with self._lock:
+            if key in self._budgets:
+                return False
+            self._budgets[key] = _DeploymentBudget(rpm, tpm, period or self.period)
+            return True
+
+    def _budget(self, key: str) -> _DeploymentBudget:
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = _DeploymentBudget(None, None, self.period)
+            self._budgets[key] = budget
+        return budget
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    # --------------------------------------------------------
+
+    def acquire(self, key: str, est_tokens: int = 0):
+        """Block until the deployment can admit a request of est_tokens."""
+        while True:
+            with self._lock:
+                budget = self._budget(key)
+                now = time.monotonic()
+                wait = max(0.0, budget.blocked_until - now)
+                if budget.requests:
+                    wait = max(wait, budget.requests.wait_time(1, now))
+                if budget.tokens:
+                    wait = max(wait, budget.tokens.wait_time(est_tokens, now))
+                if wait <= 0:
+                    if budget.requests:
+                        budget.requests.consume(1)
+                    if budget.tokens:
+                        budget.tokens.consume(est_tokens)
+                    budget.admitted += 1
+                    return
+            time.sleep(self._jittered(wait))
+
+    def remaining(self, key: str) -> Optional[float]:
+        """Fraction of the TPM (or RPM) budget currently available, None if unlimited."""
+        with self._lock:
+            budget = self._budget(key)
+            now = time.monotonic()
+            if budget.blocked_until > now:
+                return 0.0
+            bucket = budget.tokens or budget.requests
+            if bucket is None:
+                return None
+            bucket._refill(now)
+            return max(0.0, bucket.tokens) / bucket.capacity
+
+    def penalize(self, key: str, retry_after: float):
+        with self._lock:
+            budget = self._budget(key)
+            budget.throttled += 1
+            budget.blocked_until = max(budget.blocked_until, time.monotonic() + retry_after)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                key: {"admitted": b.admitted, "throttled": b.throttled}
+                for key, b in self._budgets.items()
+            }
+
+
+# ============================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================
+
+_SCHEDULER = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_scheduler() -> RateLimitScheduler:
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = RateLimitScheduler()
+            logger.info("Initialized shared rate-limit scheduler")
+        return _SCHEDULER
+
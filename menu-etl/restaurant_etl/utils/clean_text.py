@@ -1,28 +1,201 @@
+"""
+Extracted menu text -> fewer tokens before it is chunked and sent to the LLM.
+
+One pass over the lines with precompiled rules:
+
+- "--- Page N ---" markers go (the blank line between pages stays, it is
+  a chunk boundary)
+- dot leaders ("Paneer Tikka ........ 250") become one space, runs of
+  spaces / tabs collapse, blank-line runs become one blank line
+- decorative lines (only symbols: "✻", "-----", "* * *") are dropped
+- letter-spaced headings ("S H O R B E ( S O U P )") are closed up word
+  by word: a wider gap or a bracket separates words ("SHORBE (SOUP)")
+- contact lines (phone numbers, e-mail, web / social handles, "order
+  online") and street addresses with a PIN / ZIP code and no prices are
+  dropped ("St. Louis Ribs 450 650" stays)
+- boilerplate repeated across pages (footers, headers: long lines found
+  on at least half of the pages) is kept once, on its first page; callers
+  that clean a document page by page (hybrid, incremental) pass the
+  document's boilerplate_lines() and one `emitted` set for all pages
+
+Short repeated lines (section headers continued on the next page) are
+kept, and a row of prices is not mistaken for a phone number.
+
+    text, report = preprocess_menu_text(raw)
+    report["tokens_before"], report["tokens_after"]
+
+    boilerplate, emitted = boilerplate_lines(page_texts), set()
+    texts = [preprocess_menu_text(t, boilerplate, emitted)[0] for t in page_texts]
+"""
+
 import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
 
-def normalize_extracted_text(raw: str) -> str:
+from restaurant_etl.parsers.cascade import count_price_tokens
+from restaurant_etl.utils.tokens import estimate_tokens
 
-    if not raw:
-        return ""
+PAGE_MARKER_RE = re.compile(r"^-{2,}\s*Page\s*\d+\s*-{2,}$", re.IGNORECASE)
+DOT_LEADER_RE = re.compile(r"(?:\s*[.·…_]){3,}\s*")
+SPACES_RE = re.compile(r"[ \t ]{2,}")
+DECORATIVE_RE = re.compile(r"^[\W_]+$")
+LETTER_SPACED_RE = re.compile(r"(?<!\S)(?:[A-Za-z&()] {1,3}){3,}[A-Za-z&()](?!\S)")
+WORD_GAP_RE = re.compile(r" {2,}")
+PHONE_RE = re.compile(r"(?:\+\d{1,3}[\s-]?)?(?:\(?\d{2,5}\)?[\s.-]?){2,4}\d{3,5}")
+CONTACT_RE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+|(?:https?://|www\.)\S+|\b[\w-]+\.(?:com|in|co|net|org)\b\S*|(?<!\w)@\w{3,}"
+    r"|\b(?:order\s+online|call\s+us|contact(?:\s+us)?|follow\s+us|whats\s?app|tel|ph(?:one)?|mob(?:ile)?)\b",
+    re.IGNORECASE,
+)
+ADDRESS_RE = re.compile(
+    r"\b(?:road|rd|street|st|avenue|ave|lane|nagar|marg|floor|sector|plot|near|opp|suite|blvd)\b\.?",
+    re.IGNORECASE,
+)
+# 6-digit PIN ("400053") or US ZIP ("NY 10001", "NY 10001-2345"); "120 180" is a price row
+# house / shop / plot numbers: "123 Main St", "Shop 12, MG Road", "Plot 5, Sector 18"
+HOUSE_NUMBER_RE = re.compile(
+    r"^\d+[A-Za-z]?\b|\b(?:shop|plot|sector|house|flat|unit|building|bldg|no)\.?\s*(?:no\.?\s*)?#?\d+[A-Za-z]?\b",
+    re.IGNORECASE,
+)
+POSTCODE_RE = re.compile(r"\b[1-9]\d{5}\b|\b[A-Z]{2}\s\d{5}(?:-\d{4})?\b")
+LABEL_RE = re.compile(r"\b(?:tel|ph(?:one)?|mob(?:ile)?|call(?:\s+us)?|contact(?:\s+us)?|for\s+orders?)\b\W*",
+                      re.IGNORECASE)
 
-    text = raw
-    text = re.sub(r'-{2,}\s*Page\s*\d+\s*-{2,}', '\n', text, flags=re.IGNORECASE)
-    lines = []
-    for line in text.splitlines():
-        s = line.strip()
-        if len(s) <= 1:
-            continue
-        if re.match(r'^[\W_]+$', s):
+BOILERPLATE_MIN_CHARS = 30
+
+
+def _closed_up(m: re.Match) -> str:
+    """"C H I C K E N   T I K K A" -> "CHICKEN TIKKA"; runs must not have been collapsed yet."""
+    words = [w.replace(" ", "") for w in WORD_GAP_RE.split(m.group())]
+    return re.sub(r"(?<=\w)\(", " (", re.sub(r"\)(?=\w)", ") ", " ".join(words)))
+
+
+def _phones(line: str) -> List[str]:
+    """
+    Phone numbers, not price rows: "1250 1450 1650" (three sizes) has the
+    digits of a phone number, so an unlabelled number needs a 5+ digit
+    group or - / . separators.
+    """
+    found = []
+    labelled = LABEL_RE.search(line) is not None
+    for m in PHONE_RE.finditer(line):
+        number = m.group()
+        digits = sum(c.isdigit() for c in number)
+        if digits < 8:
             continue
-        s = re.sub(r'\.{2,}', ' ', s)
-        lines.append(s)
+        if (labelled or "+" in number or "(" in number
+                or digits >= 10 and (re.search(r"\d{5}", number) or re.search(r"\d[-.]\d", number))):
+            found.append(number)
+    return found
 
-    text = "\n".join(lines)
-    text = re.sub(r'\n{2,}', '\n\n', text)
-    text = re.sub(r'[ \t]{2,}', ' ', text)
 
-    # trim
-    text = text.strip()
+def _is_contact(line: str) -> bool:
+    phones = _phones(line)
+    if not phones and CONTACT_RE.search(line) is None:
+        return False
+    # only contact details left once they are taken out
+    rest = line
+    for number in phones:
+        rest = rest.replace(number, " ")
+    rest = LABEL_RE.sub(" ", CONTACT_RE.sub(" ", rest))
+    return re.search(r"[A-Za-z]{3,}", rest) is None
 
-    return text
 
+def _is_address(line: str) -> bool:
+    if ADDRESS_RE.search(line) is None or POSTCODE_RE.search(line) is None:
+        return False
+    # an item on "Bombay Street" or "St. Louis" has prices; an address has none besides its numbers
+    rest = HOUSE_NUMBER_RE.sub(" ", POSTCODE_RE.sub(" ", line.strip()))
+    return count_price_tokens(rest) == 0
+
+
+def _pages(text: str) -> List[List[str]]:
+    pages, current = [], []
+    for line in text.splitlines():
+        if PAGE_MARKER_RE.match(line.strip()):
+            if current:
+                pages.append(current)
+            current = []
+        else:
+            current.append(line)
+    pages.append(current)
+    return pages
+
+
+def boilerplate_lines(pages: List) -> Set[str]:
+    """Long lines on at least half of the pages (2+): headers / footers. Pages are texts or line lists."""
+    seen_on = Counter()
+    for page in pages:
+        lines = page.splitlines() if isinstance(page, str) else page
+        seen_on.update({" ".join(l.split()) for l in lines if len(l.strip()) >= BOILERPLATE_MIN_CHARS})
+    min_pages = max(2, (len(pages) + 1) // 2)
+    return {l for l, n in seen_on.items() if n >= min_pages}
+
+
+def preprocess_menu_text(raw: str, boilerplate: Optional[Set[str]] = None,
+                         emitted: Optional[Set[str]] = None) -> Tuple[str, Dict]:
+    """
+    boilerplate: lines to keep only once (default: found in raw's own
+    pages); emitted: the ones already kept, shared across the calls for
+    one document.
+    """
+    removed = Counter()
+    if not raw:
+        return "", {"tokens_before": 0, "tokens_after": 0, "chars_before": 0, "chars_after": 0,
+                    "removed": dict(removed)}
+
+    pages = _pages(raw)
+    removed["page_markers"] = len(pages) - 1
+    if boilerplate is None:
+        boilerplate = boilerplate_lines(pages)
+    if emitted is None:
+        emitted = set()
+
+    out: List[str] = []
+    for page in pages:
+        if out and out[-1]:
+            out.append("")  # page break = paragraph break
+        for line in page:
+            s = line.strip()
+            if not s:
+                if out and out[-1]:
+                    out.append("")
+                continue
+            if DOT_LEADER_RE.search(s):
+                s, n = DOT_LEADER_RE.subn(" ", s)
+                removed["dot_leaders"] += n
+                s = s.strip()
+            if DECORATIVE_RE.match(s) or len(s) == 1 and not s.isalnum():
+                removed["decorative"] += 1
+                continue
+            key = " ".join(s.split())
+            if key in boilerplate:
+                if key in emitted:
+                    removed["boilerplate"] += 1
+                    continue
+                emitted.add(key)
+            # before the spaces collapse: the wider gaps are the word breaks
+            if LETTER_SPACED_RE.search(s):
+                s = LETTER_SPACED_RE.sub(_closed_up, s)
+                removed["letter_spaced"] += 1
+            s = SPACES_RE.sub(" ", s)
+            if _is_contact(s):
+                removed["contact"] += 1
+                continue
+            if _is_address(s):
+                removed["address"] += 1
+                continue
+            out.append(s)
+
+    text = "\n".join(out).strip()
+    return text, {
+        "chars_before": len(raw),
+        "chars_after": len(text),
+        "tokens_before": estimate_tokens(raw),
+        "tokens_after": estimate_tokens(text),
+        "removed": {k: v for k, v in removed.items() if v},
+    }
+
+
+def normalize_extracted_text(raw: str) -> str:
+    return preprocess_menu_text(raw)[0]
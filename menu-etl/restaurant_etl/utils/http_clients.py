@@ -0,0 +1,133 @@
+"""
+Process-wide HTTP clients shared by every parser and extractor instance.
+
+One httpx.Client (keep-alive, HTTP/2 when the `h2` package is installed)
+backs all AzureOpenAI clients, and one pooled requests session backs the
+Azure Document Intelligence clients, so processing a folder reuses warm
+TLS connections instead of handshaking per menu. Pool limits come from
+HTTP_MAX_CONNECTIONS (64), HTTP_MAX_KEEPALIVE (32) and
+HTTP_KEEPALIVE_EXPIRY (30s), or configure_http_clients().
+"""
+
+import os
+import logging
+import threading
+from typing import Optional, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_LOCK = threading.RLock()
+_SETTINGS: Dict = {}
+_HTTPX_CLIENT = None
+_REQUESTS_SESSION = None
+_DOC_INTEL_CLIENTS: Dict[Tuple[str, str], object] = {}
+
+
+def _setting(name: str, env: str, default):
+    if name in _SETTINGS:
+        return _SETTINGS[name]
+    value = os.getenv(env)
+    if not value:
+        return default
+    if isinstance(default, bool):
+        return value.strip().lower() not in ("0", "false", "no")
+    return type(default)(value)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def configure_http_clients(max_connections: Optional[int] = None,
+                           max_keepalive_connections: Optional[int] = None,
+                           keepalive_expiry: Optional[float] = None,
+                           http2: Optional[bool] = None):
+    """Override pool settings; existing clients are closed and rebuilt on next use."""
+    with _LOCK:
+        for name, value in (("max_connections", max_connections),
+                            ("max_keepalive_connections", max_keepalive_connections),
+                            ("keepalive_expiry", keepalive_expiry),
+                            ("http2", http2)):
+            if value is not None:
+                _SETTINGS[name] = value
+        close_http_clients()
+
+
+def get_http_client():
+    """Shared httpx.Client for the OpenAI SDK (thread-safe)."""
+    global _HTTPX_CLIENT
+    with _LOCK:
+        if _HTTPX_CLIENT is None:
+            try:
+                import httpx2 as httpx  # what newer openai releases are built on
+            except ImportError:
+                import httpx
+
+            http2 = _setting("http2", "HTTP2_ENABLED", True) and _http2_available()
+            limits = httpx.Limits(
+                max_connections=_setting("max_connections", "HTTP_MAX_CONNECTIONS", 64),
+                max_keepalive_connections=_setting("max_keepalive_connections", "HTTP_MAX_KEEPALIVE", 32),
+                keepalive_expiry=_setting("keepalive_expiry", "HTTP_KEEPALIVE_EXPIRY", 30.0),
+            )
+            _HTTPX_CLIENT = httpx.Client(
+                http2=http2,
+                limits=limits,
+                timeout=httpx.Timeout(60.0, connect=10.0),
+            )
+            logger.info(f"✓ Shared HTTP client ready (http2={http2}, max_connections={limits.max_connections})")
+        return _HTTPX_CLIENT
+
+
+def _get_requests_session():
+    global _REQUESTS_SESSION
+    with _LOCK:
+        if _REQUESTS_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            size = _setting("max_connections", "HTTP_MAX_CONNECTIONS", 64)
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=size))
+            _REQUESTS_SESSION = session
+        return _REQUESTS_SESSION
+
+
+def get_document_analysis_client(endpoint: Optional[str] = None, key: Optional[str] = None):
+    """Shared DocumentAnalysisClient per endpoint/key (Azure SDK clients are thread-safe)."""
+    endpoint = endpoint or os.getenv("AZURE_DOC_INTEL_ENDPOINT")
+    key = key or os.getenv("AZURE_DOC_INTEL_KEY")
+    if not endpoint or not key:
+        raise ValueError("Azure Document Intelligence credentials missing")
+
+    with _LOCK:
+        client = _DOC_INTEL_CLIENTS.get((endpoint, key))
+        if client is None:
+            from azure.ai.formrecognizer import DocumentAnalysisClient
+            from azure.core.credentials import AzureKeyCredential
+            from azure.core.pipeline.transport import RequestsTransport
+
+            client = DocumentAnalysisClient(
+                endpoint=endpoint,
+                credential=AzureKeyCredential(key),
+                transport=RequestsTransport(session=_get_requests_session(), session_owner=False),
+            )
+            _DOC_INTEL_CLIENTS[(endpoint, key)] = client
+            logger.info("✓ Azure OCR client initialized")
+        return client
+
+
+def close_http_clients():
+    global _HTTPX_CLIENT, _REQUESTS_SESSION
+    with _LOCK:
+        if _HTTPX_CLIENT is not None:
+            _HTTPX_CLIENT.close()
+            _HTTPX_CLIENT = None
+        _DOC_INTEL_CLIENTS.clear()
+        if _REQUESTS_SESSION is not None:
+            _REQUESTS_SESSION.close()
+            _REQUESTS_SESSION = None
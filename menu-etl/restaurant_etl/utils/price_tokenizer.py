@@ -0,0 +1,180 @@
+"""
+Price strings -> numbers.
+
+One set of precompiled patterns for whatever the model (or OCR) writes in
+a price field:
+
+- currency symbols and codes: ₹, Rs., INR, $, USD, €, £, AED ...
+- thousand / decimal separators in either convention: 1,250.00, 1.250,00,
+  Indian grouping 1,25,000 (decimal="," reads a lone 1.250 as 1250)
+- "k" multipliers: 12.5k
+- ranges: 250-350, 250 – 350, 250 to 350, 250~350 (the lower bound is
+  the price, the upper one is kept as `high`)
+- the Indian "/-" suffix: ₹ 1,250/-
+- per-unit prices: ₹120/kg, $8.00 per bottle (unit kept, price unchanged)
+- market price: MP, M.P., "market price", "seasonal", "price on request"
+  (no number unless one is given)
+
+When a currency marker is present the number next to it is the price
+("2 pcs ₹250" -> 250), otherwise the first number is.
+
+    parse_price("₹ 1,250/-")        -> 1250.0
+    tokenize_price("250 – 350/kg")  -> PriceToken(value=250.0, high=350.0, unit="kg")
+    parse_prices(column)            -> [float | None, ...], each distinct string parsed once
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional, List, Dict, Iterable
+
+CURRENCY_RE = re.compile(
+    r"₹|\$|€|£|¥|\b(?:rs|inr|usd|eur|gbp|aed|dhs?|sgd|aud|cad)\b\.?",
+    re.IGNORECASE,
+)
+CURRENCY_CODES = {
+    "₹": "INR", "rs": "INR", "inr": "INR",
+    "$": "USD", "usd": "USD",
+    "€": "EUR", "eur": "EUR",
+    "£": "GBP", "gbp": "GBP",
+    "¥": "JPY",
+    "aed": "AED", "dh": "AED", "dhs": "AED",
+    "sgd": "SGD", "aud": "AUD", "cad": "CAD",
+}
+
+# digits with inner separators, optionally a "k" multiplier (not "kg")
+NUMBER_RE = re.compile(r"(\d(?:[\d.,]*\d)?)([kK](?![a-zA-Z]))?")
+RANGE_SEP_RE = re.compile(r"\s*(?:-|–|—|~|\bto\b)\s*(?:" + CURRENCY_RE.pattern + r")?\s*$", re.IGNORECASE)
+UNITS = [
+    "kg", "kgs", "g", "gm", "gms", "gram", "grams", "ml", "l", "ltr", "litre", "liter", "oz", "lb",
+    "pc", "pcs", "piece", "pieces", "plate", "plates", "bottle", "glass", "cup", "bowl", "jar", "can",
+    "slice", "scoop", "serving", "portion", "person", "pax", "head", "dozen", "pint", "each", "ea", "hr", "hour",
+]
+# "/kg", "per 100 g": only known units, so "Half 120 / Full 220" has none
+UNIT_RE = re.compile(r"(?:/|\bper\b)\s*(\d*\s*(?:" + "|".join(UNITS) + r"))\b\.?", re.IGNORECASE)
+MARKET_RE = re.compile(
+    r"\bm\.?\s?p\b\.?|\bmarket\s+price\b|\bseasonal\b|\bprice\s+on\s+request\b|\bp\.o\.r\.?",
+    re.IGNORECASE,
+)
+INDIAN_SUFFIX_RE = re.compile(r"/-")
+# most cells are already a bare number
+PLAIN_RE = re.compile(r"\s*\d+(?:\.\d+)?\s*")
+
+
+class PriceToken:
+    def __init__(self, raw: str, value: Optional[float] = None, high: Optional[float] = None,
+                 currency: Optional[str] = None, unit: Optional[str] = None, market: bool = False):
+        self.raw = raw
+        self.value = value
+        self.high = high
+        self.currency = currency
+        self.unit = unit
+        self.market = market
+
+    def to_dict(self) -> Dict:
+        return {"value": self.value, "high": self.high, "currency": self.currency,
+                "unit": self.unit, "market": self.market}
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items() if v not in (None, False))
+        return f"PriceToken({fields})"
+
+
+# ============================================================
+# NUMBERS
+# ============================================================
+
+def _to_float(num: str, decimal: str = ".") -> Optional[float]:
+    """One number with separators; decimal is the separator a lone '.'/',' means."""
+    dots, commas = num.count("."), num.count(",")
+    if dots and commas:
+        # both present: whichever comes last is the decimal point
+        if num.rfind(",") > num.rfind("."):
+            num = num.replace(".", "").replace(",", ".")
+        else:
+            num = num.replace(",", "")
+    elif commas:
+        last = num.rsplit(",", 1)[1]
+        if commas == 1 and (decimal == "," or len(last) != 3):
+            num = num.replace(",", ".")
+        else:
+            num = num.replace(",", "")
+    elif dots:
+        last = num.rsplit(".", 1)[1]
+        if dots > 1 or (decimal == "," and len(last) == 3):
+            num = num.replace(".", "")
+    try:
+        return float(num)
+    except ValueError:
+        return None
+
+
+def tokenize_price(s, decimal: str = ".") -> PriceToken:
+    """Everything read from one price string. Numbers pass straight through."""
+    if s is None:
+        return PriceToken(None)
+    if isinstance(s, (int, float)) and not isinstance(s, bool):
+        return PriceToken(s, value=float(s) if s == s else None)
+    raw = str(s)
+    if decimal == "." and PLAIN_RE.fullmatch(raw):
+        return PriceToken(raw, value=float(raw))
+    text = INDIAN_SUFFIX_RE.sub("", raw.strip())
+    tok = PriceToken(raw, market=bool(MARKET_RE.search(text)))
+
+    currency = CURRENCY_RE.search(text)
+    if currency:
+        tok.currency = CURRENCY_CODES.get(currency.group().lower().rstrip("."))
+
+    numbers = list(NUMBER_RE.finditer(text))
+    if not numbers:
+        return tok
+
+    first = 0
+    if currency:
+        # the number right after (or right before) the currency marker
+        for i, m in enumerate(numbers):
+            if m.start() >= currency.end() and not text[currency.end():m.start()].strip():
+                first = i
+                break
+            if m.end() <= currency.start() and not text[m.end():currency.start()].strip():
+                first = i
+
+    def value(m):
+        v = _to_float(m.group(1), decimal)
+        return v * 1000 if v is not None and m.group(2) else v
+
+    tok.value = value(numbers[first])
+    if first + 1 < len(numbers):
+        nxt = numbers[first + 1]
+        if RANGE_SEP_RE.match(text[numbers[first].end():nxt.start()]):
+            tok.high = value(nxt)
+
+    unit = UNIT_RE.search(text, numbers[first].end())
+    if unit and unit.group(1).strip().lower() not in CURRENCY_CODES:
+        tok.unit = unit.group(1).strip().lower()
+    return tok
+
+
+@lru_cache(maxsize=65536)
+def _parse_str(s: str, decimal: str) -> Optional[float]:
+    return tokenize_price(s, decimal).value
+
+
+def parse_price(s, decimal: str = ".") -> Optional[float]:
+    """The price in a string (lower bound of a range), or None."""
+    if isinstance(s, str):
+        return _parse_str(s, decimal)
+    return tokenize_price(s, decimal).value
+
+
+def parse_prices(values: Iterable, decimal: str = ".") -> List[Optional[float]]:
+    """parse_price over a column; repeated strings are parsed once."""
+    seen: Dict = {}
+    out = []
+    for v in values:
+        if isinstance(v, str):
+            if v not in seen:
+                seen[v] = tokenize_price(v, decimal).value
+            out.append(seen[v])
+        else:
+            out.append(tokenize_price(v, decimal).value)
+    return out
@@ -0,0 +1,32 @@
+"""
+Cheap token estimates for budgeting LLM requests.
+
+Uses tiktoken when it is installed, otherwise falls back to the usual
+~4 characters per token heuristic (good enough for rate-limit admission).
+"""
+
+from functools import lru_cache
+
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    enc = _get_encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
@@ -0,0 +1,273 @@
+"""
+Price sanity checks for a menu's items, and targeted re-verification of
+the few that fail them.
+
+find_price_outliers() works on whole columns (pandas / numpy, no per-item
+Python loop) and flags:
+
+- impossible values: <= 0, or above MAX_PRICE (a phone number, PIN code
+  or year read as the price)
+- a price equal to a number in the item's own name ("Chicken 65" at 65)
+- size prices out of order (half > full, small > medium > large)
+- outliers: log-price robust z-score (median / MAD) against the item's
+  category, or against the whole menu for categories with fewer than
+  `min_group` prices (a ₹4500 chai among ₹40-90 teas)
+
+PriceVerifier re-checks only the flagged items: the lines around each
+item's name in the menu text (a few hundred characters, not the menu)
+go through the parser's normal chunk call (the fast tier first when the
+cascade is configured), and the price read there replaces the flagged
+one when it passes the checks (the re-read price alone is checked
+against the statistics of the original pass). Items carry no page /
+region, so there is no re-OCR of a page region here; the text lines are
+the region.
+
+    flags = find_price_outliers(items)
+    report = PriceVerifier(parser).verify(menu_text, items, flags)
+"""
+
+import re
+import math
+import time
+import logging
+from collections import Counter
+from typing import Optional, List, Dict
+
+import numpy as np
+import pandas as pd
+
+from restaurant_etl.parsers.dedupe import PRICE_FIELDS, normalize_name
+from restaurant_etl.utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SIZE_ORDER = [("half_plate_price", "full_plate_price"), ("small_price", "medium_price"),
+              ("medium_price", "large_price"), ("small_price", "large_price")]
+MAX_PRICE = 100000.0
+MIN_LOG_MAD = 0.15  # ~±16%: categories where every price is the same still get a scale
+_NAME_NUMBER_RE = r"(\d+(?:\.\d+)?)"
+
+
+def _frame(items: List[Dict]) -> pd.DataFrame:
+    rows = [it if isinstance(it, dict) else {} for it in items]
+    df = pd.DataFrame.from_records(rows, columns=["item_name", "category", *PRICE_FIELDS])
+    for f in PRICE_FIELDS:
+        df[f] = pd.to_numeric(df[f], errors="coerce")
+    return df
+
+
+def find_price_outliers(items: List[Dict], z_threshold: float = 3.5, min_group: int = 5,
+                        max_price: float = MAX_PRICE, per_item: bool = True, outliers: bool = True) -> List[Dict]:
+    """
+    One dict per flagged (item, price field): index, field, price, reason, score, expected.
+    per_item: the checks that look at one item only (impossible value, number in the name,
+    size order), same flags however the items are split; outliers: the category statistics.
+    """
+    if not items:
+        return []
+    df = _frame(items)
+
+    # (row, field) -> price, missing prices dropped
+    prices = df[list(PRICE_FIELDS)].stack()
+    prices = prices[prices.notna()]
+    prices.index.names = ["index", "field"]
+    long = prices.rename("price").reset_index()
+    long["category"] = df["category"].fillna("").astype(str).str.strip().str.lower().to_numpy()[long["index"]]
+    value = long["price"].to_numpy(dtype=float)
+    flags = []
+
+    impossible = ~np.isfinite(value) | (value <= 0) | (value > max_price)
+    if per_item:
+        reason = np.where(value <= 0, "non_positive", "too_large")
+        for r in long[impossible].assign(reason=reason[impossible]).itertuples(index=False):
+            flags.append({"index": r.index, "field": r.field, "price": r.price, "reason": r.reason,
+                          "score": None, "expected": None})
+
+        # a number from the name used as the price
+        numbers = df["item_name"].astype("string").str.extractall(_NAME_NUMBER_RE)[0].astype(float)
+        if len(numbers):
+            in_name = pd.DataFrame({"index": numbers.index.get_level_values(0), "price": numbers.to_numpy()})
+            hits = long[~impossible].merge(in_name.drop_duplicates(), on=["index", "price"])
+            for r in hits.itertuples(index=False):
+                flags.append({"index": r.index, "field": r.field, "price": r.price, "reason": "number_in_name",
+                              "score": None, "expected": None})
+
+        for small, large in SIZE_ORDER:
+            bad = (df[small] > df[large]).to_numpy()
+            for i in np.flatnonzero(bad):
+                flags.append({"index": int(i), "field": small, "price": float(df.at[i, small]),
+                              "reason": "size_order", "score": None, "expected": float(df.at[i, large])})
+
+    # robust z of log price within the category (whole menu for small categories)
+    ok = ~impossible
+    if outliers and ok.sum() >= min_group:
+        logp = pd.Series(np.log(value[ok]))
+        cats = long.loc[ok, "category"].reset_index(drop=True)
+        menu_med = logp.median()
+        menu_mad = max((logp - menu_med).abs().median(), MIN_LOG_MAD)
+
+        grouped = logp.groupby(cats)
+        med = grouped.transform("median")
+        mad = (logp - med).abs().groupby(cats).transform("median").clip(lower=MIN_LOG_MAD)
+        small_group = grouped.transform("size") < min_group
+        med = med.where(~small_group, menu_med)
+        mad = mad.where(~small_group, menu_mad)
+
+        z = (0.6745 * (logp - med) / mad).to_numpy()
+        out = np.abs(z) > z_threshold
+        sub = long[ok].reset_index(drop=True)
+        for i in np.flatnonzero(out):
+            flags.append({"index": int(sub.at[i, "index"]), "field": sub.at[i, "field"],
+                          "price": float(sub.at[i, "price"]),
+                          "reason": "outlier_high" if z[i] > 0 else "outlier_low",
+                          "score": round(float(z[i]), 2), "expected": round(float(np.exp(med.iat[i])), 2),
+                          "log_median": float(med.iat[i]), "log_mad": float(mad.iat[i])})
+
+    for f in flags:
+        f["index"] = int(f["index"])
+        f["item_name"] = df.at[f["index"], "item_name"]
+    return flags
+
+
+def still_flagged(item: Dict, flag: Dict, price: float, z_threshold: float = 3.5,
+                  max_price: float = MAX_PRICE, **_) -> bool:
+    """Would `price` in flag["field"] fail the check that raised `flag`? One item, no re-scan of the menu."""
+    if not math.isfinite(price) or price <= 0 or price > max_price:
+        return True
+    reason = flag["reason"]
+    if reason == "number_in_name":
+        return price in {float(n) for n in re.findall(_NAME_NUMBER_RE, str(item.get("item_name") or ""))}
+    if reason == "size_order":
+        return price > flag["expected"]
+    if reason in ("outlier_high", "outlier_low"):
+        return abs(0.6745 * (math.log(price) - flag["log_median"]) / flag["log_mad"]) > z_threshold
+    return False
+
+
+def validate_prices(items: List[Dict], **kwargs) -> Dict:
+    start = time.perf_counter()
+    flags = find_price_outliers(items, **kwargs)
+    return {
+        "items": len(items),
+        "flagged_items": len({f["index"] for f in flags}),
+        "reasons": dict(Counter(f["reason"] for f in flags)),
+        "flags": flags,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def merge_price_reports(a: Dict, b: Dict) -> Dict:
+    """One report for a run checked text by text (streamed chunks, pages); flag indexes stay per text."""
+    merged = {
+        "items": a["items"] + b["items"],
+        "flagged_items": a["flagged_items"] + b["flagged_items"],
+        "reasons": dict(Counter(a["reasons"]) + Counter(b["reasons"])),
+        "flags": a["flags"] + b["flags"],
+        "seconds": round(a["seconds"] + b["seconds"], 4),
+    }
+    checked = [r["verification"] for r in (a, b) if r.get("verification")]
+    if checked:
+        merged["verification"] = {k: sum(v[k] for v in checked)
+                                  for k in ("flags", "items_rechecked", "llm_calls", "tokens_sent", "menu_tokens")}
+        merged["verification"]["status"] = dict(sum((Counter(v["status"]) for v in checked), Counter()))
+    return merged
+
+
+# ============================================================
+# TARGETED RE-VERIFICATION
+# ============================================================
+
+class PriceVerifier:
+    def __init__(self, parser, context_lines: int = 1, batch_items: int = 20, **outlier_kwargs):
+        self.parser = parser
+        self.context_lines = context_lines
+        self.batch_items = batch_items
+        self.outlier_kwargs = outlier_kwargs
+
+    def _locate(self, lines_norm: List[str], name) -> Optional[int]:
+        """Line that starts with the name ("papad 90", not "fried papad 100"), else one that contains it."""
+        target = normalize_name(name)
+        if not target:
+            return None
+        contains = None
+        for i, line in enumerate(lines_norm):
+            if line == target or line.startswith(target + " "):
+                return i
+            if contains is None and f" {target} " in f" {line} ":
+                contains = i
+        return contains
+
+    def verify(self, menu_text: str, items: List[Dict], flags: Optional[List[Dict]] = None) -> Dict:
+        """Re-reads the flagged items' lines; corrects items in place. Returns the report."""
+        if flags is None:
+            flags = find_price_outliers(items, **self.outlier_kwargs)
+        lines = menu_text.splitlines()
+        lines_norm = [normalize_name(l) for l in lines]
+
+        by_item: Dict[int, List[Dict]] = {}
+        for f in flags:
+            by_item.setdefault(f["index"], []).append(f)
+
+        status = Counter()
+        windows = {}
+        for idx in by_item:
+            at = self._locate(lines_norm, items[idx].get("item_name"))
+            if at is None:
+                status["no_context"] += len(by_item[idx])
+                continue
+            windows[idx] = range(max(0, at - self.context_lines), min(len(lines), at + self.context_lines + 2))
+
+        sent_tokens, calls = 0, 0
+        located = list(windows)
+        for b in range(0, len(located), self.batch_items):
+            batch = located[b:b + self.batch_items]
+            keep = sorted({i for idx in batch for i in windows[idx]})
+            snippet = "\n".join(lines[i] for i in keep)
+            sent_tokens += estimate_tokens(snippet)
+            calls += 1
+            reread = {normalize_name(it.get("item_name")): it
+                      for it in (self.parser._parse_chunk(snippet) or []) if isinstance(it, dict)}
+            for idx in batch:
+                status.update(self._resolve(items, idx, by_item[idx], reread))
+
+        return {
+            "flags": len(flags),
+            "items_rechecked": len(located),
+            "status": dict(status),
+            "llm_calls": calls,
+            "tokens_sent": sent_tokens,
+            "menu_tokens": estimate_tokens(menu_text),
+        }
+
+    def _resolve(self, items: List[Dict], idx: int, flags: List[Dict], reread: Dict) -> Counter:
+        status = Counter()
+        item = items[idx]
+        again = reread.get(normalize_name(item.get("item_name")))
+        for f in flags:
+            new = again.get(f["field"]) if again else None
+            if new is None:
+                status["unconfirmed"] += 1
+                f["status"] = "unconfirmed"
+                continue
+            try:
+                new = float(new)
+            except (TypeError, ValueError):
+                status["unconfirmed"] += 1
+                f["status"] = "unconfirmed"
+                continue
+            if new == f["price"]:
+                status["confirmed"] += 1
+                f["status"] = "confirmed"
+                continue
+            # take the re-read price only if it passes the check that failed
+            if still_flagged(item, f, new, **self.outlier_kwargs):
+                status["unconfirmed"] += 1
+                f["status"] = "unconfirmed"
+                continue
+            logger.info(f"Price of {item.get('item_name')!r} corrected: {f['price']:g} -> {new:g} ({f['reason']})")
+            item[f["field"]] = new
+            status["corrected"] += 1
+            f["status"] = "corrected"
+            f["corrected_to"] = new
+        return status
@@ -0,0 +1,107 @@
+"""
+Parquet output for extracted menus, one file per run, partitioned by
+restaurant and run date (hive layout, so any Arrow / Spark / DuckDB
+reader prunes on them):
+
+    <root>/restaurant=<slug>/run_date=2025-12-15/<source stem>_<HHMMSS>.parquet
+
+category and subcategory are dictionary-encoded, prices are nullable
+float64 (an all-empty price column costs a few bytes per row group), and
+the run's metadata (restaurant, source file, run time, extraction
+metadata) is stored as JSON under the "menu_etl" key of the schema
+metadata.
+
+read_menus() scans a whole tree, reading only the requested columns and
+restaurant partitions.
+"""
+
+import re
+import json
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, List, Dict
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from restaurant_etl.models.columnar import ColumnarMenuData, SCHEMA as ITEM_SCHEMA
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DICTIONARY_FIELDS = ("category", "subcategory")
+METADATA_KEY = b"menu_etl"
+
+MENU_SCHEMA = pa.schema([
+    pa.field(f.name, pa.dictionary(pa.int32(), pa.string()), nullable=True) if f.name in DICTIONARY_FIELDS else f
+    for f in ITEM_SCHEMA
+])
+PARTITIONING = ds.partitioning(pa.schema([("restaurant", pa.string()), ("run_date", pa.string())]), flavor="hive")
+
+
+def restaurant_slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", (name or "unknown").lower()).strip("-") or "unknown"
+
+
+def menu_table(menu) -> pa.Table:
+    """MenuData or ColumnarMenuData -> table in MENU_SCHEMA."""
+    if isinstance(menu, ColumnarMenuData):
+        table = menu.to_arrow()
+    else:
+        table = pa.Table.from_pylist([it.model_dump() for it in menu.items], schema=ITEM_SCHEMA)
+    return table.cast(MENU_SCHEMA)
+
+
+def run_path(root: str, restaurant_name: str, source: Optional[str] = None,
+             run_at: Optional[datetime] = None) -> Path:
+    """Where a run's file goes; the partition directories are created."""
+    run_at = run_at or datetime.now()
+    stem = Path(source).stem if source else restaurant_slug(restaurant_name)
+    out_dir = Path(root) / f"restaurant={restaurant_slug(restaurant_name)}" / f"run_date={run_at.strftime('%Y-%m-%d')}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return out_dir / f"{stem}_{run_at.strftime('%H%M%S')}.parquet"
+
+
+def run_metadata(restaurant_name: str, source: Optional[str], run_at: datetime, total_items: int,
+                 extraction_metadata: Optional[dict]) -> Dict[bytes, bytes]:
+    return {METADATA_KEY: json.dumps({
+        "restaurant_name": restaurant_name,
+        "source": str(source) if source else None,
+        "run_at": run_at.isoformat(timespec="seconds"),
+        "total_items": total_items,
+        "extraction_metadata": extraction_metadata,
+    }, default=str).encode()}
+
+
+def write_menu_parquet(menu, root: str, source: Optional[str] = None, run_at: Optional[datetime] = None,
+                       compression: str = "zstd") -> Path:
+    run_at = run_at or datetime.now()
+    out_path = run_path(root, menu.restaurant_name, source, run_at)
+    table = menu_table(menu).replace_schema_metadata(
+        run_metadata(menu.restaurant_name, source, run_at, menu.total_items, menu.extraction_metadata))
+
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    pq.write_table(table, tmp, compression=compression)
+    tmp.replace(out_path)
+    logger.info(f"Wrote {table.num_rows} items to {out_path}")
+    return out_path
+
+
+def read_run_metadata(path: str) -> Dict:
+    # footer key/value metadata: covers both write_menu_parquet and the streaming ParquetSink
+    metadata = pq.read_metadata(path).metadata or {}
+    return json.loads(metadata.get(METADATA_KEY, b"{}"))
+
+
+def read_menus(root: str, columns: Optional[List[str]] = None,
+               restaurants: Optional[List[str]] = None) -> pa.Table:
+    """All runs under root; restaurant / run_date come back as columns."""
+    source = str(root)
+    if restaurants:
+        # only list the restaurants' own partitions
+        dirs = [Path(root) / f"restaurant={restaurant_slug(r)}" for r in restaurants]
+        source = [str(p) for d in dirs if d.is_dir() for p in sorted(d.rglob("*.parquet"))]
+    dataset = ds.dataset(source, format="parquet", partitioning=PARTITIONING, partition_base_dir=str(root))
+    return dataset.to_table(columns=columns)
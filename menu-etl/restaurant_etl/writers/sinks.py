@@ -0,0 +1,267 @@
+"""
+Streaming result sinks: items are appended as each chunk finishes, so a
+crash on chunk 19 of 20 keeps the 18 chunks already paid for, and a huge
+catalog never has to be held in memory.
+
+    sink = open_sink("output/menu.csv")     # .csv / .jsonl / .parquet
+    sink.write_items(items)                 # validated like MenuData; rows without a price dropped
+    sink.checkpoint()                       # flush + fsync at the chunk boundary
+    sink.close(metadata)                    # finalize: fsync, atomic rename to the final path
+
+Until close() the rows live in <path>.partial; a sink left by an
+exception is not finalized. A Parquet file without its footer is
+unreadable, so the Parquet sink also keeps a JSONL journal next to the
+partial file (removed on close). recover_items(path) reads back what a
+crashed run left.
+"""
+
+import os
+import csv
+import json
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, List, Dict
+
+from restaurant_etl.models.menu_models import MenuItem
+from restaurant_etl.parsers.postprocess import validate_menu_items
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+FIELDS = list(MenuItem.model_fields)
+
+
+def _partial(path: Path) -> Path:
+    return path.with_name(path.name + ".partial")
+
+
+def _journal(path: Path) -> Path:
+    return path.with_name(path.name + ".partial.jsonl")
+
+
+def _fsync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _fsync_dir(path: Path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # not supported (Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ItemSink(ABC):
+    """Base class: subclasses implement _open, _write_rows, _sync, _finalize and _release."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.partial = _partial(self.path)
+        self.rows_written = 0
+        self.invalid = 0
+        self.checkpoints = 0
+        self.closed = False
+        self._open()
+
+    def write_items(self, items: List[Dict]) -> int:
+        models, invalid = validate_menu_items(items)
+        self.invalid += invalid
+        rows = [m.model_dump() for m in models]
+        if rows:
+            self._write_rows(rows)
+            self.rows_written += len(rows)
+        return len(rows)
+
+    def checkpoint(self):
+        self._sync()
+        self.checkpoints += 1
+
+    def close(self, metadata: Optional[Dict] = None) -> Path:
+        if self.closed:
+            return self.path
+        self._finalize(metadata)
+        self.partial.replace(self.path)
+        _fsync_dir(self.path.parent)
+        self.closed = True
+        logger.info(f"Wrote {self.rows_written} items to {self.path} ({self.checkpoints} checkpoints)")
+        return self.path
+
+    def abort(self):
+        """Stop writing; the partial file stays for recover_items."""
+        if not self.closed:
+            self._release()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    # --------------------------------------------------------
+
+    @abstractmethod
+    def _open(self):
+        ...
+
+    @abstractmethod
+    def _write_rows(self, rows: List[Dict]):
+        ...
+
+    @abstractmethod
+    def _sync(self):
+        ...
+
+    @abstractmethod
+    def _finalize(self, metadata: Optional[Dict]):
+        ...
+
+    @abstractmethod
+    def _release(self):
+        ...
+
+
+class CSVSink(ItemSink):
+    """Same columns as MenuData.to_dataframe().to_csv(); metadata goes to <path>.meta.json."""
+
+    def _open(self):
+        self._file = open(self.partial, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+        self._writer.writeheader()
+
+    def _write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def _sync(self):
+        _fsync(self._file)
+
+    def _finalize(self, metadata):
+        _fsync(self._file)
+        self._file.close()
+        if metadata is not None:
+            self.path.with_name(self.path.name + ".meta.json").write_text(json.dumps(metadata, default=str))
+
+    def _release(self):
+        self._file.close()
+
+
+class JSONLSink(ItemSink):
+    """One item per line; metadata is the last line, as {"_metadata": {...}}."""
+
+    def _open(self):
+        self._file = open(self.partial, "w", encoding="utf-8")
+
+    def _write_rows(self, rows):
+        self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows))
+
+    def _sync(self):
+        _fsync(self._file)
+
+    def _finalize(self, metadata):
+        if metadata is not None:
+            self._file.write(json.dumps({"_metadata": metadata}, default=str) + "\n")
+        _fsync(self._file)
+        self._file.close()
+
+    def _release(self):
+        self._file.close()
+
+
+class ParquetSink(ItemSink):
+    """One row group per chunk, in the parquet_writer schema; metadata in the footer."""
+
+    def _open(self):
+        import pyarrow.parquet as pq
+        from restaurant_etl.writers.parquet_writer import MENU_SCHEMA
+
+        self._schema = MENU_SCHEMA
+        self._file = open(self.partial, "wb")
+        self._writer = pq.ParquetWriter(self._file, MENU_SCHEMA, compression="zstd")
+        self._journal = open(_journal(self.path), "w", encoding="utf-8")
+
+    def _write_rows(self, rows):
+        import pyarrow as pa
+        from restaurant_etl.models.columnar import SCHEMA as ITEM_SCHEMA
+
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=ITEM_SCHEMA).cast(self._schema))
+        self._journal.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows))
+
+    def _sync(self):
+        _fsync(self._file)
+        _fsync(self._journal)
+
+    def _finalize(self, metadata):
+        from restaurant_etl.writers.parquet_writer import METADATA_KEY
+
+        if metadata is not None:
+            self._writer.add_key_value_metadata({METADATA_KEY: json.dumps(metadata, default=str).encode()})
+        self._writer.close()
+        _fsync(self._file)
+        self._file.close()
+        self._journal.close()
+        _journal(self.path).unlink(missing_ok=True)
+
+    def _release(self):
+        # the footer makes the partial file readable too; the journal stays
+        self._writer.close()
+        self._journal.close()
+        self._file.close()
+
+
+SINKS = {".csv": CSVSink, ".jsonl": JSONLSink, ".parquet": ParquetSink}
+
+
+def open_sink(path: str) -> ItemSink:
+    suffix = Path(path).suffix.lower()
+    if suffix not in SINKS:
+        raise ValueError(f"No sink for {suffix!r} files (use one of {list(SINKS)})")
+    return SINKS[suffix](path)
+
+
+# ============================================================
+# RECOVERY
+# ============================================================
+
+def _read_jsonl(path: Path) -> List[Dict]:
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn last line
+            if "_metadata" not in row:
+                rows.append(row)
+    return rows
+
+
+def recover_items(path: str) -> List[Dict]:
+    """Items a crashed run wrote for `path` (everything up to the last complete row)."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        journal = _journal(path)
+        return _read_jsonl(journal) if journal.exists() else []
+    partial = _partial(path)
+    if not partial.exists():
+        return []
+    if suffix == ".jsonl":
+        return _read_jsonl(partial)
+    rows = []
+    with open(partial, newline="", encoding="utf-8") as f:
+        for r in csv.DictReader(f):
+            if None in r or any(v is None for v in r.values()):
+                break  # torn last line
+            rows.append({k: (float(v) if v and (k == "price" or k.endswith("_price")) else (v or None))
+                         for k, v in r.items()})
+    return rows
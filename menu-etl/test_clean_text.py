@@ -0,0 +1,29 @@
+from restaurant_etl.utils.clean_text import preprocess_menu_text, boilerplate_lines
+
+
+def clean(text):
+    return preprocess_menu_text(text)[0]
+
+
+def test_letter_spaced_heading_keeps_word_breaks():
+    assert clean("S H O R B E ( S O U P )") == "SHORBE (SOUP)"
+    assert clean("C H I C K E N   T I K K A") == "CHICKEN TIKKA"
+
+
+def test_priced_lines_are_not_addresses():
+    text = "Bombay Street Sandwich 120 180\nSt. Louis Ribs 450 650"
+    assert clean(text) == text
+
+
+def test_addresses_with_house_numbers_are_dropped():
+    for line in ("Shop 12, MG Road, Pune 411001", "Plot 5, Sector 18, Noida 201301",
+                 "123 Main St, New York, NY 10001"):
+        assert clean(line) == ""
+
+
+def test_footer_kept_once_across_pages():
+    footer = "All prices are exclusive of government taxes"
+    pages = [f"Paneer Tikka 250\n{footer}", f"Dal Makhani 220\n{footer}", f"Gulab Jamun 90\n{footer}"]
+    boilerplate, emitted = boilerplate_lines(pages), set()
+    texts = [preprocess_menu_text(p, boilerplate, emitted)[0] for p in pages]
+    assert [t.count(footer) for t in texts] == [1, 0, 0]
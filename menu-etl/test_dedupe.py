@@ -0,0 +1,48 @@
+from restaurant_etl.parsers.dedupe import ItemDeduper, dedupe_items
+
+
+def names(items):
+    return [it["item_name"] for it in items]
+
+
+def test_different_dishes_same_price_kept_apart():
+    items = [
+        {"item_name": "Paneer Tikka", "price": 250, "category": "Starters"},
+        {"item_name": "Paneer Tikki", "price": 250, "category": "Starters"},
+        {"item_name": "Veg Biryani", "price": 250},
+        {"item_name": "Egg Biryani", "price": 250},
+        {"item_name": "Chicken Gravy - Palak", "price": 250},
+        {"item_name": "Chicken Gravy - Korma", "price": 250},
+    ]
+    deduper = ItemDeduper()
+    assert names(deduper.add(items)) == names(items)
+    assert deduper.counts == {"exact": 0, "fuzzy": 0}
+
+
+def test_duplicates_across_chunks():
+    deduper = ItemDeduper()
+    deduper.add([{"item_name": "À la Carte", "price": 300, "category": "Mains"}])
+    unique = deduper.add([
+        {"item_name": "a la carte", "price": 300, "description": "chef's choice"},
+        {"item_name": "A la Crate", "price": 300},
+        {"item_name": "A la Carte", "price": 350},
+    ])
+    assert names(unique) == ["A la Carte"]
+    assert deduper.counts == {"exact": 1, "fuzzy": 1}
+
+
+def test_fills_empty_fields_of_kept_item():
+    items, _ = dedupe_items([
+        {"item_name": "Dal Makhani", "price": 220, "description": None},
+        {"item_name": "Dal Makhani", "price": 220, "description": "slow-cooked black lentils"},
+    ])
+    assert items == [{"item_name": "Dal Makhani", "price": 220, "description": "slow-cooked black lentils"}]
+
+
+def test_categories_are_separate():
+    deduper = ItemDeduper()
+    items = [
+        {"item_name": "Cold Coffee", "price": 120, "category": "Beverages"},
+        {"item_name": "Cold Coffee", "price": 120, "category": "Combos"},
+    ]
+    assert len(deduper.add(items)) == 2
@@ -0,0 +1,42 @@
+import pytest
+
+from restaurant_etl.parsers.json_repair import load_menu_json
+
+PAYLOAD = '{"items": [{"item_name": "Dal Makhani", "price": 220}]}'
+
+
+def test_brackets_in_leading_prose():
+    raw = "Here is the result [12 items] {see notes}:\n" + PAYLOAD
+    assert load_menu_json(raw) == {"items": [{"item_name": "Dal Makhani", "price": 220}]}
+
+
+def test_code_fence_and_bare_array():
+    raw = '```json\n[{"item_name": "Dal Makhani", "price": 220}]\n```'
+    assert load_menu_json(raw) == {"items": [{"item_name": "Dal Makhani", "price": 220}]}
+
+
+def test_truncated_payload_keeps_finished_items():
+    raw = '{"items": [{"item_name": "Dal Makhani", "price": 220}, {"item_name": "Butter Naan", "pri'
+    items = load_menu_json(raw)["items"]
+    assert items[0] == {"item_name": "Dal Makhani", "price": 220}
+    assert items[1]["item_name"] == "Butter Naan"
+
+
+def test_truncated_array_mid_value():
+    raw = '[{"item_name": "Dal Makhani", "price": 220}, {"item_name": "Butter Naan", "price": 40'
+    assert load_menu_json(raw)["items"][-1] == {"item_name": "Butter Naan", "price": 40}
+
+
+def test_trailing_comma():
+    assert load_menu_json('{"items": [{"item_name": "Dal Makhani", "price": 220,}]}')["items"][0]["price"] == 220
+
+
+@pytest.mark.parametrize("raw", ["", "   \n"])
+def test_empty_output(raw):
+    with pytest.raises(ValueError, match="Empty model output"):
+        load_menu_json(raw)
+
+
+def test_no_json():
+    with pytest.raises(ValueError, match="JSON Parse Error"):
+        load_menu_json("Sorry, I could not read this menu.")
@@ -0,0 +1,36 @@
+import csv
+from pathlib import Path
+
+import pytest
+
+from restaurant_etl.utils.price_tokenizer import parse_price, parse_prices
+
+CORPUS = Path(__file__).parent / "benchmarks" / "price_corpus.tsv"
+
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8", newline="") as f:
+        rows = [r for r in csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+                if not (r["raw"] or "").startswith("#")]
+    return [(r["raw"], float(r["expected"]) if r["expected"] else None, r["source"]) for r in rows]
+
+
+FORMAT_CASES = [(raw, expected) for raw, expected, source in load_corpus() if source == "format"]
+
+
+@pytest.mark.parametrize("raw,expected", FORMAT_CASES)
+def test_tricky_formats(raw, expected):
+    assert parse_price(raw) == expected
+
+
+def test_whole_corpus():
+    rows = load_corpus()
+    wrong = [(raw, expected, parse_price(raw)) for raw, expected, _ in rows if parse_price(raw) != expected]
+    assert not wrong, wrong[:10]
+    assert parse_prices([raw for raw, _, _ in rows]) == [expected for _, expected, _ in rows]
+
+
+def test_non_strings():
+    assert parse_price(None) is None
+    assert parse_price(250) == 250.0
+    assert parse_price("1.250,00", decimal=",") == 1250.0